@@ -12,16 +12,27 @@ and dump files generated by scientific software packages.
 
 '''
 
+from opppy import cell_locator
+from opppy import columnar
 from opppy import dump_utils
+from opppy import export
 from opppy import interactive_utils
+from opppy import interpolation
+from opppy import journal
+from opppy import migration
 from opppy import output
+from opppy import parallel
+from opppy import parse_cache
+from opppy import parse_stats
 from opppy import plot_dictionary
 from opppy import plot_dump_dictionary
 from opppy import plotting_help
 from opppy import progress
+from opppy import shard
+from opppy import storage
 from opppy import version
 
 
-__all__ = ['dump_utils', 'interactive_utils', 'output', 
+__all__ = ['cell_locator', 'columnar', 'dump_utils', 'export', 'interactive_utils', 'interpolation', 'journal', 'migration', 'output', 'parallel', 'parse_cache', 'parse_stats',
             'plot_dictionary', 'plot_dump_dictionary', 'plotting_help',
-            'progress', 'version', 'tally']
+            'progress', 'shard', 'storage', 'version', 'tally']
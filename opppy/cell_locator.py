@@ -0,0 +1,202 @@
+# ---------------------------*-python-*----------------------------------------#
+# file   cell_locator.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+'''
+Point location in 2D cell polygons (i.e. the xy_verts of an AMR mesh)
+
+Interpolating cell centers blurs the piecewise constant values of a mesh. A
+cell_locator finds the cell polygon that contains each query point, so the
+sampled values are the cell values of the simulation. The cells are binned
+by their bounding boxes into a hierarchy of bucket grids, one level per cell
+size, so a query only tests the few cells of its bucket on each level (even
+on refined AMR meshes). Locators are cached by the content of the cell
+vertices, so every variable and every dump of a static mesh reuses them.
+
+.. autosummary::
+
+  cell_locator
+  get_cell_locator
+  clear_cell_locators
+'''
+
+from collections import OrderedDict
+
+import numpy as np
+
+from opppy.interpolation import _mesh_key
+
+# number of meshes that keep their cell locator
+LOCATOR_CACHE_SIZE = 8
+# finest bucket level (buckets 2^-MAX_LEVEL of the mesh size)
+MAX_LEVEL = 30
+# number of points located at once
+LOCATE_CHUNK = 65536
+
+_locators = OrderedDict()
+
+def _cell_vertices(verts):
+    '''
+    Return cell polygons (a list of [[x,y], ...] vertex lists or an array) as
+    a (ncells, nverts, 2) float array. Cells with fewer vertices repeat their
+    last vertex, which adds empty edges.
+    '''
+    if isinstance(verts, np.ndarray) and verts.ndim == 3:
+        return np.ascontiguousarray(verts, dtype=float)
+    lengths = [len(cell) for cell in verts]
+    nverts = max(lengths)
+    if min(lengths) == nverts:
+        return np.array(verts, dtype=float).reshape(len(verts), nverts, 2)
+    vertices = np.empty((len(verts), nverts, 2))
+    for cell, cell_verts in enumerate(verts):
+        vertices[cell, :len(cell_verts)] = cell_verts
+        vertices[cell, len(cell_verts):] = cell_verts[-1]
+    return vertices
+
+class cell_locator():
+    '''
+    A hierarchy of bucket grids of 2D cell polygons. Level l splits the mesh
+    domain into 2^l x 2^l buckets and holds the cells that are larger than
+    half its bucket width, so a cell overlaps at most four buckets of its
+    level and a bucket only holds a few cells, however refined the mesh is.
+    Only the occupied buckets of each level are stored (sorted by bucket
+    number), so a query searches every level with cells.
+
+    arguments:
+        verts the vertices of every cell (a list of [[x,y], ...] lists or a
+            (ncells, nverts, 2) array)
+    '''
+    def __init__(self, verts):
+        self.vertices = _cell_vertices(verts)
+        self.ncells = len(self.vertices)
+        self.lower = self.vertices.min(axis=1)
+        self.upper = self.vertices.max(axis=1)
+        self.domain_lower = self.lower.min(axis=0)
+        self.domain_upper = self.upper.max(axis=0)
+        size = (self.domain_upper-self.domain_lower).max()
+        self.size = size if size > 0 else 1.0
+
+        # the finest level whose buckets are as large as the cell
+        extent = np.maximum((self.upper-self.lower).max(axis=1), self.size*2.0**-MAX_LEVEL)
+        cell_levels = np.floor(np.log2(self.size/extent)).astype(int)
+        self.levels = []
+        for level in np.unique(cell_levels):
+            level_cells = np.nonzero(cell_levels == level)[0]
+            nbuckets = 2**int(level)
+            width = self.size/nbuckets
+            first = self._bucket(self.lower[level_cells], width, nbuckets)
+            span = self._bucket(self.upper[level_cells], width, nbuckets)-first+1
+            counts = span[:, 0]*span[:, 1]
+            index = np.repeat(np.arange(len(level_cells)), counts)
+            offset = np.arange(len(index))-np.repeat(np.cumsum(counts)-counts, counts)
+            buckets = (first[index, 1]+offset//span[index, 0])*nbuckets+first[index, 0]+offset%span[index, 0]
+            order = np.argsort(buckets, kind='stable')
+            keys, starts = np.unique(buckets[order], return_index=True)
+            self.levels.append((width, nbuckets, keys, np.append(starts, len(order)), level_cells[index[order]]))
+
+    def _bucket(self, points, width, nbuckets):
+        '''
+        Return the (ix, iy) bucket of (n, 2) points in a level with buckets
+        of the given width
+        '''
+        bucket = np.floor((points-self.domain_lower)/width)
+        return np.clip(bucket, 0, nbuckets-1).astype(np.int64)
+
+    def _candidates(self, points, query):
+        '''
+        Return the (point, cell) pairs of the cells in the buckets of the
+        query points on every level
+        '''
+        pair_points = []
+        pair_cells = []
+        for width, nbuckets, keys, starts, cells in self.levels:
+            bucket = self._bucket(points[query], width, nbuckets)
+            bucket = bucket[:, 1]*nbuckets+bucket[:, 0]
+            slot = np.minimum(np.searchsorted(keys, bucket), len(keys)-1)
+            found = keys[slot] == bucket
+            slot = slot[found]
+            start = starts[slot]
+            counts = starts[slot+1]-start
+            pair_points.append(np.repeat(query[found], counts))
+            pair_cells.append(cells[np.repeat(start-(np.cumsum(counts)-counts), counts)+np.arange(counts.sum())])
+        return np.concatenate(pair_points), np.concatenate(pair_cells)
+
+    def locate(self, x, y):
+        '''
+        Return the index of the cell that contains each point (-1 outside the
+        mesh). A point on a shared edge belongs to one of its cells. The
+        points are located LOCATE_CHUNK at a time to bound the memory use.
+
+        arguments:
+            x the x coordinates of the points
+            y the y coordinates of the points
+        '''
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        shape = x.shape
+        points = np.stack([x.ravel(), y.ravel()], axis=-1)
+        result = np.full(len(points), self.ncells)
+        inside = np.all((points >= self.domain_lower) & (points <= self.domain_upper), axis=1)
+        inside = np.nonzero(inside)[0]
+        for chunk in range(0, len(inside), LOCATE_CHUNK):
+            pair_point, pair_cell = self._candidates(points, inside[chunk:chunk+LOCATE_CHUNK])
+            pair_xy = points[pair_point]
+            in_box = np.all((pair_xy >= self.lower[pair_cell]) & (pair_xy <= self.upper[pair_cell]), axis=1)
+            pair_point, pair_cell, pair_xy = pair_point[in_box], pair_cell[in_box], pair_xy[in_box]
+
+            # crossing number test of the cell polygons
+            px, py = pair_xy[:, 0], pair_xy[:, 1]
+            contains = np.zeros(len(pair_cell), dtype=bool)
+            for vertex in range(self.vertices.shape[1]):
+                x0, y0 = self.vertices[pair_cell, vertex-1, 0], self.vertices[pair_cell, vertex-1, 1]
+                x1, y1 = self.vertices[pair_cell, vertex, 0], self.vertices[pair_cell, vertex, 1]
+                crosses = (y0 > py) != (y1 > py)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    contains ^= crosses & (px < x0+(py-y0)*(x1-x0)/(y1-y0))
+            # the lowest cell index wins where cells overlap
+            np.minimum.at(result, pair_point[contains], pair_cell[contains])
+        result[result == self.ncells] = -1
+        return result.reshape(shape)
+
+    def sample(self, values, cells, fill_value=np.nan):
+        '''
+        Return the values of located cells (fill_value outside the mesh), so
+        the points are located once for any number of variables
+
+        arguments:
+            values the cell values
+            cells the cell indices returned by locate
+            fill_value value of points outside the mesh
+        '''
+        values = np.asarray(values)
+        result = values[cells].astype(np.result_type(values.dtype, float))
+        result[cells < 0] = fill_value
+        return result
+
+def get_cell_locator(verts):
+    '''
+    Return the cached cell locator of a mesh, or build a new one. The least
+    recently used locators are dropped beyond LOCATOR_CACHE_SIZE meshes.
+
+    arguments:
+        verts the vertices of every cell (a list of [[x,y], ...] lists or a
+            (ncells, nverts, 2) array)
+    '''
+    vertices = _cell_vertices(verts)
+    key = _mesh_key(vertices)
+    locator = _locators.pop(key, None)
+    if locator is None:
+        # a cached locator must not see later edits of the caller's array
+        locator = cell_locator(vertices.copy() if vertices is verts else vertices)
+    _locators[key] = locator
+    while len(_locators) > LOCATOR_CACHE_SIZE:
+        _locators.popitem(last=False)
+    return locator
+
+def clear_cell_locators():
+    '''
+    Drop every cached cell locator
+    '''
+    _locators.clear()
@@ -0,0 +1,169 @@
+# ---------------------------*-python-*----------------------------------------#
+# file   columnar.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+'''
+Columnar NumPy storage for appended output data
+
+.. autosummary::
+
+  columnar_dictionary
+'''
+
+from collections.abc import MutableMapping
+import numpy as np
+
+def _value_dtype(value):
+    '''
+    Return the column dtype needed to store a single cycle value
+    '''
+    if isinstance(value, (bool, np.bool_)):
+        return np.dtype(np.int64)
+    if isinstance(value, (int, np.integer)):
+        return np.dtype(np.int64)
+    if isinstance(value, (float, np.floating)):
+        return np.dtype(np.float64)
+    return np.dtype(object)
+
+# column kinds that can store a value type without promotion
+_fast_kinds = {float:'fO', int:'ifO', str:'O'}
+
+class columnar_dictionary(MutableMapping):
+    '''
+    A drop in replacement for the dictionary of lists built by append_data.
+    Each key is stored as a NumPy column that grows by doubling its capacity
+    and a boolean validity mask records which cycles actually reported the
+    key (the list storage back fills these values with zeros).
+
+    Indexing returns a NumPy view of the filled part of a column, so the data
+    can be plotted without converting lists to arrays. Only the filled part of
+    the columns is pickled.
+    '''
+    def __init__(self, initial_capacity=16):
+        self._columns = {}
+        self._valid = {}
+        self._length = 0
+        self._capacity = initial_capacity
+
+    def __getitem__(self, key):
+        return self._columns[key][:self._length]
+
+    def __setitem__(self, key, value):
+        value = np.asarray(value)
+        if len(value) != self._length:
+            raise ValueError("column length "+str(len(value))+" does not match the dictionary length "+str(self._length))
+        column = np.zeros(self._capacity, dtype=value.dtype)
+        column[:self._length] = value
+        self._columns[key] = column
+        self._valid[key] = np.zeros(self._capacity, dtype=bool)
+        self._valid[key][:self._length] = True
+
+    def __delitem__(self, key):
+        del self._columns[key]
+        del self._valid[key]
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __len__(self):
+        return len(self._columns)
+
+    def __repr__(self):
+        return 'columnar_dictionary('+repr({key:self[key] for key in self})+')'
+
+    def __getstate__(self):
+        return {'length':self._length,
+                'columns':{key:column[:self._length] for key, column in self._columns.items()},
+                'valid':{key:np.packbits(valid[:self._length]) for key, valid in self._valid.items()}}
+
+    def __setstate__(self, state):
+        self._length = state['length']
+        self._capacity = max(self._length, 1)
+        self._columns = {key:column.copy() for key, column in state['columns'].items()}
+        self._valid = {key:np.unpackbits(valid, count=self._length).astype(bool) for key, valid in state['valid'].items()}
+
+    def valid(self, key):
+        '''
+        Return the validity mask of a column (False where a cycle did not
+        report the key)
+        '''
+        return self._valid[key][:self._length]
+
+    def to_dict(self):
+        '''
+        Return the data as a dictionary of lists (the append_data layout with
+        zero back filled values)
+        '''
+        return {key:self[key].tolist() for key in self}
+
+    def _grow(self, length):
+        '''
+        Make room for at least length rows
+        '''
+        if length <= self._capacity:
+            return
+        capacity = max(length, 2*self._capacity)
+        for key in self._columns:
+            column = np.zeros(capacity, dtype=self._columns[key].dtype)
+            column[:self._length] = self._columns[key][:self._length]
+            self._columns[key] = column
+            valid = np.zeros(capacity, dtype=bool)
+            valid[:self._length] = self._valid[key][:self._length]
+            self._valid[key] = valid
+        self._capacity = capacity
+
+    def _set_value(self, key, index, value):
+        '''
+        Store a value in a column, adding or promoting the column as needed
+        '''
+        column = self._columns.get(key)
+        if column is None:
+            column = np.zeros(self._capacity, dtype=_value_dtype(value))
+            self._columns[key] = column
+            self._valid[key] = np.zeros(self._capacity, dtype=bool)
+        elif column.dtype.kind not in _fast_kinds.get(type(value), ''):
+            dtype = _value_dtype(value)
+            new_dtype = np.dtype(object) if object in (dtype, column.dtype) else np.promote_types(column.dtype, dtype)
+            if new_dtype != column.dtype:
+                column = column.astype(new_dtype)
+                self._columns[key] = column
+        column[index] = value
+        self._valid[key][index] = True
+
+    def append(self, cycle_data, cycle_info, sort_key_string):
+        '''
+        Append a cycle with the same rules as append_data. Any existing cycles
+        with a sort value at or beyond the new cycle's sort value are dropped.
+
+        arguments:
+          cycle_data - python dictionary of cycle data
+          cycle_info - python dictionary of cycle info (i.e. time and cycle)
+          sort_key_string - key string used to access the cycle_info data value to sort the data
+        '''
+        if self._length > 0 and cycle_info[sort_key_string] <= self._columns[sort_key_string][self._length-1]:
+            # the sort values are always increasing so we only need to find
+            # the first cycle to drop
+            length = int(np.searchsorted(self[sort_key_string], cycle_info[sort_key_string], side='left'))
+            if length < self._length:
+                # rows past the length are kept zeroed for the next append
+                for key in self._columns:
+                    self._columns[key][length:self._length] = 0
+                    self._valid[key][length:self._length] = False
+                self._length = length
+        index = self._length
+        self._grow(index+1)
+        if len(self._columns) == 0:
+            # match the key order of a new append_cycle_data dictionary
+            for key, value in cycle_data.items():
+                self._set_value(key, index, value)
+            for key, value in cycle_info.items():
+                self._set_value(key, index, value)
+        else:
+            for key, value in cycle_info.items():
+                self._set_value(key, index, value)
+            for key, value in cycle_data.items():
+                self._set_value(key, index, value)
+        self._length = index+1
@@ -13,6 +13,7 @@
   point_value_1d
   point_value_2d
   point_value_3d
+  interpolate_values
   data2grid
   data2gridbox
   data2grid3Dslice
@@ -32,13 +33,51 @@ import pickle
 import math
 import platform
 import pickle
-if "linux" in platform.system().lower(): 
-    from multiprocessing import Process, Manager, cpu_count
-else:
-    # Protect against multiprocessing fork issue on Windows and Mac
-    from multiprocess import Process, Manager, cpu_count
 
 from opppy.progress import progress
+from opppy.parallel import get_parser_pool, worker_parser, cpu_count
+from opppy.storage import load_data
+from opppy.interpolation import interpolate, get_interpolation_plan
+from opppy.cell_locator import get_cell_locator
+
+def _value_keys(value_key):
+    '''
+    Return a value_key argument (one key or a list of keys) as a list of keys
+    '''
+    if isinstance(value_key, (list, tuple)):
+        return list(value_key)
+    return [value_key]
+
+def interpolate_values(data, points, value_keys, xi, method='nearest', structured=None, verts=None):
+    '''
+    Interpolate several variables of a dump to the same query points. The
+    interpolation weights of the points are computed once and applied to each
+    variable (see opppy.interpolation.interpolation_weights). If the 2D cell
+    polygons are given the values are the values of the cells that contain
+    the points (see opppy.cell_locator).
+
+    arguments:
+        data - the dump data dictionary
+        points - the mesh coordinates (a tuple of coordinate arrays)
+        value_keys - list of keys of the values to interpolate
+        xi - the query points (a tuple of coordinate arrays)
+        method - Method for interpolation
+        structured - True if the mesh points form a tensor product grid, False
+            to interpolate them as scattered points, or None to detect the grid
+        verts - optional vertices of the 2D cells (i.e. data['xy_verts'])
+
+    returns:
+        a {value_key:interpolated values} dictionary
+    '''
+    value_keys = _value_keys(value_keys)
+    if verts is not None:
+        locator = get_cell_locator(verts)
+        cells = locator.locate(*xi)
+        return {value_key:locator.sample(data[value_key], cells) for value_key in value_keys}
+    if len(value_keys) == 1:
+        return {value_keys[0]:interpolate(points, data[value_keys[0]], xi, method, structured=structured)}
+    weights = get_interpolation_plan(points, structured).weights(xi, method)
+    return {value_key:weights(data[value_key]) for value_key in value_keys}
 
 def point_value_1d(data, x_key, value_key, x_value, method='nearest'):
     '''
@@ -54,18 +93,16 @@ def point_value_1d(data, x_key, value_key, x_value, method='nearest'):
 
     '''
 
-    from scipy.interpolate import griddata
-
     X = data[x_key]
 
     value = data[value_key]
-    grid_data = griddata((X), value, ([x_value]), method).T
+    grid_data = interpolate((X), value, ([x_value]), method).T
 
     return grid_data
 
 
 
-def point_value_2d(data, x_key, y_key, value_key, x_value, y_value, method='nearest'):
+def point_value_2d(data, x_key, y_key, value_key, x_value, y_value, method='nearest', verts_key=None):
     '''
     Grid data function. This function takes a 2D data structure from dictionary
     and interpolates it at a single 2d point.
@@ -78,16 +115,18 @@ def point_value_2d(data, x_key, y_key, value_key, x_value, y_value, method='near
       x_value - x location to interpolate at
       y_value - y location to interpolate at
       method - Method for interpolation
+      verts_key - optional key of the cell vertices (i.e. xy_verts) to return
+                  the value of the cell that contains the point
     
     '''
 
-    from scipy.interpolate import griddata
-
     X = data[x_key]
     Y = data[y_key]
 
+    if verts_key is not None:
+        return interpolate_values(data, (X, Y), value_key, ([x_value], [y_value]), verts=data[verts_key])[value_key]
     value = data[value_key]
-    grid_data = griddata((X, Y), value, ([x_value], [y_value]), method).T
+    grid_data = interpolate((X, Y), value, ([x_value], [y_value]), method).T
 
     return grid_data
 
@@ -110,20 +149,18 @@ def point_value_3d(data, x_key, y_key, z_key, value_key, x_value, y_value, z_val
 
     '''
 
-    from scipy.interpolate import griddata
-
     X = data[x_key]
     Y = data[y_key]
     Z = data[z_key]
 
     value = data[value_key]
-    grid_data = griddata((X, Y, Z), value, ([x_value], [y_value], [z_value]), method).T
+    grid_data = interpolate((X, Y, Z), value, ([x_value], [y_value], [z_value]), method).T
 
     return grid_data
 
 
 
-def data2grid(data, x_key, y_key, value_key, npts=500, method='nearest'):
+def data2grid(data, x_key, y_key, value_key, npts=500, method='nearest', structured=None, verts_key=None):
     '''
     This function takes a 2D data structure from dictionary and creates a 2D
     grid for each array by interpolating. This is useful for plotting.
@@ -132,20 +169,24 @@ def data2grid(data, x_key, y_key, value_key, npts=500, method='nearest'):
      data   - 2D data set from in dictionary format
      x_key  - string to access x data
      y_key  - string to access y data
-     value_key  - string to access data values
+     value_key  - string to access data values (or a list of strings to
+                  interpolate several values with the same weights)
      npts   - Number of points in both x & y to interpolate with 
      method - Method for interpolation
+     structured - True if the x & y points form a tensor product grid, False
+                  to treat them as scattered points, or None to detect it
+     verts_key - optional key of the cell vertices (i.e. xy_verts) to grid
+                 the values of the cells that contain the grid points
 
     '''
 
-    from scipy.interpolate import griddata
-
     X = data[x_key]
     Y = data[y_key]
+    verts = None if verts_key is None else data[verts_key]
     xi, yi = mgrid[X.min():X.max():complex(npts), Y.min():Y.max():complex(npts)]
     grid_data = {}
-    value = data[value_key]
-    grid_data[value_key] = griddata((X, Y), value, (xi, yi), method).T
+    for key, value in interpolate_values(data, (X, Y), value_key, (xi, yi), method, structured, verts).items():
+        grid_data[key] = value.T
     grid_data[x_key] = xi
     grid_data[y_key] = yi
 
@@ -153,7 +194,7 @@ def data2grid(data, x_key, y_key, value_key, npts=500, method='nearest'):
 
 
 
-def data2gridbox(data, x_key, y_key, value_key, xmin, ymin, xmax, ymax,npts=500, method='nearest'):
+def data2gridbox(data, x_key, y_key, value_key, xmin, ymin, xmax, ymax,npts=500, method='nearest', structured=None):
     '''
     This function takes a 2D data structure from a data dictionary and creates
     a 2D grid for each array by interpolating in a user defined region.
@@ -164,24 +205,25 @@ def data2gridbox(data, x_key, y_key, value_key, xmin, ymin, xmax, ymax,npts=500,
       data   - 2D data dump dictionary
       x_key  - string to access x data
       y_key  - string to access y data
-      value_key  - string to access data values
+      value_key  - string to access data values (or a list of strings to
+                  interpolate several values with the same weights)
       xmin   - lower x bound
       ymin   - lower y bound
       xmax   - upper x bound
       ymax   - upper y bound
       npts   - Number of points in both x & y to interpolate with 
       method - Method for interpolation
+      structured - True if the points form a tensor product grid, False
+                   to treat them as scattered points, or None to detect it
     
     '''
-    from scipy.interpolate import griddata
-
     X = data[x_key]
     Y = data[y_key]
     xi, yi = mgrid[xmin:xmax:complex(npts), ymin:ymax:complex(npts)]
 
     grid_data = {}
-    value = data[value_key]
-    grid_data[value_key] = griddata((X, Y), value, (xi, yi), method).T
+    for key, value in interpolate_values(data, (X, Y), value_key, (xi, yi), method, structured).items():
+        grid_data[key] = value.T
     grid_data[x_key] = xi
     grid_data[y_key] = yi
 
@@ -189,7 +231,7 @@ def data2gridbox(data, x_key, y_key, value_key, xmin, ymin, xmax, ymax,npts=500,
 
 
 
-def data2grid3Dslice(data, x_key, y_key, z_key, value_key, z_slice_value, npts=500,method='nearest'):
+def data2grid3Dslice(data, x_key, y_key, z_key, value_key, z_slice_value, npts=500,method='nearest', structured=None):
     ''' 
     This function takes a 3D data structure from a data dictionary and creates
     a 2D grid for each array by interpolating. This is useful for plotting.
@@ -199,21 +241,23 @@ def data2grid3Dslice(data, x_key, y_key, z_key, value_key, z_slice_value, npts=5
       x_key  - string to access x data
       y_key  - string to access y data
       z_key  - string to access z data
-      value_key  - string to access data values
+      value_key  - string to access data values (or a list of strings to
+                  interpolate several values with the same weights)
       z_slice_value = float value where z data should be sliced
       npts   - Number of points in both x & y to interpolate with 
       method - Method for interpolation
+      structured - True if the points form a tensor product grid, False
+                   to treat them as scattered points, or None to detect it
     
     '''
-    from scipy.interpolate import griddata
     X = data[x_key]
     Y = data[y_key]
     Z = data[z_key]
     xi, yi, zi = mgrid[X.min():X.max():complex(npts), Y.min():Y.max():complex(npts), z_slice_value:z_slice_value:1j]
 
     grid_data = {}
-    V = data[value_key]
-    grid_data[value_key] = griddata((X, Y, Z), V, (xi, yi, zi), method).T[0]
+    for key, V in interpolate_values(data, (X, Y, Z), value_key, (xi, yi, zi), method, structured).items():
+        grid_data[key] = V.T[0]
     grid_data[x_key] = xi.T[0]
     grid_data[y_key] = yi.T[0]
 
@@ -227,13 +271,13 @@ def data2line1d(data, x_key, value_key, x1, x2, npts=500, method='nearest'):
         data - a data 1D data dictionary with dump data
         x_key - the key for the x data location
         y_key - the key for the y data location
-        value_key - the key for the value data to extract
+        value_key - the key for the value data to extract (or a list of keys,
+            which returns a {value_key:line values} dictionary)
         x1 - the initial x position of the line out
         y1 - the initial y position of the line out
         x2 - the finial x position of the line out
         y2 - the final y position of the line out
     '''
-    from scipy.interpolate import griddata
     X = data[x_key]
     dX = x2-x1
     line = linspace(0,dX,npts)
@@ -241,13 +285,14 @@ def data2line1d(data, x_key, value_key, x1, x2, npts=500, method='nearest'):
     dx = dX/npts
     for i in range(0,npts):
         xi[i]=x1 + dx*i
-    V = data[value_key]
-    grid_data = griddata((X), V, (xi), method)
+    grid_data = interpolate_values(data, (X), value_key, (xi), method)
+    if not isinstance(value_key, (list, tuple)):
+        grid_data = grid_data[value_key]
     return line, grid_data
 
 
 
-def data2line2d(data, x_key, y_key, value_key, x1, y1, x2, y2, npts=500, method='nearest'):
+def data2line2d(data, x_key, y_key, value_key, x1, y1, x2, y2, npts=500, method='nearest', structured=None, verts_key=None):
     '''
     Extract a 1D lineout from a 2D data dictionary.
 
@@ -255,13 +300,17 @@ def data2line2d(data, x_key, y_key, value_key, x1, y1, x2, y2, npts=500, method=
         data - a data 2D data dictionary with dump data
         x_key - the key for the x data location
         y_key - the key for the y data location
-        value_key - the key for the value data to extract
+        value_key - the key for the value data to extract (or a list of keys,
+            which returns a {value_key:line values} dictionary)
         x1 - the initial x position of the line out
         y1 - the initial y position of the line out
         x2 - the finial x position of the line out
         y2 - the final y position of the line out
+        structured - True if the points form a tensor product grid, False to
+            treat them as scattered points, or None to detect it
+        verts_key - optional key of the cell vertices (i.e. xy_verts) to extract
+            the values of the cells that contain the line points
     '''
-    from scipy.interpolate import griddata
     X = data[x_key]
     Y = data[y_key]
     dX = x2-x1
@@ -274,12 +323,14 @@ def data2line2d(data, x_key, y_key, value_key, x1, y1, x2, y2, npts=500, method=
     for i in range(0,npts):
         xi[i]=x1 + dx*i
         yi[i]=y1 + dy*i
-    V = data[value_key]
-    grid_data = griddata((X, Y), V, (xi, yi), method)
+    verts = None if verts_key is None else data[verts_key]
+    grid_data = interpolate_values(data, (X, Y), value_key, (xi, yi), method, structured, verts)
+    if not isinstance(value_key, (list, tuple)):
+        grid_data = grid_data[value_key]
     return line, grid_data
 
 
-def data2line3d(data, x_key, y_key, z_key, value_key, x1, y1, z1,  x2, y2, z2, npts=500, method='nearest'):
+def data2line3d(data, x_key, y_key, z_key, value_key, x1, y1, z1,  x2, y2, z2, npts=500, method='nearest', structured=None):
     '''
     Extract a 1D lineout from a 3D data dictionary.
 
@@ -287,13 +338,15 @@ def data2line3d(data, x_key, y_key, z_key, value_key, x1, y1, z1,  x2, y2, z2, n
         data - a data 2D data dictionary with dump data
         x_key - the key for the x data location
         y_key - the key for the y data location
-        value_key - the key for the value data to extract
+        value_key - the key for the value data to extract (or a list of keys,
+            which returns a {value_key:line values} dictionary)
         x1 - the initial x position of the line out
         y1 - the initial y position of the line out
         x2 - the finial x position of the line out
         y2 - the final y position of the line out
+        structured - True if the points form a tensor product grid, False to
+            treat them as scattered points, or None to detect it
     '''
-    from scipy.interpolate import griddata
     X = data[x_key]
     Y = data[y_key]
     Z = data[z_key]
@@ -312,56 +365,66 @@ def data2line3d(data, x_key, y_key, z_key, value_key, x1, y1, z1,  x2, y2, z2, n
         yi[i]=y1 + dy*i
         zi[i]=z1 + dz*i
 
-    V = data[value_key]
-    grid_data = griddata((X, Y, Z), V, (xi, yi,zi), method)
+    grid_data = interpolate_values(data, (X, Y, Z), value_key, (xi, yi, zi), method, structured)
+    if not isinstance(value_key, (list, tuple)):
+        grid_data = grid_data[value_key]
     return line, grid_data
 
 
 
 def extract_series_point(data_list,series_key,value_key,dim_keys,point_values,method='nearest'):
     '''
-    This function extracts the data values at a specified position from a
-    series of data dictionaries.
+    This function extracts the data values at specified positions from a
+    series of data dictionaries. Every probe point and value key is
+    interpolated with the same weights for each dump, so many probe histories
+    take one pass over the dumps.
 
     arguments:
         data_list - a list of data dictionaries with dump data
         series_key - the key for the x tracer data
-        value_key - the key for the y tracer data
+        value_key - the key for the y tracer data (or a list of keys)
         dim_keys - list of keys to extract the data points for example:
             ['x'], ['x','y'], or  ['x','y','z']
         point values - list of float values to interpolate to for each designated point keys
+            (or a list of such points, i.e. [[1.0,2.0],[3.0,4.0]])
         method - Method for interpolation
+
+    returns:
+        the series dictionary {series_key:values} and the value dictionary
+        {value_key:values}. The values of a list of points have a column for
+        each point.
     '''
     dim = len(dim_keys)
-    if len(point_values) is not dim:
+    points = array(point_values, dtype=float)
+    single_point = points.ndim == 1
+    points = atleast_2d(points)
+    if points.ndim != 2 or points.shape[1] != dim:
         print("ERROR: length of point values do not match the length of point keys")
         sys.exit(0)
+    value_keys = _value_keys(value_key)
+    xi = tuple(points.T)
     T = []
-    Y = []
+    Y = {key:[] for key in value_keys}
     for data in data_list:
-        if dim == 1:
-            T.append(data[series_key])
-            if len(data[value_key]) == 1:
-                Y.append(data[value_key][0])
-            else:
-                Y.append(point_value_1d(data, dim_keys[0], value_key, point_values[0], method)[0])
-        elif dim == 2:
-            T.append(data[series_key])
-            if len(data[value_key]) == 1:
-                Y.append(data[value_key][0])
-            else:
-                Y.append(point_value_2d(data, dim_keys[0], dim_keys[1], value_key, point_values[0], point_values[1], method)[0])
-        else:
-            T.append(data[series_key])
-            if len(data[value_key]) == 1:
-                Y.append(data[value_key][0])
+        T.append(data[series_key])
+        # single values (i.e. a 0D dump) are the value at every point
+        mesh_keys = [key for key in value_keys if len(data[key]) != 1]
+        values = {}
+        if len(mesh_keys) > 0:
+            values = interpolate_values(data, tuple(data[key] for key in dim_keys), mesh_keys, xi, method)
+        for key in value_keys:
+            if key in values:
+                Y[key].append(values[key])
             else:
-                Y.append(point_value_3d(data, dim_keys[0], dim_keys[1], dim_keys[2], value_key, point_values[0], point_values[1], point_values[2], method)[0])
+                Y[key].append(full(len(points), data[key][0]))
     
     t = {}
     t[series_key] = array(T)
     grid = {}
-    grid[value_key] = array(Y)
+    for key in value_keys:
+        grid[key] = array(Y[key]).reshape(len(T), len(points))
+        if single_point:
+            grid[key] = grid[key][:,0]
 
     return t, grid
 
@@ -482,12 +545,19 @@ def extract_series_2d_slice(data_list,series_key,value_key,dim_keys, slice_value
 
     return t, grid
 
+def _build_dump_dictionary(task):
+    '''
+    Worker pool task that parses a single dump file
+    '''
+    opppy_parser, file_name, key_words = task
+    opppy_parser = worker_parser(opppy_parser)
+    return opppy_parser.build_data_dictionary(file_name,key_words)
+
 def append_dumps(data, dump_files, opppy_parser, key_words=None, nthreads=0):
     '''
     Append output data from a list of output_files to a user provided dictionary using a user proved
-    opppy_parser. By default this function will use the multiprocessing option to parallelize the
-    parsing of multiple dumps. The parallel parsing can be disabled by setting
-    the environment variable 'OPPPY_USE_THREADS=False'
+    opppy_parser. With nthreads>0 the dumps are handed out one at a time to the
+    shared worker pool (see opppy.parallel) so uneven dump sizes stay balanced.
 
     Input options:
         data opppy input dictionary to be append to (must have a 'verion' opppy key)
@@ -503,25 +573,14 @@ def append_dumps(data, dump_files, opppy_parser, key_words=None, nthreads=0):
     print("Number of files to be read: ", total)
     nthreads = cpu_count() if nthreads < 0 else nthreads
     if(nthreads>0):
-        def thread_all(file_name, key_words, result_d):
-            result_d[file_name.split('/')[-1]] = opppy_parser.build_data_dictionary(file_name,key_words)
         print("Number of threads used for processing: ",nthreads)
-        for stride in range(math.ceil(float(total)/float(nthreads))):
-            files = dump_files[nthreads*stride:array([nthreads*(stride+1),len(dump_files)]).min()]
-            with Manager() as manager:
-                result_d = manager.dict()
-                threads = []
-                for file_name in files:
-                    thread = Process(target=thread_all, args=(file_name, key_words, result_d,))
-                    thread.start()
-                    threads.append(thread)
-                for thread in threads:
-                    thread.join()
-                    count += 1
-                    progress(count,total, 'of input files read')
-                data.update(result_d)
-                del result_d
-                del threads
+        # parsers that can not be pickled are inherited by forked workers
+        pool, task_parser = get_parser_pool(nthreads, opppy_parser)
+        results = pool.imap(_build_dump_dictionary, [(task_parser, file_name, key_words) for file_name in dump_files], chunksize=1)
+        for file_name, dump_data in zip(dump_files, results):
+            data[file_name.split('/')[-1]] = dump_data
+            count += 1
+            progress(count,total, 'of input files read')
     else:
         for dump in dump_files:
           # append new dictionary data to the pickle file
@@ -571,12 +630,12 @@ def print_dump_dictionary_data(data):
         print('')
     print("######################################################")
 
-def generate_dump_dictionary_list(dump_names, opppy_dump_parser, key_words=None, pickle_files=None, case_files=None ):
+def generate_dump_dictionary_list(dump_names, opppy_dump_parser, key_words=None, pickle_files=None, case_files=None, cache=None):
     dictionaries = []
     if pickle_files is not None:
         # get the dictionaries from the pickle files
         for filename in pickle_files:
-            pickle_data = pickle.load(open(filename,'rb'))
+            pickle_data = load_data(filename, dump_names, lazy=True)
             for dump_name in dump_names:
                 if dump_name in list(pickle_data.keys()):
                     dictionaries.append(pickle_data[dump_name])
@@ -585,17 +644,18 @@ def generate_dump_dictionary_list(dump_names, opppy_dump_parser, key_words=None,
             dictionaries = build_case_data_list(case_file, dump_names, opppy_dump_parser, key_words)
     else:
         # Parse data from dump files
-        dictionaries = build_data_list(dump_names, opppy_dump_parser, key_words)
+        dictionaries = build_data_list(dump_names, opppy_dump_parser, key_words, cache)
 
     return dictionaries
 
-def build_data_list(dump_names, opppy_dump_parser, key_words=None):
+def build_data_list(dump_names, opppy_dump_parser, key_words=None, cache=None):
     '''
     This function generates a opppy output dictionary
     data from an output file.
     
     args:
       args - Parsed input arguments
+      cache - optional opppy.parse_cache.parse_cache of parsed dictionaries
     '''
     # build a new dictionary
     dictionary_data = []
@@ -603,7 +663,11 @@ def build_data_list(dump_names, opppy_dump_parser, key_words=None):
     count = 0
     for dump in dump_names:
       # append new dictionary data to the pickle file
-      dictionary_data.append(opppy_dump_parser.build_data_dictionary(dump,key_words))
+      if cache is not None:
+        dictionary_data.append(cache.cached('dump', [dump], opppy_dump_parser,
+            lambda: opppy_dump_parser.build_data_dictionary(dump,key_words), key_words))
+      else:
+        dictionary_data.append(opppy_dump_parser.build_data_dictionary(dump,key_words))
       count += 1
       progress(count,total, 'of dump files read')
 
@@ -0,0 +1,240 @@
+# ---------------------------*-python-*----------------------------------------#
+# file   export.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+'''
+Export OPPPY output and tally dictionaries to Parquet or Arrow tables
+
+Every output dictionary (i.e. data['density']) becomes a table with one
+column per key, so pandas, pyarrow or any other Parquet/Arrow reader can load
+a few columns without OPPPY. Tally data becomes a table of the cycle scalars
+(tally_cycle_data) and one table per tally with a row for every bin of every
+cycle. Both tables carry the cycle_info columns (i.e. cycle and time). Values
+that a cycle did not report (see opppy.columnar) are written as nulls.
+
+.. autosummary::
+
+  output_tables
+  tally_tables
+  write_table
+  export_tables
+  export_output
+  export_tally
+'''
+
+import os
+import sys
+from urllib.parse import quote
+from collections.abc import Mapping
+
+import numpy as np
+
+from opppy.columnar import columnar_dictionary
+from opppy.storage import load_data, atomic_file
+
+EXPORT_FORMATS = ('parquet', 'arrow')
+EXPORT_EXTENSIONS = {'parquet':'.parquet', 'arrow':'.arrow'}
+
+# top level keys that are not cycle series
+_metadata_keys = ('version', 'appended_files', 'problem_data')
+
+def _import_pyarrow():
+    '''
+    Import pyarrow only when a table is written
+    '''
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        import pyarrow.feather
+    except ImportError:
+        print("Error: pyarrow is required to export Parquet or Arrow files")
+        sys.exit(0)
+    return pyarrow
+
+def _column(values):
+    '''
+    Return a list of values as a NumPy column
+    '''
+    if isinstance(values, np.ndarray):
+        return values
+    column = np.asarray(values)
+    if column.ndim != 1:
+        # rows of arrays (or ragged lists) stay python objects
+        column = np.empty(len(values), dtype=object)
+        column[:] = list(values)
+    return column
+
+def output_tables(data, dictionary_names=None):
+    '''
+    Return the tables of an output data dictionary as {name:{column:(values,
+    valid)}}, where valid is a boolean mask of the reported values (None if
+    every value was reported)
+
+    arguments:
+        data the OPPPY output dictionary
+        dictionary_names optional list of dictionaries to export (default all)
+    '''
+    tables = {}
+    for name in data:
+        if name in _metadata_keys or (dictionary_names is not None and name not in dictionary_names):
+            continue
+        dictionary = data[name]
+        if not isinstance(dictionary, Mapping):
+            continue
+        table = {}
+        for key in dictionary:
+            if isinstance(dictionary, columnar_dictionary):
+                table[key] = (dictionary[key], dictionary.valid(key))
+            else:
+                table[key] = (_column(dictionary[key]), None)
+        lengths = set(len(values) for values, valid in table.values())
+        if len(lengths) > 1:
+            print("Error: the series of dictionary", name, "have different lengths", sorted(lengths))
+            sys.exit(0)
+        tables[name] = table
+    return tables
+
+def _cycle_info_keys(data):
+    '''
+    Return the cycle_info keys of a tally dictionary (the series with a value
+    for every tally cycle)
+    '''
+    ncycles = len(data['tally_cycle_data'])
+    return [key for key in data if key not in _metadata_keys and key != 'tally_cycle_data'
+            and isinstance(data[key], (list, np.ndarray)) and len(data[key]) == ncycles]
+
+def _fill_table(rows, data, cycle_info_keys, min_rows=0):
+    '''
+    Build table columns from a list of (cycle index, {column:values}) rows,
+    repeating the cycle_info values for every row of a cycle
+    '''
+    keys = []
+    for cycle, row in rows:
+        keys.extend(key for key in row if key not in keys and key not in cycle_info_keys)
+    columns = {key:[] for key in cycle_info_keys+keys}
+    valid = {key:[] for key in keys}
+    for cycle, row in rows:
+        nrows = max([len(np.atleast_1d(values)) for values in row.values()]+[min_rows])
+        for key in cycle_info_keys:
+            columns[key].extend([data[key][cycle]]*nrows)
+        for key in keys:
+            values = list(np.atleast_1d(row[key])) if key in row else []
+            columns[key].extend(values+[0]*(nrows-len(values)))
+            valid[key].extend([True]*len(values)+[False]*(nrows-len(values)))
+    table = {}
+    for key in columns:
+        mask = np.array(valid[key], dtype=bool) if key in valid else None
+        table[key] = (_column(columns[key]), None if mask is None or mask.all() else mask)
+    return table
+
+def tally_tables(data, tally_names=None):
+    '''
+    Return the tables of a tally data dictionary as {name:{column:(values,
+    valid)}} (see output_tables). The tally_cycle_data table has a row per
+    cycle with the scalar tally values and every other table has a row per
+    bin of each cycle.
+
+    arguments:
+        data the OPPPY tally dictionary
+        tally_names optional list of tables to export (default all)
+    '''
+    if 'tally_cycle_data' not in data:
+        return {}
+    cycle_info_keys = _cycle_info_keys(data)
+    scalar_rows = []
+    tally_rows = {}
+    for cycle, cycle_data in enumerate(data['tally_cycle_data']):
+        scalars = {}
+        for key, value in cycle_data.items():
+            if isinstance(value, Mapping):
+                tally_rows.setdefault(key, []).append((cycle, value))
+            else:
+                scalars[key] = [value]
+        scalar_rows.append((cycle, scalars))
+    tables = {}
+    if tally_names is None or 'tally_cycle_data' in tally_names:
+        # every cycle has a row, even without scalar values
+        tables['tally_cycle_data'] = _fill_table(scalar_rows, data, cycle_info_keys, 1)
+    for name, rows in tally_rows.items():
+        if tally_names is None or name in tally_names:
+            tables[name] = _fill_table(rows, data, cycle_info_keys)
+    return tables
+
+def write_table(table, file_name, file_format='parquet'):
+    '''
+    Write a table (see output_tables) to a Parquet or Arrow IPC (Feather V2)
+    file. The file is replaced atomically.
+
+    arguments:
+        table the {column:(values, valid)} table
+        file_name the table file name
+        file_format parquet or arrow
+    '''
+    if file_format not in EXPORT_FORMATS:
+        print("Error: unknown export format", file_format, "- use one of", EXPORT_FORMATS)
+        sys.exit(0)
+    pyarrow = _import_pyarrow()
+    arrays = []
+    for values, valid in table.values():
+        mask = None if valid is None else ~valid
+        if values.dtype.kind == 'O':
+            arrays.append(pyarrow.array(values.tolist(), mask=mask))
+        else:
+            arrays.append(pyarrow.array(values, mask=mask))
+    arrow_table = pyarrow.Table.from_arrays(arrays, names=[str(key) for key in table])
+    with atomic_file(file_name) as temp_name:
+        if file_format == 'parquet':
+            pyarrow.parquet.write_table(arrow_table, temp_name)
+        else:
+            pyarrow.feather.write_feather(arrow_table, temp_name)
+
+def export_tables(tables, directory, file_format='parquet'):
+    '''
+    Write each table to directory/<table name>.<format extension>. Table
+    names are quoted so any dictionary name is a valid file name.
+
+    arguments:
+        tables the {name:table} dictionary (see output_tables)
+        directory the export directory
+        file_format parquet or arrow
+
+    returns:
+        the list of written files
+    '''
+    os.makedirs(directory, exist_ok=True)
+    file_names = []
+    for name, table in tables.items():
+        file_name = os.path.join(directory, quote(str(name), safe=' ')+EXPORT_EXTENSIONS.get(file_format, ''))
+        write_table(table, file_name, file_format)
+        file_names.append(file_name)
+    return file_names
+
+def export_output(file_name, directory, dictionary_names=None, file_format='parquet'):
+    '''
+    Export the dictionaries of an OPPPY output data file (only the requested
+    dictionaries are loaded from formats that can load single keys)
+
+    arguments:
+        file_name the OPPPY data file
+        directory the export directory
+        dictionary_names optional list of dictionaries to export (default all)
+        file_format parquet or arrow
+    '''
+    data = load_data(file_name, dictionary_names, lazy=True)
+    return export_tables(output_tables(data, dictionary_names), directory, file_format)
+
+def export_tally(file_name, directory, tally_names=None, file_format='parquet'):
+    '''
+    Export the tally tables of an OPPPY tally data file
+
+    arguments:
+        file_name the OPPPY data file
+        directory the export directory
+        tally_names optional list of tables to export (default all)
+        file_format parquet or arrow
+    '''
+    data = load_data(file_name)
+    return export_tables(tally_tables(data, tally_names), directory, file_format)
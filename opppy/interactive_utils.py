@@ -29,9 +29,67 @@ from opppy.dump_utils import *
 from opppy.plot_dictionary import *
 from opppy.plot_dump_dictionary import *
 from opppy.output import *
+from opppy.parse_stats import parse_stats, stage_timer
+from opppy.storage import is_hdf5_file, load_data, load_data_list, save_data, lock_data, COMPRESSIONS
+from opppy.journal import journal_name, journal_header, journal_fraction, compact_journal, append_output_journal
+from opppy.shard import shard_files, merge_shards, append_output_shard, append_tally_shard, append_dump_shard
+from opppy.migration import check_data_version, migrate_file
+from opppy.parse_cache import parse_cache
+from opppy.export import EXPORT_FORMATS, export_output, export_tally
 from opppy.plotting_help import *
 from opppy.tally import *
 
+def merge_pending_shards(args, opppy_parser=None):
+    '''
+    Merge the shards of args.pickle_name (written by pickle --shard) into the
+    pickle file before it is appended to. The caller holds the file lock.
+
+    arguments:
+        args - Parsed input arguments
+        opppy_parser - optional user parser with a post_parse hook
+    '''
+    if len(shard_files(args.pickle_name)) == 0:
+        return
+    update_function = None
+    if opppy_parser is not None and hasattr(opppy_parser, "post_parse"):
+        update_function = lambda data: opppy_parser.post_parse(args, data)
+    merge_shards(args.pickle_name, update_function, args.compression)
+    print("Shards Merged To: ", args.pickle_name)
+
+def read_budget(args):
+    '''
+    Return the --read_budget argument in bytes (None for no budget)
+
+    arguments:
+        args - Parsed input arguments
+    '''
+    if args.read_budget is None:
+        return None
+    return int(args.read_budget*1.0e6)
+
+def add_parse_cache_options(parser):
+    '''
+    This function adds the parse cache options (used by get_parse_cache) to an
+    argparser object
+
+    arguments:
+        parser - argparse parser to add the options to
+    '''
+    parser.add_argument('-pc','--parse_cache', dest='parse_cache', help='Cache the parsed files in a directory (default $OPPPY_PARSE_CACHE or ~/.cache/opppy), so plotting them again skips parsing', nargs='?', const='', default=None)
+    parser.add_argument('-pcs','--parse_cache_size', dest='parse_cache_size', help='Size cap (MB) of the parse cache. The least recently used entries are removed', nargs='?', type=float, default=1024.0)
+
+def get_parse_cache(args):
+    '''
+    Return the parse_cache of the --parse_cache arguments (None if the parsed
+    files are not cached)
+
+    arguments:
+        args - Parsed input arguments
+    '''
+    if args.parse_cache is None:
+        return None
+    return parse_cache(args.parse_cache if args.parse_cache else None, int(args.parse_cache_size*1.0e6))
+
 def get_option_num(nmax):
     '''
     Interactive request for a valid number in a range from 1 to nmax provided
@@ -126,6 +184,8 @@ class interactive_output_parser:
         self.parser = argument_parser
         self.subparser = self.parser.add_subparsers(help="Output options")
         self.pickle_output_parser(self.subparser)
+        self.follow_output_parser(self.subparser)
+        self.export_output_parser(self.subparser)
         self.plot_dictionary_parser(self.subparser)
         self.plot_output_parser(self.subparser)
 
@@ -138,38 +198,132 @@ class interactive_output_parser:
           arguments:
             args - Parsed input arguments
         '''
-        data = {}
-        data['version'] = __version__
-        try:
-          data = pickle.load(open(args.pickle_name,'rb'))
-          print("Appending to the existing pickle file - ", args.pickle_name)
-        except:
-          print("Generating a new pickle file - ", args.pickle_name)
+        stats = parse_stats() if args.profile else None
+        if args.shard:
+            self.append_shard(args, stats)
+            return
+        with lock_data(args.pickle_name):
+            merge_pending_shards(args, self.opppy_parser)
+            if args.journal or args.compact_journal:
+                self.append_journal(args, stats)
+                return
+            # HDF5 files are appended in place, so only their version is read
+            in_place = is_hdf5_file(args.pickle_name) and not hasattr(self.opppy_parser, "post_parse") and journal_header(args.pickle_name)[0] is None
+            data = {}
+            data['version'] = __version__
+            new_pickle = False
+            try:
+              with stage_timer(stats, 'load'):
+                data = load_data(args.pickle_name, [] if in_place else None)
+              print("Appending to the existing pickle file - ", args.pickle_name)
+            except:
+              print("Generating a new pickle file - ", args.pickle_name)
+              new_pickle = True
     
-        if not 'version' in data or not (data['version'] == __version__):
-          print('')
-          print("Error: pickle file does not match this version of OPPPY")
-          if 'version' in data:
-            print(args.pickle_name, "was build with version", data['version'])
-          else:
-            print("This ", args.pickle_name," has no version")
-          print("This version of OPPPY is ", __version__)
-          print("Delete the old ", args.pickle_name, "file and rebuild it")
-          sys.exit(0)
+            if not in_place:
+                # in place appends upgrade the stored file (see append_output_hdf5)
+                check_data_version(data, args.pickle_name)
 
-        if hasattr(self.opppy_parser, "pre_parse"):
-            self.opppy_parser.pre_parse(args)
+            if hasattr(self.opppy_parser, "pre_parse"):
+                self.opppy_parser.pre_parse(args)
 
-        # append new dictionary data to the pickle file
-        append_output_dictionary(data, args.output_files, self.opppy_parser, args.append_date, args.nthreads)
+            cycle_index = None
+            if args.cycle_index:
+                cycle_index = load_cycle_index(args.pickle_name+'.index', self.opppy_parser)
+                if new_pickle:
+                    cycle_index['files'] = {}
 
-        if hasattr(self.opppy_parser, "post_parse"):
-            self.opppy_parser.post_parse(args, data)
+            if in_place:
+                append_output_hdf5(args.pickle_name, args.output_files, self.opppy_parser, args.append_date, args.nthreads, cycle_index, args.columnar, stats, args.compression)
+                print("Output Data Saved To: ", args.pickle_name)
+                if cycle_index is not None:
+                    save_cycle_index(cycle_index, args.pickle_name+'.index')
+                if stats is not None:
+                    stats.print_summary()
+                return
+
+            # append new dictionary data to the pickle file
+            append_output_dictionary(data, args.output_files, self.opppy_parser, args.append_date, args.nthreads, cycle_index, args.columnar, stats)
+
+            if hasattr(self.opppy_parser, "post_parse"):
+                with stage_timer(stats, 'post_parse'):
+                    self.opppy_parser.post_parse(args, data)
 
    
-        pickle.dump(data,open(args.pickle_name,"wb"))
-        print("Output Data Saved To: ", args.pickle_name)
+            with stage_timer(stats, 'pickle'):
+                save_data(data, args.pickle_name, compression=args.compression)
+            print("Output Data Saved To: ", args.pickle_name)
+            if cycle_index is not None:
+                save_cycle_index(cycle_index, args.pickle_name+'.index')
+            if stats is not None:
+                stats.print_summary()
+
+
+    def append_journal(self, args, stats=None):
+        '''
+        append_journal - 
+          This function appends the new cycles of the output files to the
+          journal of a opppy data file without rewriting the data file. The
+          journal is compacted into the data file on request or once it
+          grows past args.max_journal_fraction of the data file size.
+        
+          arguments:
+            args - Parsed input arguments
+            stats - optional parse_stats object
+        '''
+        header, end = journal_header(args.pickle_name)
+        if header is None and isfile(args.pickle_name):
+          data = load_data(args.pickle_name, [], journal=False)
+          if data.get('version') != __version__ and migrate_file(args.pickle_name, args.compression):
+            data = load_data(args.pickle_name, [], journal=False)
+          check_data_version(data, args.pickle_name)
+
+        if hasattr(self.opppy_parser, "pre_parse"):
+            self.opppy_parser.pre_parse(args)
+
+        cycle_index = None
+        if args.cycle_index:
+            cycle_index = load_cycle_index(args.pickle_name+'.index', self.opppy_parser)
+            if header is None and not isfile(args.pickle_name):
+                cycle_index['files'] = {}
 
+        if args.journal:
+            append_output_journal(args.pickle_name, args.output_files, self.opppy_parser, args.append_date, args.nthreads, cycle_index, args.columnar, stats)
+            print("Output Data Journaled To: ", journal_name(args.pickle_name))
+        if cycle_index is not None:
+            save_cycle_index(cycle_index, args.pickle_name+'.index')
+
+        if args.compact_journal or journal_fraction(args.pickle_name) > args.max_journal_fraction:
+            update_function = None
+            if hasattr(self.opppy_parser, "post_parse"):
+                update_function = lambda data: self.opppy_parser.post_parse(args, data)
+            with stage_timer(stats, 'pickle'):
+                compact_journal(args.pickle_name, update_function, args.compression)
+            print("Journal Compacted To: ", args.pickle_name)
+        if stats is not None:
+            stats.print_summary()
+
+    def append_shard(self, args, stats=None):
+        '''
+        append_shard - 
+          This function parses the output files into a new shard of the
+          opppy pickle file (pickle_file.shards) without reading or locking
+          the pickle file, so many ingest processes can run at once. Shards
+          are merged when the pickle file is read and folded into the pickle
+          file by the next append without --shard.
+        
+          arguments:
+            args - Parsed input arguments
+            stats - optional parse_stats object
+        '''
+        if args.cycle_index or args.journal or args.compact_journal:
+            print("Error: --shard can not be combined with --cycle_index or the journal options")
+            sys.exit(0)
+        if hasattr(self.opppy_parser, "pre_parse"):
+            self.opppy_parser.pre_parse(args)
+        append_output_shard(args.pickle_name, args.output_files, self.opppy_parser, args.append_date, args.nthreads, args.columnar, stats)
+        if stats is not None:
+            stats.print_summary()
 
     def pickle_output_parser(self, subparser):
         pickle_parser = subparser.add_parser('pickle', help=" A simple example: pickle_output --pickle_file your_output_pickle_file.p --output_files you_output_files_to_pickle  ")
@@ -177,11 +331,83 @@ class interactive_output_parser:
         pickle_parser.add_argument('-pf','--pickle_file', dest='pickle_name', help='Pickle file name to be created or appended to', required=True )
         pickle_parser.add_argument('-ad','--append_date', dest='append_date', help='Append the date and time to the output file name', nargs='?', type=bool, const=True, default=False)
         pickle_parser.add_argument('-nt','--nthreads', dest='nthreads', help='Number of threads to use during parsing', nargs='?', type=int, default=0)
+        pickle_parser.add_argument('-ci','--cycle_index', dest='cycle_index', help='Keep a cycle index (pickle_file.index) so only new cycles of previously parsed files are parsed', nargs='?', type=bool, const=True, default=False)
+        pickle_parser.add_argument('-col','--columnar', dest='columnar', help='Store the data as columnar NumPy arrays', nargs='?', type=bool, const=True, default=False)
+        pickle_parser.add_argument('-prof','--profile', dest='profile', help='Print the time spent parsing, merging and pickling the output files', nargs='?', type=bool, const=True, default=False)
+        pickle_parser.add_argument('-z','--compression', dest='compression', help='Compress the pickle file (none, zlib, lzma, zlib+shuffle or lzma+shuffle). By default an existing file keeps its compression', nargs='?', choices=COMPRESSIONS, default=None)
+        pickle_parser.add_argument('-j','--journal', dest='journal', help='Append the new cycles to the pickle_file.journal instead of rewriting the pickle file', nargs='?', type=bool, const=True, default=False)
+        pickle_parser.add_argument('-cj','--compact_journal', dest='compact_journal', help='Merge the pickle_file.journal into the pickle file', nargs='?', type=bool, const=True, default=False)
+        pickle_parser.add_argument('-mjf','--max_journal_fraction', dest='max_journal_fraction', help='Compact the journal once it is larger than this fraction of the pickle file', nargs='?', type=float, default=1.0)
+        pickle_parser.add_argument('-sh','--shard', dest='shard', help='Write the parsed data to a new shard in pickle_file.shards instead of the pickle file (for concurrent ingest processes). Shards are merged on read and by the next append without --shard', nargs='?', type=bool, const=True, default=False)
         if hasattr(self.opppy_parser, "add_parser_args"):
             self.opppy_parser.add_parser_args(pickle_parser)
         pickle_parser.set_defaults(func=self.append_pickle)
  
 
+    def follow_output(self, args):
+        '''
+        follow_output - 
+          This function follows the output files of a running simulation and
+          appends newly completed cycles to a opppy pickle file.
+        
+          arguments:
+            args - Parsed input arguments
+        '''
+        data = {}
+        data['version'] = __version__
+        cycle_index = None
+        try:
+          data = load_data(args.pickle_name)
+          print("Appending to the existing pickle file - ", args.pickle_name)
+        except:
+          print("Generating a new pickle file - ", args.pickle_name)
+          cycle_index = new_cycle_index(self.opppy_parser)
+    
+        check_data_version(data, args.pickle_name)
+
+        if hasattr(self.opppy_parser, "pre_parse"):
+            self.opppy_parser.pre_parse(args)
+
+        update_function = None
+        if hasattr(self.opppy_parser, "post_parse"):
+            update_function = lambda data: self.opppy_parser.post_parse(args, data)
+
+        follow_output_dictionary(data, args.output_files, self.opppy_parser, args.interval,
+                args.pickle_name, cycle_index, update_function, args.max_updates)
+        print("Output Data Saved To: ", args.pickle_name)
+
+    def follow_output_parser(self, subparser):
+        follow_parser = subparser.add_parser('follow', help=" A simple example: follow --pickle_file your_output_pickle_file.p --output_files your_running_output_files -i 60 ")
+        follow_parser.add_argument('-of','--output_files', dest='output_files', help='output files to follow and append to the pickle file', nargs='+', required=True )
+        follow_parser.add_argument('-pf','--pickle_file', dest='pickle_name', help='Pickle file name to be created or appended to', required=True )
+        follow_parser.add_argument('-i','--interval', dest='interval', help='Number of seconds to wait between checks for new cycles', nargs='?', type=float, default=60.0)
+        follow_parser.add_argument('-mu','--max_updates', dest='max_updates', help='Maximum number of checks for new cycles (default follows until the output files are complete)', nargs='?', type=int, default=None)
+        if hasattr(self.opppy_parser, "add_parser_args"):
+            self.opppy_parser.add_parser_args(follow_parser)
+        follow_parser.set_defaults(func=self.follow_output)
+
+    def export_output(self, args):
+        '''
+        export_output - 
+          This function exports the dictionaries of a opppy pickle file to
+          Parquet or Arrow tables that can be read without OPPPY.
+        
+          arguments:
+            args - Parsed input arguments
+        '''
+        file_names = export_output(args.pickle_name, args.export_directory, args.dictionary_names, args.export_format)
+        for file_name in file_names:
+            print("Exported: ", file_name)
+
+    def export_output_parser(self, subparser):
+        export_parser = subparser.add_parser('export', help=" A simple example: export --pickle_file your_output_pickle_file.p --export_directory your_tables -dn density ")
+        export_parser.add_argument('-pf','--pickle_file', dest='pickle_name', help='Pickle file name to be exported', required=True )
+        export_parser.add_argument('-ed','--export_directory', dest='export_directory', help='Directory of the exported tables (one file per dictionary)', required=True )
+        export_parser.add_argument('-dn','--dictionary_names', dest='dictionary_names', help='Only export the specified dictionaries', nargs='+', default=None )
+        export_parser.add_argument('-ef','--export_format', dest='export_format', help='Table format (parquet or arrow)', nargs='?', choices=EXPORT_FORMATS, default='parquet')
+        export_parser.set_defaults(func=self.export_output)
+ 
+
     def plot_dictionary_parser(self, subparser):
         '''
         Add a parser for the dictionary plotter to a user provided subparser
@@ -191,8 +417,12 @@ class interactive_output_parser:
         input_type_parser.add_argument('-pf','--pickle_files', dest='pickle_files', help='pickle files to be plotted (run1.p run2.p etc...)', nargs='+' )
         input_type_parser.add_argument('-of','--output_files', dest='output_files', help='output files to be parsed and plotted (output_file1.txt output_file2.txt etc...)', nargs='+', action='append')
         plot_parser.add_argument('-nt','--nthreads', dest='nthreads', help='Number of threads to use during parsing', nargs='?', type=int, default=0)
+        plot_parser.add_argument('-col','--columnar', dest='columnar', help='Store the parsed output files as columnar NumPy arrays', nargs='?', type=bool, const=True, default=False)
+        plot_parser.add_argument('-prof','--profile', dest='profile', help='Print the time spent parsing, loading and plotting the data', nargs='?', type=bool, const=True, default=False)
+        plot_parser.add_argument('-rb','--read_budget', dest='read_budget', help='Limit (MB) on the size of the pickle files that are read at the same time with --nthreads (the loaded data can be larger)', nargs='?', type=float, default=None)
         self.dict_ploter = plot_dictionary()
         self.dict_ploter.setup_parser(plot_parser)
+        add_parse_cache_options(plot_parser)
         if hasattr(self.opppy_parser, "add_parser_args"):
             self.opppy_parser.add_parser_args(plot_parser)
         plot_parser.set_defaults(func=self.plot_dictionary)
@@ -204,6 +434,7 @@ class interactive_output_parser:
         arguments:
             args parsed dictionary plotting arguments
         '''
+        stats = parse_stats() if args.profile else None
         dictionaries = []
         file_names = []
         if args.output_files is not None:
@@ -211,19 +442,25 @@ class interactive_output_parser:
                 self.opppy_parser.pre_parse(args)
             dictionaries, file_names = build_output_dictionary_list(args.output_files,
                                                                     self.opppy_parser,
-                                                                    nthreads=args.nthreads)
+                                                                    nthreads=args.nthreads,
+                                                                    columnar=args.columnar,
+                                                                    stats=stats,
+                                                                    cache=get_parse_cache(args))
             if hasattr(self.opppy_parser, "post_parse"):
-                for data in dictionaries:
-                    self.opppy_parser.post_parse(args, data)
+                with stage_timer(stats, 'post_parse'):
+                    for data in dictionaries:
+                        self.opppy_parser.post_parse(args, data)
         else:
             # get the dictionaries from the pickle files
             file_names = args.pickle_files
-            for filename in args.pickle_files:
-                pickle_data = pickle.load(open(filename,'rb'))
-                dictionaries.append(pickle_data)
+            with stage_timer(stats, 'load'):
+                dictionaries = load_data_list(args.pickle_files, [args.dictionary_name], True, args.nthreads, read_budget(args))
     
         # plot dictionaries based on input arguments
-        self.dict_ploter.plot_dict(args,dictionaries,file_names)
+        with stage_timer(stats, 'plot'):
+            self.dict_ploter.plot_dict(args,dictionaries,file_names)
+        if stats is not None:
+            stats.print_summary()
     
     def plot_output_parser(self, subparser):
         plot_output_parser = subparser.add_parser('iplot',help='Load a previously created pickle files (your_run.p) for interactive plotting or a set of output files to be parsed and plotted')
@@ -231,6 +468,8 @@ class interactive_output_parser:
         input_type_parser.add_argument('-pf','--pickle_files', dest='pickle_files', help='pickle files to be plotted (run1.p run2.p etc...)', nargs='+' )
         input_type_parser.add_argument('-of','--output_files', dest='output_files', help='output files to be parsed and plotted (output_file1.txt output_file2.txt etc...)', nargs='+', action='append')
         plot_output_parser.add_argument('-nt','--nthreads', dest='nthreads', help='Number of threads to use during parsing', nargs='?', type=int, default=0)
+        plot_output_parser.add_argument('-rb','--read_budget', dest='read_budget', help='Limit (MB) on the size of the pickle files that are read at the same time with --nthreads (the loaded data can be larger)', nargs='?', type=float, default=None)
+        add_parse_cache_options(plot_output_parser)
         if hasattr(self.opppy_parser, "add_parser_args"):
             self.opppy_parser.add_parser_args(plot_output_parser)
         plot_output_parser.set_defaults(func=self.plot_output)
@@ -291,7 +530,8 @@ class interactive_output_parser:
                 self.opppy_parser.pre_parse(args)
             dictionary_data, dictionary_names = build_output_dictionary_list(args.output_files,
                                                                              self.opppy_parser,
-                                                                             nthreads=args.nthreads)
+                                                                             nthreads=args.nthreads,
+                                                                             cache=get_parse_cache(args))
             if hasattr(self.opppy_parser, "post_parse"):
                 for data in dictionary_data:
                     self.opppy_parser.post_parse(args, data)
@@ -304,7 +544,7 @@ class interactive_output_parser:
             # get the dictionaries from the pickle files
             for pickle_file_name in args.pickle_files:
                 dictionary_names.append(pickle_file_name.split('/')[-1].split('.p')[0])
-                dictionary_data.append(pickle.load(open(pickle_file_name,'rb')))
+            dictionary_data = load_data_list(args.pickle_files, lazy=True, nthreads=args.nthreads, read_budget=read_budget(args))
 
         option_parser = self.get_interactive_plot_parser()
         option = option_parser.parse_args(["--new"])
@@ -587,6 +827,7 @@ class interactive_dump_parser:
         plot_parser.add_argument('-kw','--key_words', dest='key_words', help='Only extract the specified key_words', nargs='+', default=None )
         self.ploter_1d = plot_1d_dump_dictionary()
         self.ploter_1d.setup_parser(plot_parser)
+        add_parse_cache_options(plot_parser)
         if hasattr(self.dump_parser, "add_parser_args"):
           self.dump_parser.add_parser_args(plot_parser)
         plot_parser.set_defaults(func=self.plot_1d)
@@ -605,6 +846,7 @@ class interactive_dump_parser:
         plot_parser.add_argument('-kw','--key_words', dest='key_words', help='Only extract the specified key_words', nargs='+', default=None )
         self.ploter_2d = plot_2d_dump_dictionary()
         self.ploter_2d.setup_parser(plot_parser)
+        add_parse_cache_options(plot_parser)
         if hasattr(self.dump_parser, "add_parser_args"):
           self.dump_parser.add_parser_args(plot_parser)
         plot_parser.set_defaults(func=self.plot_2d)
@@ -623,23 +865,24 @@ class interactive_dump_parser:
         plot_parser.add_argument('-kw','--key_words', dest='key_words', help='Only extract the specified key_words', nargs='+', default=None )
         self.ploter_3d = plot_3d_dump_dictionary()
         self.ploter_3d.setup_parser(plot_parser)
+        add_parse_cache_options(plot_parser)
         if hasattr(self.dump_parser, "add_parser_args"):
           self.dump_parser.add_parser_args(plot_parser)
         plot_parser.set_defaults(func=self.plot_3d)
 
     def plot_3d(self, args):
-        dictionaries = generate_dump_dictionary_list(args.dump_names, self.dump_parser, args.key_words, args.pickle_files, args.case_files)
+        dictionaries = generate_dump_dictionary_list(args.dump_names, self.dump_parser, args.key_words, args.pickle_files, args.case_files, get_parse_cache(args))
         self.ploter_3d.plot_3d_slice(args, dictionaries[0])
 
 
     def plot_2d(self, args):
-        dictionaries = generate_dump_dictionary_list(args.dump_names, self.dump_parser, args.key_words, args.pickle_files, args.case_files)
+        dictionaries = generate_dump_dictionary_list(args.dump_names, self.dump_parser, args.key_words, args.pickle_files, args.case_files, get_parse_cache(args))
         self.ploter_2d.plot_2d(args, dictionaries[0])
 
 
 
     def plot_1d(self, args):
-        dictionaries = generate_dump_dictionary_list(args.dump_names, self.dump_parser, args.key_words, args.pickle_files, args.case_files)
+        dictionaries = generate_dump_dictionary_list(args.dump_names, self.dump_parser, args.key_words, args.pickle_files, args.case_files, get_parse_cache(args))
         self.ploter_1d.plot_1d(args, dictionaries, args.dump_names)
 
 
@@ -651,6 +894,8 @@ class interactive_dump_parser:
         pickle_parser.add_argument('-pf','--pickle_file', dest='pickle_name', help='Pickle file name to be created or appended to', required=True )
         pickle_parser.add_argument('-kw','--key_words', dest='key_words', help='Only extract the specified key_words', nargs='+', default=None )
         pickle_parser.add_argument('-nt','--nthreads', dest='nthreads', help='Specify number of threads for dump parsing', nargs='?', type=int, default=0 )
+        pickle_parser.add_argument('-z','--compression', dest='compression', help='Compress the pickle file (none, zlib, lzma, zlib+shuffle or lzma+shuffle). By default an existing file keeps its compression', nargs='?', choices=COMPRESSIONS, default=None)
+        pickle_parser.add_argument('-sh','--shard', dest='shard', help='Write the parsed dumps to a new shard in pickle_file.shards instead of the pickle file (for concurrent ingest processes). Shards are merged on read and by the next append without --shard', nargs='?', type=bool, const=True, default=False)
         if hasattr(self.dump_parser, "add_parser_args"):
           self.dump_parser.add_parser_args(pickle_parser)
         pickle_parser.set_defaults(func=self.pickle_dumps)
@@ -664,33 +909,41 @@ class interactive_dump_parser:
           args - Parsed input arguments
         '''
         print("Pickle Dumps")
-        dumps = {} 
-        dumps['version'] = __version__
-        try:
-          dumps = pickle.load(open(args.pickle_name,'rb'))
-          print("Appending to the existing pickle file - ", args.pickle_name)
-        except:
-          print("Generating a new pickle file - ", args.pickle_name)
+        if args.shard:
+            dumps = {}
+            dumps['version'] = __version__
+            if args.dump_files is not None:
+                append_dumps(dumps,args.dump_files,self.dump_parser,args.key_words,args.nthreads)
+            else:
+                append_case(dumps,args.case_file,self.dump_parser,args.key_words)
+            append_dump_shard(args.pickle_name, dumps)
+            return
+        with lock_data(args.pickle_name):
+            merge_pending_shards(args)
+            dumps = {} 
+            dumps['version'] = __version__
+            try:
+              # only the version is needed to append (formats that can not load
+              # single keys return every dump)
+              dumps = load_data(args.pickle_name, [])
+              print("Appending to the existing pickle file - ", args.pickle_name)
+            except:
+              print("Generating a new pickle file - ", args.pickle_name)
     
-        if not 'version' in dumps or not (dumps['version'] == __version__):
-          print('')
-          print("Error: pickle file does not match this version of OPPPY")
-          if 'version' in data:
-            print(args.pickle_name, "was build with version", data['version'])
-          else:
-            print("This ", args.pickle_name," has no version")
-          print("This version of OPPPY is ", __version__)
-          print("Delete the old ", args.pickle_name, "file and rebuild it")
-          sys.exit(0)
+            if dumps.get('version') != __version__ and migrate_file(args.pickle_name, args.compression):
+                # upgrade the stored dumps that were not loaded
+                dumps = load_data(args.pickle_name, [])
+            check_data_version(dumps, args.pickle_name)
 
-        if args.dump_files is not None:
-            append_dumps(dumps,args.dump_files,self.dump_parser,args.key_words,args.nthreads)
-        else:
-            append_case(dumps,args.case_file,self.dump_parser,args.key_words)
+            loaded_dumps = dict(dumps)
+            if args.dump_files is not None:
+                append_dumps(dumps,args.dump_files,self.dump_parser,args.key_words,args.nthreads)
+            else:
+                append_case(dumps,args.case_file,self.dump_parser,args.key_words)
 
     
-        pickle.dump(dumps,open(args.pickle_name,"wb"))
-        print("Dump Data Saved To: ", args.pickle_name)
+            save_data(dumps, args.pickle_name, [key for key in dumps if key not in loaded_dumps or dumps[key] is not loaded_dumps[key]], args.compression)
+            print("Dump Data Saved To: ", args.pickle_name)
 
 
 
@@ -709,7 +962,7 @@ class interactive_dump_parser:
         plot_parser.add_argument('-nt','--nthreads', dest='nthreads', help='Specify number of threads for dump parsing', nargs='?', type=int, default=0 )
         plot_parser.add_argument('-kw','--key_words', dest='key_words', help='Only extract the specified key_words', nargs='+', default=None )
         plot_parser.add_argument('-dk','--dimension_keys', dest='dimension_keys', help='keys used to extract the points (e.g. [x], [x,y], or [x,y,x]', nargs='+', required=True )
-        plot_parser.add_argument('-p','--point', dest='point', help='point location to extract data (e.g. [1], [1,2], or [1,2,3]', nargs='+', required=True, type=float )
+        plot_parser.add_argument('-p','--point', dest='point', help='point location to extract data (e.g. [1], [1,2], or [1,2,3]). Repeat the flag to plot several points (-p 1 2 -p 3 4)', nargs='+', required=True, type=float, action='append' )
         plot_parser.add_argument('-s','--series_key', dest='series_key', help='keys used to extract the series axis data (e.g. cycle or time)', nargs='?', required=True )
         plot_parser.add_argument('-d','--data_key', dest='data_key', help='keys used to extract the data (e.g. temperature, pressure, etc)', nargs='?', required=True )
         plot_parser.add_argument('-im','--interpolation_method', dest='interpolation_method', help='Method used to interpolate the data to points', nargs='?', default='nearest' )
@@ -719,6 +972,7 @@ class interactive_dump_parser:
         # suppress the x and y variable request
         plot_parser.add_argument('-x','--x_data',dest='x_value_name', help=argparse.SUPPRESS)
         plot_parser.add_argument('-y','--y_data',dest='y_value_name', help=argparse.SUPPRESS)
+        add_parse_cache_options(plot_parser)
         if hasattr(self.dump_parser, "add_parser_args"):
           self.dump_parser.add_parser_args(plot_parser)
         plot_parser.set_defaults(func=self.plot_series_point)
@@ -726,37 +980,35 @@ class interactive_dump_parser:
     def plot_series_point(self, args):
         series_names = []
         series_data = []
-        if args.dump_files is not None:
-            for dumps in args.dump_files:
-                dictionary_list = build_data_list(dumps, self.dump_parser, args.key_words)
-                tracer_x, tracer_y = extract_series_point(dictionary_list, args.series_key, args.data_key, args.dimension_keys, args.point, args.interpolation_method) 
+        def append_point_series(dictionary_list, name):
+            # every point is extracted in one pass and plotted as its own series
+            tracer_x, tracer_y = extract_series_point(dictionary_list, args.series_key, args.data_key, args.dimension_keys, args.point, args.interpolation_method)
+            for index, point in enumerate(args.point):
                 series_dictionary = {}
                 series_dictionary.update(tracer_x)
-                series_dictionary.update(tracer_y)
+                series_dictionary[args.data_key] = tracer_y[args.data_key][:,index]
                 series_data.append(series_dictionary)
-                series_names.append(dumps[0].split('/')[-1])
+                if len(args.point) > 1:
+                    series_names.append(name+' '+str(tuple(point)))
+                else:
+                    series_names.append(name)
+
+        if args.dump_files is not None:
+            for dumps in args.dump_files:
+                dictionary_list = build_data_list(dumps, self.dump_parser, args.key_words, get_parse_cache(args))
+                append_point_series(dictionary_list, dumps[0].split('/')[-1])
         elif args.pickle_files is not None:
             for pickle_file in args.pickle_files:
-                dictionary = pickle.load(open(pickle_file,'rb'))
+                dictionary = load_data(pickle_file, lazy=True)
                 dictionary.pop('version')
                 dictionary_list = []
                 for key in list(dictionary.keys()):
                     dictionary_list.append(dictionary[key])
-                tracer_x, tracer_y = extract_series_point(dictionary_list, args.series_key, args.data_key, args.dimension_keys, args.point) 
-                series_dictionary = {}
-                series_dictionary.update(tracer_x)
-                series_dictionary.update(tracer_y)
-                series_data.append(series_dictionary)
-                series_names.append(pickle_file.split('/')[-1].split('.p')[0])
+                append_point_series(dictionary_list, pickle_file.split('/')[-1].split('.p')[0])
         elif args.case_files is not None:
             for case_file in args.case_files:
                 dictionary_list = build_case_data_list(case_file, None, self.dump_parser, args.key_words)
-                tracer_x, tracer_y = extract_series_point(dictionary_list, args.series_key, args.data_key, args.dimension_keys, args.point, args.interpolation_method) 
-                series_dictionary = {}
-                series_dictionary.update(tracer_x)
-                series_dictionary.update(tracer_y)
-                series_data.append(series_dictionary)
-                series_names.append(case_file.split('/')[-1])
+                append_point_series(dictionary_list, case_file.split('/')[-1])
         args.x_value_name = args.series_key
         args.y_value_names = [args.data_key]
         self.ploter_1d.plot_1d(args, series_data, series_names)
@@ -788,6 +1040,7 @@ class interactive_dump_parser:
         # suppress the x and y variable request
         plot_parser.add_argument('-x','--x_data',dest='x_value_name', help=argparse.SUPPRESS)
         plot_parser.add_argument('-y','--y_data',dest='y_value_name', help=argparse.SUPPRESS)
+        add_parse_cache_options(plot_parser)
         if hasattr(self.dump_parser, "add_parser_args"):
           self.dump_parser.add_parser_args(plot_parser)
         plot_parser.set_defaults(func=self.plot_series_line)
@@ -798,13 +1051,13 @@ class interactive_dump_parser:
         series_data = []
         if args.dump_files is not None:
             for dumps in args.dump_files:
-                dictionary_list = build_data_list(dumps, self.dump_parser, args.key_words)
+                dictionary_list = build_data_list(dumps, self.dump_parser, args.key_words, get_parse_cache(args))
                 tracer_t, tracer_grid = extract_series_line(dictionary_list, args.series_key, args.data_key, args.dimension_keys, args.point0, args.point1, args.number_of_points, args.interpolation_method) 
                 series_data.append(series_pair(tracer_t, tracer_grid))
                 series_names.append(dumps[0].split('/')[-1])
         elif args.pickle_files:
             for pickle_file in args.pickle_files:
-                dictionary = pickle.load(open(pickle_file,'rb'))
+                dictionary = load_data(pickle_file, lazy=True)
                 dictionary.pop('version')
                 dictionary_list = []
                 for key in list(dictionary.keys()):
@@ -847,6 +1100,7 @@ class interactive_dump_parser:
         # suppress the x and y variable request
         plot_parser.add_argument('-x','--x_data',dest='x_value_name', help=argparse.SUPPRESS)
         plot_parser.add_argument('-y','--y_data',dest='y_value_name', help=argparse.SUPPRESS)
+        add_parse_cache_options(plot_parser)
         if hasattr(self.dump_parser, "add_parser_args"):
           self.dump_parser.add_parser_args(plot_parser)
         plot_parser.set_defaults(func=self.plot_series_contour)
@@ -854,7 +1108,7 @@ class interactive_dump_parser:
     def plot_series_contour(self, args):
         
         if args.dump_files is not None:
-            dictionary_list = build_data_list(args.dump_files, self.dump_parser, args.key_words)
+            dictionary_list = build_data_list(args.dump_files, self.dump_parser, args.key_words, get_parse_cache(args))
             tracer_t = {}
             tracer_grid = {}
             if args.z_slice_location is not None:
@@ -872,7 +1126,7 @@ class interactive_dump_parser:
                         args.interpolation_method) 
             series_data = series_pair(tracer_t, tracer_grid)
         elif args.pickle_file is not None:
-            dictionary = pickle.load(open(args.pickle_file,'rb'))
+            dictionary = load_data(args.pickle_file, lazy=True)
             dictionary.pop('version')
             dictionary_list = []
             for key in list(dictionary.keys()):
@@ -951,6 +1205,7 @@ class interactive_tally_parser:
         self.pickle_tally_parser(self.subparser)
         self.plot_tally_parser(self.subparser)
         self.plot_interactive_tally_parser(self.subparser)
+        self.export_tally_parser(self.subparser)
 
     def append_pickle(self, args):
         '''
@@ -961,36 +1216,47 @@ class interactive_tally_parser:
           arguments:
             args - Parsed input arguments
         '''
-        data = {}
-        data['version'] = __version__
-        try:
-          data = pickle.load(open(args.pickle_name,'rb'))
-          print("Appending to the existing pickle file - ", args.pickle_name)
-        except:
-          print("Generating a new pickle file - ", args.pickle_name)
+        if args.shard:
+            if args.cycle_index:
+                print("Error: --shard can not be combined with --cycle_index")
+                sys.exit(0)
+            if hasattr(self.opppy_parser, "pre_parse"):
+                self.opppy_parser.pre_parse(args)
+            append_tally_shard(args.pickle_name, args.tally_files, self.opppy_parser, args.append_date, args.nthreads)
+            return
+        with lock_data(args.pickle_name):
+            merge_pending_shards(args, self.opppy_parser)
+            data = {}
+            data['version'] = __version__
+            new_pickle = False
+            try:
+              data = load_data(args.pickle_name)
+              print("Appending to the existing pickle file - ", args.pickle_name)
+            except:
+              print("Generating a new pickle file - ", args.pickle_name)
+              new_pickle = True
     
-        if not 'version' in data or not (data['version'] == __version__):
-          print('')
-          print("Error: pickle file does not match this version of OPPPY")
-          if 'version' in data:
-            print(args.pickle_name, "was build with version", data['version'])
-          else:
-            print("This ", args.pickle_name," has no version")
-          print("This version of OPPPY is ", __version__)
-          print("Delete the old ", args.pickle_name, "file and rebuild it")
-          sys.exit(0)
+            check_data_version(data, args.pickle_name)
     
-        if hasattr(self.opppy_parser, "pre_parse"):
-            self.opppy_parser.pre_parse(args)
+            if hasattr(self.opppy_parser, "pre_parse"):
+                self.opppy_parser.pre_parse(args)
 
-        # append new dictionary data to the pickle file
-        append_tally_dictionary(data, args.tally_files, self.opppy_parser, args.append_date, args.nthreads)
+            cycle_index = None
+            if args.cycle_index:
+                cycle_index = load_cycle_index(args.pickle_name+'.index', self.opppy_parser)
+                if new_pickle:
+                    cycle_index['files'] = {}
 
-        if hasattr(self.opppy_parser, "post_parse"):
-            self.opppy_parser.post_parse(args, data)
+            # append new dictionary data to the pickle file
+            append_tally_dictionary(data, args.tally_files, self.opppy_parser, args.append_date, args.nthreads, cycle_index)
+
+            if hasattr(self.opppy_parser, "post_parse"):
+                self.opppy_parser.post_parse(args, data)
     
-        pickle.dump(data,open(args.pickle_name,"wb"))
-        print("Output Data Saved To: ", args.pickle_name)
+            save_data(data, args.pickle_name, compression=args.compression)
+            print("Output Data Saved To: ", args.pickle_name)
+            if cycle_index is not None:
+                save_cycle_index(cycle_index, args.pickle_name+'.index')
 
 
     def pickle_tally_parser(self, subparser):
@@ -999,10 +1265,34 @@ class interactive_tally_parser:
         pickle_parser.add_argument('-pf','--pickle_file', dest='pickle_name', help='Pickle file name to be created or appended to', required=True )
         pickle_parser.add_argument('-ad','--append_date', dest='append_date', help='Append the date and time to the output file name', nargs='?', type=bool, const=True, default=False)
         pickle_parser.add_argument('-nt','--nthreads', dest='nthreads', help='Number of threads to use during parsing', nargs='?', type=int, default=0)
+        pickle_parser.add_argument('-ci','--cycle_index', dest='cycle_index', help='Keep a cycle index (pickle_file.index) so only new cycles of previously parsed files are parsed', nargs='?', type=bool, const=True, default=False)
+        pickle_parser.add_argument('-z','--compression', dest='compression', help='Compress the pickle file (none, zlib, lzma, zlib+shuffle or lzma+shuffle). By default an existing file keeps its compression', nargs='?', choices=COMPRESSIONS, default=None)
+        pickle_parser.add_argument('-sh','--shard', dest='shard', help='Write the parsed data to a new shard in pickle_file.shards instead of the pickle file (for concurrent ingest processes). Shards are merged on read and by the next append without --shard', nargs='?', type=bool, const=True, default=False)
         if hasattr(self.opppy_parser, "add_parser_args"):
           self.opppy_parser.add_parser_args(pickle_parser)
         pickle_parser.set_defaults(func=self.append_pickle)
  
+    def export_tally(self, args):
+        '''
+        export_tally - 
+          This function exports the tallies of a opppy pickle file to Parquet
+          or Arrow tables that can be read without OPPPY.
+        
+          arguments:
+            args - Parsed input arguments
+        '''
+        file_names = export_tally(args.pickle_name, args.export_directory, args.tally_names, args.export_format)
+        for file_name in file_names:
+            print("Exported: ", file_name)
+
+    def export_tally_parser(self, subparser):
+        export_parser = subparser.add_parser('export', help=" A simple example: export --pickle_file your_tally_pickle_file.p --export_directory your_tables ")
+        export_parser.add_argument('-pf','--pickle_file', dest='pickle_name', help='Pickle file name to be exported', required=True )
+        export_parser.add_argument('-ed','--export_directory', dest='export_directory', help='Directory of the exported tables (one file per tally plus tally_cycle_data)', required=True )
+        export_parser.add_argument('-tn','--tally_names', dest='tally_names', help='Only export the specified tallies (tally_cycle_data holds the cycle scalars)', nargs='+', default=None )
+        export_parser.add_argument('-ef','--export_format', dest='export_format', help='Table format (parquet or arrow)', nargs='?', choices=EXPORT_FORMATS, default='parquet')
+        export_parser.set_defaults(func=self.export_tally)
+
 
     def plot_tally_parser(self, subparser):
         '''
@@ -1015,8 +1305,10 @@ class interactive_tally_parser:
         plot_parser.add_argument('-sk','--series_key', dest='series_key', help='Series key string to access the data (i.e time or cycle)', nargs='?', required=True)
         plot_parser.add_argument('-sv','--series_value', dest='series_value', help='Series value to plot the data at (default is the last value of the series_key data)', nargs='?', type=float, default=None)
         plot_parser.add_argument('-nt','--nthreads', dest='nthreads', help='Number of threads to use during parsing', nargs='?', type=int, default=0)
+        plot_parser.add_argument('-rb','--read_budget', dest='read_budget', help='Limit (MB) on the size of the pickle files that are read at the same time with --nthreads (the loaded data can be larger)', nargs='?', type=float, default=None)
         self.dict_ploter = plot_dictionary()
         self.dict_ploter.setup_parser(plot_parser)
+        add_parse_cache_options(plot_parser)
         if hasattr(self.opppy_parser, "add_parser_args"):
           self.opppy_parser.add_parser_args(plot_parser)
         plot_parser.set_defaults(func=self.plot_tally)
@@ -1035,14 +1327,15 @@ class interactive_tally_parser:
                 self.opppy_parser.pre_parse(args)
             raw_dictionary_data, raw_dictionary_names = build_tally_dictionary_list(args.tally_files, 
                                                                                     self.opppy_parser, 
-                                                                                    nthreads=args.nthreads)
+                                                                                    nthreads=args.nthreads,
+                                                                                    cache=get_parse_cache(args))
             if hasattr(self.opppy_parser, "post_parse"):
                 for data in raw_dictionary_data:
                     self.opppy_parser.post_parse(args, data)
         else:
             for pickle_file_name in args.pickle_files:
                 raw_dictionary_names.append(pickle_file_name.split('/')[-1].split('.p')[0])
-                raw_dictionary_data.append(pickle.load(open(pickle_file_name,'rb')))
+            raw_dictionary_data = load_data_list(args.pickle_files, [args.series_key, 'tally_cycle_data'], True, args.nthreads, read_budget(args))
 
         y_index = []
         y_names = []
@@ -1098,6 +1391,8 @@ class interactive_tally_parser:
         input_type_parser.add_argument('-pf','--pickle_files', dest='pickle_files', help='pickle files to be plotted (run1.p run2.p etc...)', nargs='+' )
         input_type_parser.add_argument('-tf','--tally_files', dest='tally_files', help='tally files to be parsed and plotted (tally_file1.txt tally_file2.txt etc...)', nargs='+', action='append')
         plot_parser.add_argument('-nt','--nthreads', dest='nthreads', help='Number of threads to use during parsing', nargs='?', type=int, default=0)
+        plot_parser.add_argument('-rb','--read_budget', dest='read_budget', help='Limit (MB) on the size of the pickle files that are read at the same time with --nthreads (the loaded data can be larger)', nargs='?', type=float, default=None)
+        add_parse_cache_options(plot_parser)
         if hasattr(self.opppy_parser, "add_parser_args"):
           self.opppy_parser.add_parser_args(plot_parser)
         plot_parser.set_defaults(func=self.plot_interactive_tally)
@@ -1158,14 +1453,15 @@ class interactive_tally_parser:
                 self.opppy_parser.pre_parse(args)
             raw_dictionary_data, raw_dictionary_names = build_tally_dictionary_list(args.tally_files,
                                                                                     self.opppy_parser,
-                                                                                    nthreads=args.nthreads)
+                                                                                    nthreads=args.nthreads,
+                                                                                    cache=get_parse_cache(args))
             if hasattr(self.opppy_parser, "post_parse"):
                 for data in raw_dictionary_data:
                     self.opppy_parser.post_parse(args, data)
         else:
             for pickle_file_name in args.pickle_files:
                 raw_dictionary_names.append(pickle_file_name.split('/')[-1].split('.p')[0])
-                raw_dictionary_data.append(pickle.load(open(pickle_file_name,'rb')))
+            raw_dictionary_data = load_data_list(args.pickle_files, lazy=True, nthreads=args.nthreads, read_budget=read_budget(args))
 
         option_parser = self.get_interactive_plot_parser()
         option = option_parser.parse_args(["--new"])
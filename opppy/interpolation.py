@@ -0,0 +1,380 @@
+# ---------------------------*-python-*----------------------------------------#
+# file   interpolation.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+'''
+Reusable interpolation plans for dump data
+
+scipy.interpolate.griddata builds the triangulation (or nearest neighbor
+tree) of the mesh on every call. An interpolation_plan builds the mesh
+geometry once and plans are cached by the content of the mesh coordinates, so
+every variable and every dump of a static mesh reuses the same geometry.
+interpolate is a drop in replacement for griddata that uses the cached plans.
+Meshes whose points form a tensor product grid (i.e. a logically rectangular
+mesh) are detected and linearly interpolated with a search of each axis
+instead of a triangulation. Linear interpolation of a grid is multilinear (a
+triangulation of a grid is degenerate, so griddata splits the cells
+arbitrarily). Nearest interpolation of a grid keeps the tree, so points that
+are equally close to two mesh points pick the same value as griddata.
+The weights of fixed query points (i.e. a plot grid or a line out) can also
+be kept to interpolate many variables with one pass over the geometry.
+
+A cached plan holds a copy of the mesh points and the geometry it has built.
+A 2D Delaunay triangulation costs roughly 250 bytes per mesh point (about
+fifteen times the points themselves), so the cache keeps at most PLAN_CACHE_SIZE
+meshes and at most PLAN_CACHE_BYTES of estimated plan memory (see
+interpolation_plan.nbytes). Both limits can be changed, and
+clear_interpolation_plans frees the cached plans once a set of dumps has
+been processed.
+
+.. autosummary::
+
+  interpolation_plan
+  interpolation_weights
+  get_interpolation_plan
+  clear_interpolation_plans
+  interpolate
+'''
+
+import hashlib
+import itertools
+from collections import OrderedDict
+
+import numpy as np
+
+# number of meshes that keep their interpolation plan
+PLAN_CACHE_SIZE = 8
+# estimated memory of the cached plans (the most recent plan is always kept)
+PLAN_CACHE_BYTES = 2**30
+
+_plans = OrderedDict()
+
+def _mesh_points(points):
+    '''
+    Return griddata style mesh points (an array or a tuple of coordinate
+    arrays) as a (npoints, ndim) float array
+    '''
+    if isinstance(points, tuple):
+        return np.ascontiguousarray(np.stack([np.asarray(coordinate, dtype=float).ravel() for coordinate in points], axis=-1))
+    points = np.asarray(points, dtype=float)
+    if points.ndim == 1:
+        return np.ascontiguousarray(points[:, np.newaxis])
+    return np.ascontiguousarray(points)
+
+def _query_points(xi, ndim):
+    '''
+    Return griddata style query points (an array or a tuple of broadcastable
+    coordinate arrays) as a (..., ndim) float array
+    '''
+    if isinstance(xi, tuple) and len(xi) == 1:
+        xi = xi[0]
+    if isinstance(xi, tuple):
+        return np.stack(np.broadcast_arrays(*[np.asarray(coordinate, dtype=float) for coordinate in xi]), axis=-1)
+    xi = np.asarray(xi, dtype=float)
+    if ndim == 1 and (xi.ndim == 0 or xi.shape[-1] != 1):
+        return xi[..., np.newaxis]
+    return xi
+
+class interpolation_plan():
+    '''
+    The interpolation geometry of a mesh. The sorted coordinates (1D), the
+    tensor product grid, the nearest neighbor tree and the Delaunay
+    triangulation are built the first time a method needs them and reused
+    for any values on the mesh.
+
+    arguments:
+        points the mesh coordinates (an array or a tuple of coordinate arrays
+            as passed to griddata)
+        structured True if the points form a tensor product grid, False to
+            interpolate them as scattered points, or None to detect the grid
+    '''
+    def __init__(self, points, structured=None):
+        self.points = _mesh_points(points)
+        self.ndim = self.points.shape[1]
+        self.structured = structured
+        self._order = None
+        self._grid = None
+        self._tree = None
+        self._triangulation = None
+
+    def order(self):
+        '''
+        Return the sort order of 1D mesh coordinates
+        '''
+        if self._order is None:
+            self._order = np.argsort(self.points[:, 0])
+        return self._order
+
+    def grid(self):
+        '''
+        Return the (axes, index) of a mesh whose points form a tensor product
+        grid, where axes are the sorted coordinates of each dimension and
+        index[i, j, ...] is the mesh point at (axes[0][i], axes[1][j], ...).
+        Returns None for scattered (or 1D) meshes.
+        '''
+        if self._grid is None:
+            self._grid = False
+            if self.ndim > 1 and self.structured is not False:
+                axes, inverses = zip(*[np.unique(self.points[:, dim], return_inverse=True) for dim in range(self.ndim)])
+                shape = tuple(len(axis) for axis in axes)
+                if min(shape) > 1 and np.prod(shape) == len(self.points):
+                    index = np.full(shape, -1)
+                    index[tuple(inverse.ravel() for inverse in inverses)] = np.arange(len(self.points))
+                    if (index >= 0).all():
+                        self._grid = (axes, index)
+            if self._grid is False and self.structured:
+                raise ValueError("The mesh points do not form a tensor product grid")
+        if self._grid is False:
+            return None
+        return self._grid
+
+    def tree(self):
+        '''
+        Return the nearest neighbor tree of the mesh
+        '''
+        if self._tree is None:
+            from scipy.spatial import cKDTree
+            self._tree = cKDTree(self.points)
+        return self._tree
+
+    def triangulation(self):
+        '''
+        Return the Delaunay triangulation of the mesh
+        '''
+        if self._triangulation is None:
+            from scipy.spatial import Delaunay
+            self._triangulation = Delaunay(self.points)
+        return self._triangulation
+
+    def nbytes(self):
+        '''
+        Return an estimate of the memory held by the plan (the mesh points
+        and the geometry built so far)
+        '''
+        nbytes = self.points.nbytes
+        if self._order is not None:
+            nbytes += self._order.nbytes
+        if self._grid:
+            nbytes += self._grid[1].nbytes+sum(axis.nbytes for axis in self._grid[0])
+        if self._tree is not None:
+            # the tree copies the points and holds an index and its nodes
+            nbytes += self._tree.data.nbytes+self._tree.indices.nbytes+self._tree.size*96
+        if self._triangulation is not None:
+            triangulation = self._triangulation
+            nsimplex = len(triangulation.simplices)
+            # the barycentric transform is built by the first point search
+            nbytes += (triangulation.points.nbytes+triangulation.simplices.nbytes+triangulation.neighbors.nbytes+
+                       triangulation.equations.nbytes+nsimplex*(self.ndim+1)*self.ndim*8)
+        return nbytes
+
+    def weights(self, xi, method='nearest', fill_value=np.nan):
+        '''
+        Return the interpolation_weights of the query points, which
+        interpolate any number of variables on the mesh to the points
+
+        arguments:
+            xi the query points (an array or a tuple of coordinate arrays)
+            method nearest, linear or cubic
+            fill_value value of points outside the mesh (linear and cubic)
+        '''
+        return interpolation_weights(self, xi, method, fill_value)
+
+    def __call__(self, values, xi, method='nearest', fill_value=np.nan):
+        '''
+        Interpolate values on the mesh to the query points (the same results
+        as scipy.interpolate.griddata, but multilinear on a tensor product
+        grid)
+
+        arguments:
+            values the mesh values
+            xi the query points (an array or a tuple of coordinate arrays)
+            method nearest, linear or cubic
+            fill_value value of points outside the mesh (linear and cubic)
+        '''
+        from scipy.interpolate import interp1d, LinearNDInterpolator, CloughTocher2DInterpolator
+        values = np.asarray(values)
+        if self.ndim == 1:
+            if isinstance(xi, tuple):
+                xi, = xi
+            order = self.order()
+            if method == 'nearest':
+                fill_value = 'extrapolate'
+            interpolator = interp1d(self.points[order, 0], values[order], kind=method, axis=0,
+                                    bounds_error=False, fill_value=fill_value, assume_sorted=True)
+            return interpolator(xi)
+        if method == 'linear' and self.grid() is not None:
+            return self.weights(xi, method, fill_value)(values)
+        xi = _query_points(xi, self.ndim)
+        if method == 'nearest':
+            distance, index = self.tree().query(xi.reshape(-1, self.ndim))
+            result_type = np.result_type(values.dtype, float)
+            return values[index].astype(result_type, copy=False).reshape(xi.shape[:-1]+values.shape[1:])
+        if method == 'linear':
+            return LinearNDInterpolator(self.triangulation(), values, fill_value=fill_value)(xi)
+        if method == 'cubic' and self.ndim == 2:
+            return CloughTocher2DInterpolator(self.triangulation(), values, fill_value=fill_value)(xi)
+        raise ValueError("Unknown interpolation method "+repr(method)+" for "+str(self.ndim)+"-dimensional data")
+
+class interpolation_weights():
+    '''
+    The interpolation of a mesh to fixed query points as a weighted sum of
+    mesh values: the simplex (or nearest point) of every query point and its
+    barycentric weights are found once and any number of variables are then
+    interpolated with a gather and a dot product. For linear interpolation
+    the points of a tensor product grid are found with a search of each axis
+    and weighted by the corners of their cell. Cubic interpolation is not a fixed weighted sum,
+    so it evaluates the plan for each variable.
+
+    arguments:
+        plan the interpolation_plan of the mesh
+        xi the query points (an array or a tuple of coordinate arrays)
+        method nearest, linear or cubic
+        fill_value value of points outside the mesh (linear and cubic)
+    '''
+    def __init__(self, plan, xi, method='nearest', fill_value=np.nan):
+        self.plan = plan
+        self.method = method
+        self.fill_value = fill_value
+        self.xi = xi
+        if method not in ('nearest', 'linear'):
+            # cubic (or an unknown method reported by the plan) per variable
+            self.indices = None
+            return
+        if plan.ndim == 1:
+            if isinstance(xi, tuple):
+                xi, = xi
+            query = np.asarray(xi, dtype=float)
+            self.shape = query.shape
+            query = query.ravel()
+            order = plan.order()
+            x = plan.points[order, 0]
+            if method == 'nearest':
+                # the interp1d nearest rule (midpoints round down, extrapolate)
+                index = np.clip(np.searchsorted((x[1:]+x[:-1])/2.0, query, side='left'), 0, len(x)-1)
+                self.indices = order[index][:, np.newaxis]
+                self.weights = np.ones((len(query), 1))
+                self.outside = np.zeros(len(query), dtype=bool)
+            else:
+                upper = np.clip(np.searchsorted(x, query, side='left'), 1, len(x)-1)
+                lower = upper-1
+                width = x[upper]-x[lower]
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    slope = np.where(width > 0, (query-x[lower])/width, 0.0)
+                self.indices = np.stack([order[lower], order[upper]], axis=-1)
+                self.weights = np.stack([1.0-slope, slope], axis=-1)
+                self.outside = (query < x[0]) | (query > x[-1]) | np.isnan(query)
+            return
+        query = _query_points(xi, plan.ndim)
+        self.shape = query.shape[:-1]
+        query = query.reshape(-1, plan.ndim)
+        if method == 'linear' and plan.grid() is not None:
+            self._grid_weights(query)
+            return
+        if method == 'nearest':
+            distance, index = plan.tree().query(query)
+            self.indices = index[:, np.newaxis]
+            self.weights = np.ones((len(query), 1))
+            self.outside = np.zeros(len(query), dtype=bool)
+            return
+        triangulation = plan.triangulation()
+        simplex = triangulation.find_simplex(query)
+        self.outside = simplex < 0
+        simplex = np.where(self.outside, 0, simplex)
+        transform = triangulation.transform[simplex]
+        barycentric = np.einsum('ijk,ik->ij', transform[:, :plan.ndim], query-transform[:, plan.ndim])
+        self.indices = triangulation.simplices[simplex]
+        self.weights = np.concatenate([barycentric, 1.0-barycentric.sum(axis=1, keepdims=True)], axis=1)
+
+    def _grid_weights(self, query):
+        '''
+        Find the cells of the query points on a tensor product grid with a
+        search of each axis and the multilinear weights of the cell corners
+        '''
+        axes, index = self.plan.grid()
+        self.outside = np.zeros(len(query), dtype=bool)
+        axis_weights = []
+        for axis, coordinate in zip(axes, query.T):
+            upper = np.clip(np.searchsorted(axis, coordinate, side='left'), 1, len(axis)-1)
+            lower = upper-1
+            slope = (coordinate-axis[lower])/(axis[upper]-axis[lower])
+            axis_weights.append([(lower, 1.0-slope), (upper, slope)])
+            self.outside |= (coordinate < axis[0]) | (coordinate > axis[-1]) | np.isnan(coordinate)
+        indices = []
+        weights = []
+        for corner in itertools.product(*axis_weights):
+            indices.append(index[tuple(cell for cell, weight in corner)])
+            weights.append(np.prod([weight for cell, weight in corner], axis=0))
+        self.indices = np.stack(indices, axis=-1)
+        self.weights = np.stack(weights, axis=-1)
+
+    def __call__(self, values):
+        '''
+        Interpolate the values of a variable on the mesh to the query points
+
+        arguments:
+            values the mesh values
+        '''
+        if self.indices is None:
+            return self.plan(values, self.xi, self.method, self.fill_value)
+        values = np.asarray(values)
+        result = np.einsum('ij,ij...->i...', self.weights, values[self.indices])
+        if self.outside.any():
+            result[self.outside] = self.fill_value
+        return result.reshape(self.shape+values.shape[1:])
+
+def _mesh_key(points):
+    '''
+    Return the cache key of mesh points, a hash of the coordinate values
+    '''
+    key_hash = hashlib.blake2b(digest_size=20)
+    key_hash.update(str(points.shape).encode())
+    key_hash.update(points.data)
+    return key_hash.digest()
+
+def get_interpolation_plan(points, structured=None):
+    '''
+    Return the cached interpolation plan of a mesh, or build a new one. The
+    least recently used plans are dropped beyond PLAN_CACHE_SIZE meshes or
+    PLAN_CACHE_BYTES of estimated plan memory. Plans build their geometry
+    when it is first used, so their memory is counted on the next call.
+
+    arguments:
+        points the mesh coordinates (an array or a tuple of coordinate arrays)
+        structured True if the points form a tensor product grid, False to
+            interpolate them as scattered points, or None to detect the grid
+    '''
+    mesh_points = _mesh_points(points)
+    key = (_mesh_key(mesh_points), structured)
+    plan = _plans.pop(key, None)
+    if plan is None:
+        plan = interpolation_plan(mesh_points, structured)
+    _plans[key] = plan
+    nbytes = sum(cached_plan.nbytes() for cached_plan in _plans.values())
+    while len(_plans) > PLAN_CACHE_SIZE or (len(_plans) > 1 and nbytes > PLAN_CACHE_BYTES):
+        nbytes -= _plans.popitem(last=False)[1].nbytes()
+    return plan
+
+def clear_interpolation_plans():
+    '''
+    Drop every cached interpolation plan
+    '''
+    _plans.clear()
+
+def interpolate(points, values, xi, method='nearest', fill_value=np.nan, structured=None):
+    '''
+    A drop in replacement for scipy.interpolate.griddata that reuses the
+    cached geometry of the mesh
+
+    arguments:
+        points the mesh coordinates (an array or a tuple of coordinate arrays)
+        values the mesh values
+        xi the query points (an array or a tuple of coordinate arrays)
+        method nearest, linear or cubic
+        fill_value value of points outside the mesh (linear and cubic)
+        structured True if the points form a tensor product grid, False to
+            interpolate them as scattered points, or None to detect the grid
+    '''
+    return get_interpolation_plan(points, structured)(values, xi, method, fill_value)
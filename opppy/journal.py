@@ -0,0 +1,321 @@
+# ---------------------------*-python-*----------------------------------------#
+# file   journal.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+'''
+Append-only journals of parsed output cycles
+
+A journal (file_name.journal) holds segments of parsed cycles that have not
+been merged into the data file yet. Appending only writes a new segment, and
+readers replay the segments on top of the data file with the same restart
+rules as append_data. Compacting merges the segments into the data file.
+
+.. autosummary::
+
+  journal_name
+  journal_header
+  read_journal
+  append_journal
+  load_journal_data
+  journal_fraction
+  compact_journal
+  append_output_journal
+'''
+
+import os
+import sys
+import struct
+import zlib
+import pickle
+import hashlib
+import datetime
+from itertools import groupby
+
+from opppy.version import __version__
+from opppy.output import append_cycle_data_list, iter_output_cycle_data
+from opppy.storage import load_data, save_data, lock_data, data_compression, NPY_DIRECTORY_INDEX
+from opppy.columnar import columnar_dictionary
+from opppy.migration import migration_path
+
+# segment frame: payload length and crc32
+_frame = struct.Struct('<QI')
+# the data file stamp hashes STAMP_SAMPLES blocks of STAMP_BLOCK bytes
+STAMP_SAMPLES = 16
+STAMP_BLOCK = 4096
+
+def journal_name(file_name):
+    '''
+    Return the journal file name of a data file
+    '''
+    return file_name+'.journal'
+
+def _base_stamp(file_name):
+    '''
+    Identify the current content of a data file by its size and a sha1 of
+    STAMP_SAMPLES blocks spread over it. A journal only applies to the data
+    file content it was started on, so a journal left behind by an
+    interrupted compaction is ignored, while copies of a data file and its
+    journal (i.e. cp -r, rsync or a restore) keep their journal.
+    '''
+    if os.path.isdir(file_name):
+        # NumPy directory stores replace their index on every save
+        file_name = os.path.join(file_name, NPY_DIRECTORY_INDEX)
+    try:
+        size = os.path.getsize(file_name)
+    except OSError:
+        return None
+    file_hash = hashlib.sha1()
+    with open(file_name, 'rb') as data_file:
+        for sample in range(STAMP_SAMPLES):
+            data_file.seek(max(0, size-STAMP_BLOCK)*sample//(STAMP_SAMPLES-1))
+            file_hash.update(data_file.read(STAMP_BLOCK))
+    return (size, file_hash.hexdigest())
+
+def _check_base(header, file_name):
+    '''
+    Return the journal header, or None (with a warning) if the data file has
+    been rewritten since the journal was started
+    '''
+    if header is None:
+        return None
+    if header['base'] != _base_stamp(file_name):
+        print("Warning: ignoring", journal_name(file_name), "because", file_name, "has been rewritten since the journal was started")
+        return None
+    return header
+
+def _write_segment(journal_file, segment):
+    payload = pickle.dumps(segment, protocol=4)
+    journal_file.write(_frame.pack(len(payload), zlib.crc32(payload))+payload)
+
+def journal_header(file_name):
+    '''
+    Read the header of the journal of a data file and find the end of its
+    last complete segment without reading the segments. Only the frame
+    headers are read and only the crc32 of the last segment is checked, since
+    every earlier segment was synced to disk before the next one was written.
+
+    arguments:
+        file_name the data file name
+
+    returns:
+        header the journal header (None if there is no valid journal)
+        end the size of the valid part of the journal
+    '''
+    try:
+        journal_file = open(journal_name(file_name), 'rb')
+    except OSError:
+        return None, 0
+    header = None
+    end = 0
+    last = None
+    with journal_file:
+        size = journal_file.seek(0, os.SEEK_END)
+        while end+_frame.size <= size:
+            journal_file.seek(end)
+            length, crc = _frame.unpack(journal_file.read(_frame.size))
+            if end+_frame.size+length > size:
+                break
+            if header is None:
+                payload = journal_file.read(length)
+                if zlib.crc32(payload) != crc:
+                    break
+                header = pickle.loads(payload)
+            else:
+                last = (end, length, crc)
+            end += _frame.size+length
+        if last is not None:
+            journal_file.seek(last[0]+_frame.size)
+            if zlib.crc32(journal_file.read(last[1])) != last[2]:
+                end = last[0]
+    header = _check_base(header, file_name)
+    return header, end if header is not None else 0
+
+def read_journal(file_name):
+    '''
+    Read the journal of a data file. A partially written final segment (i.e.
+    from a crash) is ignored.
+
+    arguments:
+        file_name the data file name
+
+    returns:
+        header the journal header (None if there is no valid journal)
+        segments the list of complete segments
+        end the size of the valid part of the journal
+    '''
+    segments = []
+    header = None
+    end = 0
+    try:
+        journal_file = open(journal_name(file_name), 'rb')
+    except OSError:
+        return header, segments, end
+    with journal_file:
+        while True:
+            frame = journal_file.read(_frame.size)
+            if len(frame) < _frame.size:
+                break
+            length, crc = _frame.unpack(frame)
+            payload = journal_file.read(length)
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                break
+            if header is None:
+                header = pickle.loads(payload)
+            else:
+                segments.append(pickle.loads(payload))
+            end = journal_file.tell()
+    if _check_base(header, file_name) is None:
+        return None, [], 0
+    return header, segments, end
+
+def append_journal(file_name, cycle_data_list, sort_key_string, appended_files=None, columnar=False):
+    '''
+    Append a segment of parsed cycles to the journal of a data file. The
+    segment is flushed to disk before returning and the data file is locked
+    (see opppy.storage.lock_data) while it is written.
+
+    arguments:
+        file_name the data file name
+        cycle_data_list list of parsed cycle data dictionaries
+        sort_key_string key string used to access the cycle_info sort value
+        appended_files optional list of file names to add to the data
+            'appended_files' list
+        columnar bool to store new dictionaries as columnar_dictionary NumPy
+            columns when the journal is replayed
+    '''
+    with lock_data(file_name):
+        header, end = journal_header(file_name)
+        mode = 'r+b' if header is not None else 'wb'
+        with open(journal_name(file_name), mode) as journal_file:
+            if header is None:
+                header = {'version':__version__, 'base':_base_stamp(file_name),
+                          'sort_key_string':sort_key_string, 'columnar':columnar}
+                _write_segment(journal_file, header)
+            elif header['sort_key_string'] != sort_key_string:
+                print("Error: journal sort key", header['sort_key_string'], "does not match", sort_key_string)
+                sys.exit(0)
+            else:
+                # drop any partially written segment
+                journal_file.seek(end)
+                journal_file.truncate()
+            _write_segment(journal_file, {'cycles':cycle_data_list, 'appended_files':list(appended_files or [])})
+            journal_file.flush()
+            os.fsync(journal_file.fileno())
+
+def load_journal_data(file_name):
+    '''
+    Load a data file and replay its journal. The result matches appending
+    the journaled cycles to the data file with append_output_dictionary.
+
+    arguments:
+        file_name the data file name
+    '''
+    if os.path.isfile(file_name):
+        data = load_data(file_name, journal=False, shards=False, migrate=True)
+    else:
+        data = {}
+        data['version'] = __version__
+    header, segments, end = read_journal(file_name)
+    if header is None:
+        return data
+    if migration_path(header['version']) is None:
+        # the journal holds parsed cycles, which are appended with the data
+        # layout of this version once the data file is migrated
+        print("Error: journal does not match this version of OPPPY")
+        print(journal_name(file_name), "was build with version", header['version'])
+        print("This version of OPPPY is ", __version__)
+        sys.exit(0)
+    for segment in segments:
+        # match append_output_dictionary, which keeps existing columnar data columnar
+        columnar = header['columnar'] or any(isinstance(value, columnar_dictionary) for value in data.values())
+        if len(segment['appended_files']) > 0:
+            if 'appended_files' in data:
+                data['appended_files'].extend(segment['appended_files'])
+            else:
+                data['appended_files'] = list(segment['appended_files'])
+        data = append_cycle_data_list(segment['cycles'], data, header['sort_key_string'], columnar)
+    return data
+
+def journal_fraction(file_name):
+    '''
+    Return the size of the valid journal relative to the data file (inf when
+    there is no data file yet). This can be used to decide when to compact.
+
+    arguments:
+        file_name the data file name
+    '''
+    header, end = journal_header(file_name)
+    if header is None:
+        return 0.0
+    if not os.path.isfile(file_name) or os.path.getsize(file_name) == 0:
+        return float('inf')
+    return end/os.path.getsize(file_name)
+
+def compact_journal(file_name, update_function=None, compression=None):
+    '''
+    Merge the journal into the data file. The new data file is written next
+    to the old one and renamed over it (see opppy.storage.save_data), so an
+    interrupted compaction leaves either the old data file and its journal or
+    the new data file (and a stale journal that is ignored).
+
+    arguments:
+        file_name the data file name
+        update_function optional function called with the merged data before
+            it is saved (i.e. a post_parse hook)
+        compression optional compression of the data file (by default the
+            data file keeps its compression, see opppy.storage.COMPRESSIONS)
+    '''
+    with lock_data(file_name):
+        if compression is None:
+            compression = data_compression(file_name)
+        data = load_journal_data(file_name)
+        if update_function is not None:
+            update_function(data)
+        save_data(data, file_name, compression=compression)
+        if os.path.isfile(journal_name(file_name)):
+            os.remove(journal_name(file_name))
+    return data
+
+def append_output_journal(file_name, output_files, opppy_parser, append_date=False, nthreads=0, cycle_index=None, columnar=False, stats=None):
+    '''
+    Append output data from a list of output_files to the journal of a data
+    file. Only the new cycles are written, one segment per output file.
+
+    arguments:
+        file_name the data file name
+        output_files a list of output files to parse
+        opppy_parser a user defined OPPPY parser for the output files
+        append_date bool to specify if the data should be appended to the file
+            name for tracking purposes
+        nthreads number of worker processes (-1 nthreads=cpu_count, 0 serial)
+        cycle_index optional cycle index dictionary (see load_cycle_index)
+        columnar bool to store new dictionaries as columnar_dictionary NumPy columns
+        stats optional parse_stats object to record the chunk, parse and merge times
+    '''
+    time = ''
+    if append_date:
+      time = time+'.'+datetime.datetime.now().strftime ("%Y%m%d%H%M%S")
+    appended_files = [output_file.split('/')[-1]+time for output_file in output_files]
+
+    print('')
+    print("Number of files to be read: ", len(output_files))
+    ncycles = 0
+    for output_file, file_cycles in groupby(iter_output_cycle_data(output_files, opppy_parser, nthreads, cycle_index, stats=stats), key=lambda item: item[0]):
+        cycle_data_list = [cycle_data for output_file, cycle_data in file_cycles]
+        ncycles += len(cycle_data_list)
+        if stats is not None:
+            with stats.timer('merge', output_file):
+                append_journal(file_name, cycle_data_list, opppy_parser.sort_key_string, appended_files, columnar)
+        else:
+            append_journal(file_name, cycle_data_list, opppy_parser.sort_key_string, appended_files, columnar)
+        appended_files = []
+    if len(appended_files) > 0:
+        # no new cycles, but the files are still recorded
+        append_journal(file_name, [], opppy_parser.sort_key_string, appended_files, columnar)
+
+    print('')
+    print('')
+    print("Journaled", ncycles, "cycles for", file_name)
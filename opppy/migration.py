@@ -0,0 +1,172 @@
+# ---------------------------*-python-*----------------------------------------#
+# file   migration.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+'''
+Migrations of OPPPY data dictionaries between OPPPY versions
+
+Every change to the layout of the stored dictionaries registers a migration
+function from the last version with the old layout to the first version with
+the new one. Data written by an older OPPPY is upgraded by running the chain
+of migrations, so an upgrade costs a rewrite of the changed dictionaries
+instead of parsing every output file again.
+
+.. autosummary::
+
+  register_migration
+  migration_path
+  migrate_data
+  check_data_version
+  migrate_file
+'''
+
+import os
+import sys
+
+from opppy.version import __version__
+from opppy.storage import load_data, save_data, lock_data
+
+# from_version -> (to_version, migration function)
+_migrations = {}
+
+def register_migration(from_version, to_version, function=None):
+    '''
+    Register a function that upgrades a data dictionary from from_version
+    to to_version. The function updates the dictionary in place and returns
+    the list of top level keys it changed (None if it can not tell). It is
+    also called for dictionaries loaded with only some of their keys, so it
+    must only change the keys that are present. Can be used as a decorator.
+
+    arguments:
+        from_version the OPPPY version of the old layout
+        to_version the OPPPY version the function upgrades to
+        function the migration function
+    '''
+    if function is None:
+        return lambda function: register_migration(from_version, to_version, function)
+    if from_version in _migrations:
+        print("Error: a migration from OPPPY version", from_version, "is already registered")
+        sys.exit(0)
+    _migrations[from_version] = (to_version, function)
+    return function
+
+def _same_layout(data):
+    '''
+    Migration between versions that did not change the data layout
+    '''
+    return []
+
+# releases 0.1.0 to 0.1.13 all store the same dictionary layout
+_releases = ['0.1.'+str(minor) for minor in range(14)]
+for _from_version, _to_version in zip(_releases[:-1], _releases[1:]):
+    register_migration(_from_version, _to_version, _same_layout)
+
+def migration_path(version, target=__version__):
+    '''
+    Return the list of (to_version, function) migrations that upgrade data
+    of an OPPPY version to the target version (None if there is no path)
+
+    arguments:
+        version the OPPPY version of the data
+        target the OPPPY version to upgrade to
+    '''
+    path = []
+    while version != target:
+        if version not in _migrations or len(path) > len(_migrations):
+            return None
+        version, function = _migrations[version]
+        path.append((version, function))
+    return path
+
+def migrate_data(data, target=__version__):
+    '''
+    Upgrade a data dictionary in place to the target OPPPY version
+
+    arguments:
+        data the OPPPY dictionary to upgrade (with a 'version' key)
+        target the OPPPY version to upgrade to
+
+    returns:
+        the list of changed top level keys (None if every key may have
+        changed) or False if there is no migration path
+    '''
+    path = migration_path(data.get('version'), target)
+    if path is None:
+        return False
+    changed = []
+    for version, function in path:
+        function_changed = function(data)
+        if function_changed is None or changed is None:
+            changed = None
+        else:
+            changed.extend(key for key in function_changed if key not in changed)
+        data['version'] = version
+    return changed
+
+def check_data_version(data, name=None):
+    '''
+    Check that a data dictionary matches this version of OPPPY and upgrade
+    older dictionaries in place. Data without a migration path to this
+    version (i.e. newer data or data without a version) is an error.
+
+    arguments:
+        data the OPPPY dictionary
+        name optional name of the data (i.e. the pickle file) for messages
+    '''
+    if data.get('version') == __version__:
+        return data
+    version = data.get('version')
+    if version is not None and migrate_data(data) is not False:
+        print("Migrated", name if name is not None else "data dictionary", "from OPPPY version", version, "to", __version__)
+        return data
+    name = name if name is not None else "data dictionary"
+    print('')
+    print("Error:", name, "does not match this version of OPPPY")
+    if version is not None:
+      print(name, "was build with version", version)
+    else:
+      print("This ", name, " has no version")
+    print("This version of OPPPY is ", __version__)
+    print("No migration is registered for this version. Delete the old ", name, "file and rebuild it")
+    sys.exit(0)
+
+def migrate_file(file_name, compression=None):
+    '''
+    Upgrade a stored data file written by an older OPPPY in place. Only the
+    dictionaries changed by the migrations (and the version) are rewritten
+    for formats that can save single keys. A journal is folded into the
+    upgraded file, since it only applies to the file it was started on.
+
+    arguments:
+        file_name the data file name
+        compression optional compression of the data file (by default the
+            data file keeps its compression)
+
+    returns:
+        True if the file was upgraded
+    '''
+    if not os.path.exists(file_name):
+        return False
+    with lock_data(file_name):
+        stored = load_data(file_name, [], journal=False, shards=False)
+        version = stored.get('version')
+        if version == __version__:
+            return False
+        if version is None or migration_path(version) is None:
+            # reported before the data is read
+            check_data_version(stored, file_name)
+        if os.path.isfile(file_name+'.journal'):
+            # the journal replay upgrades the data file dictionary first
+            from opppy.journal import compact_journal
+            compact_journal(file_name, compression=compression)
+            return True
+        # only the dictionaries the migrations touch are read from formats
+        # that can load single keys
+        data = load_data(file_name, lazy=True, journal=False, shards=False)
+        changed = migrate_data(data)
+        print("Migrated", file_name, "from OPPPY version", version, "to", __version__)
+        save_data(data, file_name, None if changed is None else list(changed), compression)
+    return True
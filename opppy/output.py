@@ -10,13 +10,30 @@ Utilities to extract cycle data from outputs
 
 .. autosummary::
 
+  problem_data_fingerprint
+  share_problem_data
+  append_problem_data
   append_cycle_data
+  append_cycle_data_list
+  append_hdf5_cycle_data_list
   append_data
   print_pickle_data
   print_dictionary_data
   get_output_lines
+  iter_output_lines
+  get_output_offsets
+  iter_output_cycles
   extract_cycle_data
+  new_cycle_index
+  load_cycle_index
+  save_cycle_index
+  cycle_index_start
+  update_cycle_index
+  output_cycle_strings
+  iter_output_cycle_data
   append_output_dictionary
+  append_output_hdf5
+  follow_output_dictionary
 '''
 
 #----------------------------------------------------------#
@@ -27,19 +44,138 @@ import sys
 import io
 import os
 import math
+import mmap
+import bisect
+import hashlib
+from time import sleep, perf_counter
+from itertools import groupby
 import platform
 import numpy as np
 import pickle
-if "linux" in platform.system().lower(): 
-    from multiprocessing import Process, Manager, cpu_count
-else:
-    # Protect against multiprocessing fork issue on Windows and Mac
-    from multiprocess import Process, Manager, cpu_count
 
 from opppy.version import __version__
 from opppy.progress import *
+from opppy.columnar import columnar_dictionary
+from opppy.parse_stats import parse_stats, count_cycle_keys
+from opppy.parallel import get_parser_pool, worker_parser, split_offsets, pack_cycle_data, unpack_cycle_data, cpu_count
+from opppy.storage import open_hdf5, check_hdf5_compression, read_hdf5_value, write_hdf5_value, extend_hdf5_series, load_data, save_data, lock_data, atomic_file
+from opppy.migration import check_data_version, migrate_file
 
-def append_cycle_data(cycle_data, data, sort_key_string):
+def problem_data_fingerprint(problem_data):
+    '''
+    This function returns a fingerprint (sha1 of the pickled data) of a
+    problem data dictionary, or None if the data can not be pickled
+    
+    arguments:
+      problem_data - python dictionary of problem data
+    '''
+    try:
+        return hashlib.sha1(pickle.dumps(problem_data, protocol=4)).hexdigest()
+    except (pickle.PicklingError, TypeError):
+        return None
+
+
+def _same_problem_values(problem_values, cycle_values):
+    '''
+    Fast check that two problem data arrays are equal
+    '''
+    try:
+        return bool(np.array_equal(problem_values, cycle_values))
+    except Exception:
+        return False
+
+
+def _same_problem_data(problem_data, cycle_problem_data):
+    '''
+    Check that two problem data dictionaries hold the same keys and values
+    '''
+    if problem_data.keys() != cycle_problem_data.keys():
+        return False
+    for key, value in problem_data.items():
+        cycle_value = cycle_problem_data[key]
+        if value is cycle_value:
+            continue
+        if isinstance(value, (list, tuple, np.ndarray)) or isinstance(cycle_value, (list, tuple, np.ndarray)):
+            if not _same_problem_values(value, cycle_value):
+                return False
+        elif not (value == cycle_value):
+            return False
+    return True
+
+
+def share_problem_data(cycle_data_list):
+    '''
+    This function lets every cycle whose problem data matches the previous
+    cycle share the previous problem data dictionary, so append_problem_data
+    only checks the problem data of a parsed file (or worker chunk) when it
+    changes instead of once per cycle
+    
+    arguments:
+      cycle_data_list - iterable of python dictionaries of cycle data
+    '''
+    previous = None
+    for cycle_data in cycle_data_list:
+        problem_data = cycle_data.get('problem_data')
+        if type(problem_data) is dict:
+            if previous is not None and _same_problem_data(previous, problem_data):
+                cycle_data['problem_data'] = previous
+            else:
+                previous = problem_data
+        yield cycle_data
+
+
+def append_problem_data(cycle_data, data, checked=None):
+    '''
+    This function moves the cycle problem data into the data dictionary and
+    checks that it matches any existing problem data
+    
+    arguments:
+      cycle_data - python dictionary of cycle data
+      data - python dictionary of data 
+      checked - optional dictionary that keeps the last cycle problem data
+        checked against data. Cycles that share that problem data dictionary
+        (see share_problem_data) are not checked again.
+    '''
+    # Check that the problem data for the cycle matches the current data
+    # problem data.
+    if 'problem_data' in data:
+        problem_data = data.pop('problem_data')
+        cycle_problem_data = cycle_data.pop('problem_data')
+        if checked is None or checked.get('problem_data') is not cycle_problem_data:
+            for key in list(cycle_problem_data.keys()):
+                if key in problem_data:
+                    if isinstance(cycle_problem_data[key],(list,tuple,np.ndarray)):
+                        if len(problem_data[key]) != len(cycle_problem_data[key]):
+                            print("Error: Problem data doesn't match")
+                            print("len(previous_problem_data[", key, "] --", len(problem_data[key]))
+                            print("len(cycle_problem_data[", key, "] --", len(cycle_problem_data[key]))
+                            sys.exit(0)
+                        if _same_problem_values(problem_data[key], cycle_problem_data[key]):
+                            continue
+                        for index, problem_value, cycle_value in zip(list(range(len(problem_data[key]))), problem_data[key], cycle_problem_data[key]):
+                          if (problem_value != cycle_value):
+                            print("Error: Problem data doesn't match")
+                            print("previous_problem_data[", key, "][",index,"] --", problem_value)
+                            print("cycle_problem_data[", key, "][",index,"] --", cycle_value)
+                            sys.exit(0)
+                    elif problem_data[key] != cycle_problem_data[key]:
+                        print("Error: Problem data doesn't match")
+                        print("previous_problem_data = ", key, "--", problem_data[key])
+                        print("cycle_problem_data = ", key, "--", cycle_problem_data[key])
+                        sys.exit(0)
+                else:
+                   problem_data[key] = cycle_problem_data[key]
+            if checked is not None:
+                checked['problem_data'] = cycle_problem_data
+        data['problem_data'] = problem_data
+    else:
+        if ('problem_data' in cycle_data):
+            data['problem_data'] = cycle_data.pop('problem_data')
+            if checked is not None:
+                checked['problem_data'] = data['problem_data']
+
+
+def append_cycle_data(cycle_data, data, sort_key_string, columnar=False, checked=None):
     '''
     This function appends a dictionary of cycle data to an
     existing dictionary
@@ -48,6 +184,9 @@ def append_cycle_data(cycle_data, data, sort_key_string):
       cycle_data - python dictionary of cycle data
       data - python dictionary of data 
       sort_key_string - string used to access the sorting data in the 'cycle_info' dictionary
+      columnar - store new dictionaries as columnar_dictionary NumPy columns
+        (existing columnar dictionaries are always appended as columns)
+      checked - optional dictionary of the last checked problem data (see append_problem_data)
     
     Output:
       data - python dictionary of appended data
@@ -59,44 +198,20 @@ def append_cycle_data(cycle_data, data, sort_key_string):
         print("Error: No cycle info was found")
         sys.exit(0)
 
-    # Check that the problem data for the cycle matches the current data
-    # problem data.
-    if 'problem_data' in data:
-        problem_data = data.pop('problem_data')
-        cycle_problem_data = cycle_data.pop('problem_data')
-        for key in list(cycle_problem_data.keys()):
-            if key in problem_data:
-                if isinstance(cycle_problem_data[key],(list,tuple,np.ndarray)):
-                    if len(problem_data[key]) != len(cycle_problem_data[key]):
-                        print("Error: Problem data doesn't match")
-                        print("len(previous_problem_data[", key, "] --", len(problem_data[key]))
-                        print("len(cycle_problem_data[", key, "] --", len(cycle_problem_data[key]))
-                        sys.exit(0)
-                    for index, problem_value, cycle_value in zip(list(range(len(problem_data[key]))), problem_data[key], cycle_problem_data[key]):
-                      if (problem_value != cycle_value):
-                        print("Error: Problem data doesn't match")
-                        print("previous_problem_data[", key, "][",index,"] --", problem_value)
-                        print("cycle_problem_data[", key, "][",index,"] --", cycle_value)
-                        sys.exit(0)
-                elif problem_data[key] != cycle_problem_data[key]:
-                    print("Error: Problem data doesn't match")
-                    print("previous_problem_data = ", key, "--", problem_data[key])
-                    print("cycle_problem_data = ", key, "--", cycle_problem_data[key])
-                    sys.exit(0)
-            else:
-               problem_data[key] = cycle_problem_data[key]
-        data['problem_data'] = problem_data
-    else:
-        if ('problem_data' in cycle_data):
-            data['problem_data'] = cycle_data.pop('problem_data')
+    append_problem_data(cycle_data, data, checked)
 
     for key in list(cycle_data.keys()):
         if not bool(cycle_data[key]):
             continue
+        elif key in data and isinstance(data[key], columnar_dictionary):
+            data[key].append(cycle_data.pop(key), cycle_info, sort_key_string)
         elif key in data:
             dict_data = data.pop(key)
             cycle_dict_data = cycle_data.pop(key)
             data[key] = append_data(dict_data, cycle_dict_data, cycle_info, sort_key_string)
+        elif columnar:
+            data[key] = columnar_dictionary()
+            data[key].append(cycle_data[key], cycle_info, sort_key_string)
         elif cycle_data[key]:
             data[key] = cycle_data[key]
             # make the sub array data a list so we can append it later
@@ -108,6 +223,160 @@ def append_cycle_data(cycle_data, data, sort_key_string):
 
 
 
+def append_cycle_data_list(cycle_data_list, data, sort_key_string, columnar=False):
+    '''
+    This function appends a list of cycle data dictionaries (i.e. every cycle
+    of an output file) to an existing dictionary. The result matches calling
+    append_cycle_data for each cycle in order (later cycles replace any
+    earlier data at or beyond their sort value), but each dictionary is
+    truncated once with a binary search and every array is extended once.
+    
+    arguments:
+      cycle_data_list - list of python dictionaries of cycle data
+      data - python dictionary of data 
+      sort_key_string - string used to access the sorting data in the 'cycle_info' dictionary
+      columnar - store new dictionaries as columnar_dictionary NumPy columns
+        (existing columnar dictionaries are always appended as columns)
+    
+    Output:
+      data - python dictionary of appended data
+    '''
+    # collect the cycles of each dictionary in order and track when each
+    # dictionary was first and last appended to
+    checked = {}
+    dictionary_cycles = {}
+    first_append = {}
+    last_append = {}
+    for cycle_index, cycle_data in enumerate(cycle_data_list):
+        try:
+            cycle_info = cycle_data.pop('cycle_info') 
+            cycle_value = cycle_info[sort_key_string]
+        except:
+            print("Error: No cycle info was found")
+            sys.exit(0)
+        append_problem_data(cycle_data, data, checked)
+        if 'problem_data' in data:
+            last_append['problem_data'] = (cycle_index, 0)
+        for key_index, (key, cycle_dict_data) in enumerate(cycle_data.items()):
+            if not bool(cycle_dict_data):
+                continue
+            if key in dictionary_cycles:
+                dictionary_cycles[key].append((cycle_info, cycle_dict_data))
+            else:
+                dictionary_cycles[key] = [(cycle_info, cycle_dict_data)]
+                first_append[key] = (cycle_index, key_index+1)
+            last_append[key] = (cycle_index, key_index+1)
+
+    # append_cycle_data moves a dictionary to the end of data every time it is
+    # appended to, except for columnar dictionaries that are appended in place
+    for key in dictionary_cycles:
+        if key in data and isinstance(data[key], columnar_dictionary):
+            last_append.pop(key)
+        elif key not in data and columnar:
+            last_append[key] = first_append[key]
+    appended_keys = sorted(last_append, key=last_append.get)
+
+    for key, cycles in dictionary_cycles.items():
+        if (key in data and isinstance(data[key], columnar_dictionary)) or (key not in data and columnar):
+            if key not in data:
+                data[key] = columnar_dictionary()
+            for cycle_info, cycle_dict_data in cycles:
+                data[key].append(cycle_dict_data, cycle_info, sort_key_string)
+            continue
+
+        # a cycle is only kept if every later cycle has a larger sort value
+        sort_values = np.array([cycle_info[sort_key_string] for cycle_info, cycle_dict_data in cycles])
+        later_min = np.append(np.minimum.accumulate(sort_values[::-1])[::-1][1:], np.inf)
+        keep = sort_values < later_min
+
+        new_dictionary = key not in data
+        if not new_dictionary:
+            dict_data = data.pop(key)
+            # drop the existing data at or beyond the first new cycle
+            length = bisect.bisect_left(dict_data[sort_key_string], sort_values.min())
+            for subkey in dict_data:
+                del dict_data[subkey][length:]
+        else:
+            # a new dictionary takes the cycle data keys then the cycle_info keys
+            cycle_info, cycle_dict_data = cycles[0]
+            dict_data = {subkey:[] for subkey in list(cycle_dict_data)+list(cycle_info)}
+            length = 0
+
+        # every key is added even if its cycles were dropped
+        for cycle_info, cycle_dict_data in cycles:
+            for cycle_keys in (cycle_info, cycle_dict_data):
+                if not dict_data.keys() >= cycle_keys.keys():
+                    for subkey in cycle_keys:
+                        if subkey not in dict_data:
+                            dict_data[subkey] = [0]*length
+
+        kept_cycles = [cycle for cycle, keep_cycle in zip(cycles, keep) if keep_cycle]
+        kept_dict_data = [cycle_dict_data for cycle_info, cycle_dict_data in kept_cycles]
+        info_keys = set()
+        for cycle_info, cycle_dict_data in cycles:
+            info_keys.update(cycle_info)
+        for subkey, values in dict_data.items():
+            if subkey in info_keys:
+                values.extend([cycle_dict_data[subkey] if subkey in cycle_dict_data else cycle_info.get(subkey, 0)
+                    for cycle_info, cycle_dict_data in kept_cycles])
+            else:
+                try:
+                    values.extend([cycle_dict_data[subkey] for cycle_dict_data in kept_dict_data])
+                except KeyError:
+                    values.extend([cycle_dict_data.get(subkey, 0) for cycle_dict_data in kept_dict_data])
+        if new_dictionary and keep[0]:
+            # the cycle_info values of a new dictionary's first cycle take precedence
+            for subkey, value in cycles[0][0].items():
+                dict_data[subkey][0] = value
+        data[key] = dict_data
+
+    for key in appended_keys:
+        data[key] = data.pop(key)
+    return data
+
+
+
+def append_hdf5_cycle_data_list(cycle_data_list, hdf5_file, sort_key_string, columnar=False):
+    '''
+    This function appends a list of cycle data dictionaries to the data
+    stored in an open HDF5 file (see opppy.storage) in place. The result
+    matches append_cycle_data_list, but only the stored sort values and
+    problem data are read and the stored datasets are truncated and extended
+    rather than rewritten.
+    
+    arguments:
+      cycle_data_list - list of python dictionaries of cycle data
+      hdf5_file - an h5py file opened for appending (see open_hdf5)
+      sort_key_string - string used to access the sorting data in the 'cycle_info' dictionary
+      columnar - store new dictionaries as columnar groups (existing columnar
+        groups are always appended as columns)
+    '''
+    data = {}
+    if 'problem_data' in hdf5_file:
+        data['problem_data'] = read_hdf5_value(hdf5_file['problem_data'])
+    fingerprint = problem_data_fingerprint(data.get('problem_data'))
+    # the smallest new sort value of each dictionary decides where its stored
+    # data is truncated
+    first_values = {}
+    for cycle_data in cycle_data_list:
+        cycle_info = cycle_data.get('cycle_info', {})
+        if sort_key_string not in cycle_info:
+            continue
+        for key, cycle_dict_data in cycle_data.items():
+            if key in ('cycle_info', 'problem_data') or not bool(cycle_dict_data):
+                continue
+            first_values[key] = min(first_values.get(key, cycle_info[sort_key_string]), cycle_info[sort_key_string])
+    new_data = append_cycle_data_list(cycle_data_list, data, sort_key_string, columnar=True)
+    for key, series in new_data.items():
+        if key in first_values:
+            extend_hdf5_series(hdf5_file, key, series, sort_key_string, first_values[key], columnar)
+    if 'problem_data' in new_data and problem_data_fingerprint(new_data['problem_data']) != fingerprint:
+        if 'problem_data' in hdf5_file:
+            del hdf5_file['problem_data']
+        write_hdf5_value(hdf5_file, 'problem_data', new_data['problem_data'])
+
+
+
 def append_data(data, cycle_data, cycle_info, sort_key_string):
     '''
     This function appends the cycle OPPPY data into an existing
@@ -173,7 +442,7 @@ def print_pickle_data(args):
     pickle_names=[]
     for pickle_file_name in file_list:
         pickle_names.append(pickle_file_name.split('/')[-1])
-        pickle_data.append(pickle.load(open(pickle_file_name,'rb')))
+        pickle_data.append(load_data(pickle_file_name))
 
     for data, name in zip(pickle_data, pickle_names):
         print("######################################################")
@@ -223,7 +492,7 @@ def print_dictionary_data(data):
 
 
  
-def get_output_lines(filename,opening_string,closing_string, file_end_string=None):
+def get_output_lines(filename,opening_string,closing_string, file_end_string=None, use_mmap=False):
     '''
     Chunk the output file into "cycle strings" (recursive sets of data in a
     file isolated by an opening and closing string.
@@ -254,47 +523,212 @@ def get_output_lines(filename,opening_string,closing_string, file_end_string=Non
 
         ["#cycle 1\nsome data here\n\n","#cycle 2\nsome more data here"]
 
+    This returns the full list of cycle strings. Use iter_output_lines to
+    process very large files one cycle at a time.
+
+    optional arguments:
+        use_mmap locate the cycle boundaries with the memory mapped
+            get_output_offsets scanner instead of reading the file line by line
+    '''
+    return list(iter_output_lines(filename, opening_string, closing_string, file_end_string, use_mmap))
+
+
+def iter_output_lines(filename,opening_string,closing_string, file_end_string=None, use_mmap=False):
     '''
-    output = []
-    output_file = open(filename,'r')
-    raw = output_file.readlines()
+    Generator version of get_output_lines. The output file is streamed line by
+    line and each cycle string is yielded as soon as its closing string is
+    found, so only a single cycle is held in memory at a time.
+
+    arguments:
+        filename a string designated the file that should be read
+        opening_string a string designated the beginning of cycle data
+        closing_string a string designated the end of cycle data
+        file_end_string a string that tells the parser the output file completed without error. The goal of this is to prevent parsing of incomplete cycle data.
+        use_mmap locate the cycle boundaries with the memory mapped
+            get_output_offsets scanner instead of reading the file line by line
+    '''
+    if use_mmap:
+        offsets = get_output_offsets(filename, opening_string, closing_string, file_end_string)
+        yield from iter_output_cycles(filename, offsets)
+        return
     cycle_lines = []
-    temp_lines = ''
     reading_cycle = False
-    for line in raw:
-      if not reading_cycle and opening_string in str(line) :
-          reading_cycle = True
-      elif reading_cycle and closing_string in str(line):
-          # catch the special exception when the line is a return character
-          if closing_string == '\n' and len(line) != 1:
-              temp_lines += line
-              continue
-          reading_cycle = False
-          if opening_string in str(line):
-           # push the buffer into the cycle lines 
+    with open(filename,'r') as output_file:
+      for line in output_file:
+        if not reading_cycle and opening_string in line:
             reading_cycle = True
-            cycle_lines.append(temp_lines)
-            temp_lines = ''
-          else:
-           # push the buffer into the cycle lines 
-            cycle_lines.append(temp_lines+line)
-           # include this line into the buffer
-            temp_lines = ''
-           # skip the append because this line was included in the buffer
-            continue 
-      # append the line to the buffer
-      elif file_end_string is not None and file_end_string in str(line):
-            cycle_lines.append(temp_lines+line)
-            cycle_lines[-1] += line
-            temp_lines = ''
-            break 
-      if reading_cycle:
-        temp_lines += line
-    output_file.close()
-    return cycle_lines
+        elif reading_cycle and closing_string in line:
+            # catch the special exception when the line is a return character
+            if closing_string == '\n' and len(line) != 1:
+                cycle_lines.append(line)
+                continue
+            reading_cycle = False
+            if opening_string in line:
+              # push the buffer into the cycle lines
+              reading_cycle = True
+              yield ''.join(cycle_lines)
+              cycle_lines = []
+            else:
+              # include this line into the buffer and push it into the cycle lines
+              cycle_lines.append(line)
+              yield ''.join(cycle_lines)
+              cycle_lines = []
+              # skip the append because this line was included in the buffer
+              continue
+        elif file_end_string is not None and file_end_string in line:
+            cycle_lines.append(line)
+            yield ''.join(cycle_lines)
+            return
+        # append the line to the buffer
+        if reading_cycle:
+          cycle_lines.append(line)
  
 
-def extract_cycle_data(cycle_string, my_opppy_parser):
+class _line_finder():
+    '''
+    Find the lines of a memory mapped file that contain a token. The last
+    match is cached so repeated forward searches never rescan the file.
+    '''
+    def __init__(self, buf, token, size):
+        self.buf = buf
+        self.token = token
+        self.size = size
+        self.pos = -1
+        self.line = None
+        # tokens spanning multiple lines can never match a single line
+        self.done = token is None or b'\n' in token[:-1]
+
+    def find(self, pos):
+        '''
+        Return the (start, end) byte offsets of the first line at or after
+        pos (which must be the start of a line) that contains the token.
+        '''
+        if self.done:
+            return None
+        if self.pos >= 0 and pos >= self.pos and (self.line is None or self.line[0] >= pos):
+            return self.line
+        self.pos = pos
+        index = self.buf.find(self.token, pos, self.size)
+        if index < 0:
+            self.line = None
+            return None
+        line_start = self.buf.rfind(b'\n', pos, index)
+        line_start = pos if line_start < 0 else line_start+1
+        line_end = self.buf.find(b'\n', index, self.size)
+        line_end = self.size if line_end < 0 else line_end+1
+        self.line = (line_start, line_end)
+        return self.line
+
+
+class _blank_line_finder(_line_finder):
+    '''
+    Find blank lines (the special closing_string='\\n' case)
+    '''
+    def __init__(self, buf, size):
+        _line_finder.__init__(self, buf, b'\n\n', size)
+        self.done = False
+
+    def find(self, pos):
+        if pos == 0 and self.buf[0:1] == b'\n':
+            return (0, 1)
+        if self.pos >= 0 and pos >= self.pos and (self.line is None or self.line[0] >= pos):
+            return self.line
+        self.pos = pos
+        index = self.buf.find(self.token, max(pos-1,0), self.size)
+        self.line = None if index < 0 else (index+1, index+2)
+        return self.line
+
+
+def get_output_offsets(filename,opening_string,closing_string, file_end_string=None, start=0):
+    '''
+    Locate the cycle strings of an output file without copying them. The file
+    is memory mapped and scanned with bytes.find for the opening, closing and
+    file_end strings, using the same rules as get_output_lines.
+
+    arguments:
+        filename a string designated the file that should be read
+        opening_string a string designated the beginning of cycle data
+        closing_string a string designated the end of cycle data
+        file_end_string a string that tells the parser the output file completed without error. The goal of this is to prevent parsing of incomplete cycle data.
+        start byte offset (at the start of a line) to begin scanning from
+
+    returns a list of (start, end) byte offsets, one for each cycle string,
+    that can be passed to iter_output_cycles.
+    '''
+    offsets = []
+    opening = opening_string.encode()
+    opening_bytes = opening
+    with open(filename,'rb') as output_file:
+        size = os.fstat(output_file.fileno()).st_size
+        if size <= start:
+            return offsets
+        with mmap.mmap(output_file.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            opening = _line_finder(buf, opening_bytes, size)
+            if closing_string == '\n':
+                closing = _blank_line_finder(buf, size)
+            else:
+                closing = _line_finder(buf, closing_string.encode(), size)
+            file_end = _line_finder(buf, None if file_end_string is None else file_end_string.encode(), size)
+            pos = start
+            cycle_start = None
+            while pos < size:
+                if cycle_start is None:
+                    opening_line = opening.find(pos)
+                    end_line = file_end.find(pos)
+                    if end_line is not None and (opening_line is None or end_line[0] < opening_line[0]):
+                        offsets.append(end_line)
+                        break
+                    if opening_line is None:
+                        break
+                    cycle_start, pos = opening_line
+                    continue
+                closing_line = closing.find(pos)
+                if closing_string == '\n':
+                    # every other line contains the '\n' closing_string so the
+                    # file_end_string can only be found on an unterminated last line
+                    end_line = None
+                    if file_end_string is not None and buf[size-1:size] != b'\n':
+                        last_start = buf.rfind(b'\n', pos, size)
+                        last_start = pos if last_start < 0 else last_start+1
+                        if buf.find(file_end_string.encode(), last_start, size) >= 0:
+                            end_line = (last_start, size)
+                else:
+                    end_line = file_end.find(pos)
+                if end_line is not None and (closing_line is None or end_line[0] < closing_line[0]):
+                    offsets.append((cycle_start, end_line[1]))
+                    break
+                if closing_line is None:
+                    break
+                line_start, line_end = closing_line
+                if buf.find(opening_bytes, line_start, line_end) >= 0:
+                    # the closing line also opens the next cycle
+                    offsets.append((cycle_start, line_start))
+                    cycle_start = line_start
+                else:
+                    offsets.append((cycle_start, line_end))
+                    cycle_start = None
+                pos = line_end
+    return offsets
+
+
+def iter_output_cycles(filename, offsets):
+    '''
+    Yield the cycle strings located by get_output_offsets. Only the bytes
+    of each cycle are read (and decoded) as the cycle is requested.
+
+    arguments:
+        filename a string designated the file that should be read
+        offsets a list of (start, end) byte offsets from get_output_offsets
+    '''
+    if len(offsets) == 0:
+        return
+    with open(filename,'rb') as output_file:
+        with mmap.mmap(output_file.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            for cycle_start, cycle_end in offsets:
+                yield buf[cycle_start:cycle_end].decode().replace('\r\n','\n')
+
+
+def extract_cycle_data(cycle_string, my_opppy_parser, stats=None, file_name=None):
     '''
     This function takes a list of cycle data strings and extracts
     them using a user supplied opppy_parser. The extracted data is
@@ -303,6 +737,9 @@ def extract_cycle_data(cycle_string, my_opppy_parser):
     arguments:
       my_opppy_parser is a simple user defined python class with a parser function that returns a cycle dictionary. The dictionary must contain a "problem_data" dictionary with a cycle and time dictionary. The remaining dictionary items can should be packed such they can be appended to an overaching dictionary.
       cycle_string a cycle string extracted from the output file.
+      stats optional parse_stats object used to record the parse time, size
+        and number of values of the cycle
+      file_name optional output file name recorded with the stats
     '''
     if type(cycle_string) is not str:
       print("cycle_string object is not a list")
@@ -313,16 +750,248 @@ def extract_cycle_data(cycle_string, my_opppy_parser):
       print("my_opppy_parser does not have a parse_cycle_string function")
       sys.exit(0)
 
+    if stats is None:
+        return my_opppy_parser.parse_cycle_string(cycle_string)
+
+    start = perf_counter()
     cycle_dictionary = my_opppy_parser.parse_cycle_string(cycle_string)
+    stats.add_cycle(file_name, perf_counter()-start, len(cycle_string), count_cycle_keys(cycle_dictionary))
 
     return cycle_dictionary
 
-def append_output_dictionary(data, output_files, opppy_parser, append_date=False, nthreads=0):
+def _cycle_index_hash(filename, end, block_size=65536):
+    '''
+    Hash the first and last block_size bytes of the first end bytes of a
+    file. This is used to check that an indexed output file has only been
+    appended to since it was last parsed.
+    '''
+    file_hash = hashlib.sha1()
+    with open(filename,'rb') as index_file:
+        file_hash.update(index_file.read(min(block_size,end)))
+        index_file.seek(max(0,end-block_size))
+        file_hash.update(index_file.read(end-max(0,end-block_size)))
+    return file_hash.hexdigest()
+
+
+def new_cycle_index(opppy_parser):
+    '''
+    Return a new empty cycle index for output files chunked by opppy_parser
+
+    arguments:
+        opppy_parser the OPPPY parser used to chunk the indexed output files
+    '''
+    strings = (opppy_parser.cycle_opening_string, opppy_parser.cycle_closing_string,
+               opppy_parser.file_end_string, opppy_parser.sort_key_string)
+    return {'version':__version__, 'strings':strings, 'files':{}}
+
+
+def load_cycle_index(index_name, opppy_parser):
+    '''
+    Load a cycle index sidecar file. A new empty index is returned if the
+    file does not exist or it was built with different cycle strings.
+
+    arguments:
+        index_name the cycle index file name (typically pickle_name+'.index')
+        opppy_parser the OPPPY parser used to chunk the indexed output files
+    '''
+    cycle_index = new_cycle_index(opppy_parser)
+    if os.path.isfile(index_name):
+        with open(index_name,'rb') as index_file:
+            saved_index = pickle.load(index_file)
+        if saved_index.get('strings') == cycle_index['strings']:
+            cycle_index = saved_index
+        else:
+            print("Cycle index", index_name, "was built with different cycle strings and will be rebuilt")
+    return cycle_index
+
+
+def save_cycle_index(cycle_index, index_name):
+    '''
+    Save a cycle index sidecar file
+
+    arguments:
+        cycle_index the cycle index dictionary
+        index_name the cycle index file name
+    '''
+    with atomic_file(index_name) as temp_name, open(temp_name,'wb') as index_file:
+        pickle.dump(cycle_index,index_file)
+
+
+def cycle_index_start(cycle_index, file_name):
+    '''
+    Return the byte offset that parsing of file_name should resume from. Files
+    that are not in the index, or that have changed in any way other than
+    being appended to, are parsed from the beginning.
+
+    arguments:
+        cycle_index the cycle index dictionary
+        file_name the output file name
+    '''
+    entry = cycle_index['files'].get(os.path.abspath(file_name))
+    if entry is None:
+        return 0
+    stat = os.stat(file_name)
+    if stat.st_size == entry['size'] and stat.st_mtime == entry['mtime']:
+        return entry['resume']
+    if stat.st_size < entry['resume'] or _cycle_index_hash(file_name, entry['resume']) != entry['hash']:
+        print("Output file", file_name, "has been modified and will be re-parsed")
+        cycle_index['files'].pop(os.path.abspath(file_name))
+        return 0
+    return entry['resume']
+
+
+def update_cycle_index(cycle_index, file_name, start, offsets, sort_values):
+    '''
+    Record newly parsed cycles of file_name in the cycle index
+
+    arguments:
+        cycle_index the cycle index dictionary
+        file_name the output file name
+        start the byte offset parsing started from (from cycle_index_start)
+        offsets the (start, end) byte offsets of the newly parsed cycles
+        sort_values the sort_key_string values of the newly parsed cycles
+    '''
+    entry = cycle_index['files'].setdefault(os.path.abspath(file_name),
+            {'offsets':[], 'sort_values':[], 'resume':0})
+    entry['offsets'].extend(offsets)
+    entry['sort_values'].extend(sort_values)
+    entry['resume'] = offsets[-1][1] if len(offsets) > 0 else start
+    stat = os.stat(file_name)
+    entry['size'] = stat.st_size
+    entry['mtime'] = stat.st_mtime
+    entry['hash'] = _cycle_index_hash(file_name, entry['resume'])
+
+
+def output_cycle_strings(file_name, opppy_parser, start=None):
+    '''
+    Return the (offsets, cycle_strings) of an output file. The cycle strings
+    are streamed with iter_output_lines, or when a start offset is provided
+    they are located with get_output_offsets beginning at start.
+    '''
+    if start is None:
+        return None, iter_output_lines(file_name, opppy_parser.cycle_opening_string,
+                opppy_parser.cycle_closing_string, opppy_parser.file_end_string)
+    offsets = get_output_offsets(file_name, opppy_parser.cycle_opening_string,
+            opppy_parser.cycle_closing_string, opppy_parser.file_end_string, start)
+    return offsets, iter_output_cycles(file_name, offsets)
+
+
+def _timed_cycle_strings(cycle_strings, stats, file_name):
+    '''
+    Yield the cycle strings and add the time spent reading them to the
+    chunk stage of stats
+    '''
+    cycle_strings = iter(cycle_strings)
+    while True:
+        start = perf_counter()
+        cycle_string = next(cycle_strings, None)
+        stats.add_time('chunk', perf_counter()-start, file_name)
+        if cycle_string is None:
+            return
+        yield cycle_string
+
+
+def _scan_output_file(task):
+    '''
+    Worker pool task that locates the cycles of a single output file. With
+    profiling on the scan time is returned with the offsets.
+    '''
+    file_name, opppy_parser, start, profile = task
+    opppy_parser = worker_parser(opppy_parser)
+    scan_start = perf_counter()
+    offsets = get_output_offsets(file_name, opppy_parser.cycle_opening_string,
+            opppy_parser.cycle_closing_string, opppy_parser.file_end_string, start)
+    return offsets, perf_counter()-scan_start if profile else None
+
+
+def _parse_output_chunk(task):
+    '''
+    Worker pool task that parses a chunk of contiguous cycles of an output file.
+    The cycles are returned packed (see pack_cycle_data) to limit the bytes sent
+    back to the parent process, along with the chunk parse_stats when profiling.
+    '''
+    file_name, opppy_parser, offsets, profile = task
+    opppy_parser = worker_parser(opppy_parser)
+    stats = parse_stats() if profile else None
+    cycle_strings = iter_output_cycles(file_name, offsets)
+    if profile:
+        cycle_strings = _timed_cycle_strings(cycle_strings, stats, file_name)
+    return pack_cycle_data(list(share_problem_data(extract_cycle_data(cycle_string, opppy_parser, stats, file_name) for cycle_string in cycle_strings))), stats
+
+
+def iter_output_cycle_data(output_files, opppy_parser, nthreads=0, cycle_index=None, chunk_bytes=None, stats=None):
+    '''
+    Parse a list of output files and yield the (file_name, cycle_data) of every
+    cycle in file order. With nthreads>0 the shared worker pool first locates
+    the cycles of every file (get_output_offsets) and then parses chunks of
+    contiguous cycles, so a single large file is spread over all of the
+    workers. The chunks are returned in order and yielded while the remaining
+    chunks are still being parsed.
+
+    arguments:
+        output_files a list of output files to parse
+        opppy_parser a user defined OPPPY parser for the output files
+        nthreads number of worker processes (-1 nthreads=cpu_count, 0 serial)
+        cycle_index optional cycle index dictionary (see load_cycle_index) used to
+            skip previously parsed cycles. It is updated as each file is completed.
+        chunk_bytes optional target size of the cycle chunks (see split_offsets)
+        stats optional parse_stats object to record the chunk and parse times
+    '''
+    total = len(output_files)
+    nthreads = cpu_count() if nthreads < 0 else nthreads
+    starts = [None if cycle_index is None else cycle_index_start(cycle_index, file_name) for file_name in output_files]
+    if(nthreads>0):
+      print("Number of threads used for processing: ",nthreads)
+      # parsers that can not be pickled are inherited by forked workers
+      pool, task_parser = get_parser_pool(nthreads, opppy_parser)
+      starts = [0 if start is None else start for start in starts]
+      scans = pool.map(_scan_output_file, [(file_name, task_parser, start, stats is not None) for file_name, start in zip(output_files, starts)], chunksize=1)
+      offsets = [file_offsets for file_offsets, seconds in scans]
+      if stats is not None:
+          for file_name, (file_offsets, seconds) in zip(output_files, scans):
+              stats.add_time('chunk', seconds, file_name)
+      chunks = split_offsets(offsets, nthreads, chunk_bytes)
+      remaining = [0]*total
+      for file_index, chunk in chunks:
+          remaining[file_index] += 1
+      sort_values = [[] for file_name in output_files]
+      # files without any new cycles are already complete
+      for file_index in range(total):
+          if remaining[file_index] == 0:
+              if cycle_index is not None:
+                  update_cycle_index(cycle_index, output_files[file_index], starts[file_index], offsets[file_index], [])
+      count = 0
+      results = pool.imap(_parse_output_chunk, [(output_files[file_index], task_parser, chunk, stats is not None) for file_index, chunk in chunks], chunksize=1)
+      for (file_index, chunk), (packed_data, chunk_stats) in zip(chunks, results):
+          if stats is not None:
+              stats.merge(chunk_stats)
+          for cycle_data in unpack_cycle_data(packed_data):
+              sort_values[file_index].append(cycle_data.get('cycle_info',{}).get(opppy_parser.sort_key_string))
+              yield output_files[file_index], cycle_data
+          remaining[file_index] -= 1
+          if remaining[file_index] == 0 and cycle_index is not None:
+              update_cycle_index(cycle_index, output_files[file_index], starts[file_index], offsets[file_index], sort_values[file_index])
+          count += 1
+          progress(count,len(chunks), 'of cycle chunks read')
+    else:
+      for count, (file_name, start) in enumerate(zip(output_files, starts)):
+        offsets, cycle_strings = output_cycle_strings(file_name, opppy_parser, start)
+        if stats is not None:
+            cycle_strings = _timed_cycle_strings(cycle_strings, stats, file_name)
+        sort_values = []
+        for cycle_data in share_problem_data(extract_cycle_data(cycle_string, opppy_parser, stats, file_name) for cycle_string in cycle_strings):
+            sort_values.append(cycle_data.get('cycle_info',{}).get(opppy_parser.sort_key_string))
+            yield file_name, cycle_data
+        if cycle_index is not None:
+            update_cycle_index(cycle_index, file_name, start, offsets, sort_values)
+        progress(count+1,total, 'of input files read')
+
+
+def append_output_dictionary(data, output_files, opppy_parser, append_date=False, nthreads=0, cycle_index=None, columnar=False, stats=None):
     '''
     Append output data from a list of output_files to a user provided dictionary using a user proved
-    opppy_parser. By default this function will use the multiprocessing option to parallelize the
-    parsing of multiple dumps. The parallel parsing can be disabled by setting
-    the environment variable 'OPPPY_USE_THREADS=False'
+    opppy_parser. With nthreads>0 the cycles are parsed in chunks by the shared worker pool
+    (see iter_output_cycle_data).
 
 
     arguments:
@@ -331,16 +1000,16 @@ def append_output_dictionary(data, output_files, opppy_parser, append_date=False
         opppy_parser a user defined OPPPY parser for the output files
         append_date bool to specify if the data should be appended to the file
             name for tracking purposes 
+        nthreads number of worker processes (-1 nthreads=cpu_count, 0 serial)
+        cycle_index optional cycle index dictionary (see load_cycle_index). Only
+            cycles beyond the previously indexed cycles of each file are parsed
+            and the index is updated with the new cycles.
+        columnar bool to store the data as columnar_dictionary NumPy columns.
+            Dictionaries that already hold columnar data stay columnar.
+        stats optional parse_stats object to record the chunk, parse and merge times
     '''
-    if not 'version' in data or not (data['version'] == __version__):
-      print('')
-      print("Error: data dictionary does not match this version of OPPPY")
-      if 'version' in data:
-        print("data dictionary was build with version", data['version'])
-      else:
-        print("This data dictionary has no version")
-      print("This version of OPPPY is ", __version__)
-      sys.exit(0)
+    check_data_version(data)
+    columnar = columnar or any(isinstance(value, columnar_dictionary) for value in data.values())
     time = ''
     if append_date:
       time = time+'.'+datetime.datetime.now().strftime ("%Y%m%d%H%M%S")
@@ -350,52 +1019,174 @@ def append_output_dictionary(data, output_files, opppy_parser, append_date=False
       else:
           data['appended_files'] = [file_name.split('/')[-1]+time]
 
-    count = 0
-    total = len(output_files) 
     print('')
-    print("Number of files to be read: ", total)
-    nthreads = cpu_count() if nthreads < 0 else nthreads
-    if(nthreads>0):
-      def thread_all(file_name, file_index, result_l):
-          thread_cycle_string_list = get_output_lines(file_name, opppy_parser.cycle_opening_string,
-                 opppy_parser.cycle_closing_string, opppy_parser.file_end_string);
-          thread_data = []
-          for cycle_string in thread_cycle_string_list:
-                thread_data.append(extract_cycle_data(cycle_string, opppy_parser))
-          result_l[file_index]=thread_data
-      print("Number of threads used for processing: ",nthreads)
-      for stride in range(math.ceil(float(total)/float(nthreads))):
-          files = output_files[nthreads*stride:min(nthreads*(stride+1),len(output_files))]
-          with Manager() as manager:
-                result_l = manager.list(range(len(files)))
-                threads = []
-                for file_index, file_name in enumerate(files):
-                    thread = Process(target=thread_all, args=(file_name, file_index, result_l,))
-                    thread.start()
-                    threads.append(thread)
-                for thread in threads:
-                    thread.join()
-                    count += 1
-                    progress(count,total, 'of input files read')
-                for file_data in result_l:
-                    for cycle_data in file_data:
-                        data = append_cycle_data(cycle_data,data,opppy_parser.sort_key_string)
-                del result_l
-                del threads
-    else:
-      for file_name in output_files:
-        cycle_string_list = get_output_lines(file_name, opppy_parser.cycle_opening_string, opppy_parser.cycle_closing_string, opppy_parser.file_end_string)
-        for cycle_string in cycle_string_list:
-            cycle_data = extract_cycle_data(cycle_string, opppy_parser)
-            data = append_cycle_data(cycle_data,data,opppy_parser.sort_key_string)
-        count += 1
-        progress(count,total, 'of input files read')
+    print("Number of files to be read: ", len(output_files))
+    # merge the cycles one file at a time
+    for file_name, file_cycles in groupby(iter_output_cycle_data(output_files, opppy_parser, nthreads, cycle_index, stats=stats), key=lambda item: item[0]):
+        cycle_data_list = [cycle_data for file_name, cycle_data in file_cycles]
+        merge_start = perf_counter()
+        data = append_cycle_data_list(cycle_data_list,data,opppy_parser.sort_key_string,columnar)
+        if stats is not None:
+            stats.add_time('merge', perf_counter()-merge_start, file_name)
 
     print('')
     print('')
     print_dictionary_data(data)
 
-def build_output_dictionary_list(file_lists, opppy_parser, nthreads=0):
+def append_output_hdf5(file_name, output_files, opppy_parser, append_date=False, nthreads=0, cycle_index=None, columnar=False, stats=None, compression=None):
+    '''
+    Append output data from a list of output_files to an HDF5 data file in
+    place (see append_hdf5_cycle_data_list). Only the new cycles are written,
+    so appending a restart output does not rewrite the stored data. A new
+    file is created if file_name does not exist. The file is locked (see
+    opppy.storage.lock_data) while it is appended to.
+
+    arguments:
+        file_name the HDF5 data file to append to
+        output_files a list of output files to parse
+        opppy_parser a user defined OPPPY parser for the output files
+        append_date bool to specify if the data should be appended to the file
+            name for tracking purposes 
+        nthreads number of worker processes (-1 nthreads=cpu_count, 0 serial)
+        cycle_index optional cycle index dictionary (see load_cycle_index)
+        columnar bool to store new dictionaries as columnar groups. Files that
+            already hold columnar groups stay columnar.
+        stats optional parse_stats object to record the chunk, parse and merge times
+        compression optional compression of new datasets ('zlib' or
+            'zlib+shuffle', see opppy.storage.save_hdf5)
+    '''
+    check_hdf5_compression(compression)
+    # upgrade a file written by an older OPPPY before it is appended to in place
+    migrate_file(file_name)
+    with lock_data(file_name), open_hdf5(file_name, 'a') as hdf5_file:
+        if compression is not None:
+            hdf5_file.attrs['opppy_compression'] = compression
+        if len(hdf5_file) == 0:
+            write_hdf5_value(hdf5_file, 'version', __version__)
+        version = read_hdf5_value(hdf5_file['version']) if 'version' in hdf5_file else None
+        if not (version == __version__):
+          print('')
+          print("Error: data dictionary does not match this version of OPPPY")
+          if version is not None:
+            print("data dictionary was build with version", version)
+          else:
+            print("This data dictionary has no version")
+          print("This version of OPPPY is ", __version__)
+          sys.exit(0)
+        columnar = columnar or any(node.attrs.get('opppy_type') == 'columnar' for node in hdf5_file.values())
+        time = ''
+        if append_date:
+          time = time+'.'+datetime.datetime.now().strftime ("%Y%m%d%H%M%S")
+        appended_files = read_hdf5_value(hdf5_file['appended_files']) if 'appended_files' in hdf5_file else []
+        for output_file in output_files:
+          appended_files.append(output_file.split('/')[-1]+time)
+        if 'appended_files' in hdf5_file:
+          del hdf5_file['appended_files']
+        write_hdf5_value(hdf5_file, 'appended_files', appended_files)
+
+        print('')
+        print("Number of files to be read: ", len(output_files))
+        ncycles = 0
+        for output_file, file_cycles in groupby(iter_output_cycle_data(output_files, opppy_parser, nthreads, cycle_index, stats=stats), key=lambda item: item[0]):
+            cycle_data_list = [cycle_data for output_file, cycle_data in file_cycles]
+            ncycles += len(cycle_data_list)
+            merge_start = perf_counter()
+            append_hdf5_cycle_data_list(cycle_data_list,hdf5_file,opppy_parser.sort_key_string,columnar)
+            if stats is not None:
+                stats.add_time('merge', perf_counter()-merge_start, output_file)
+
+    print('')
+    print('')
+    print("Appended", ncycles, "cycles to", file_name)
+
+def follow_output_dictionary(data, output_files, opppy_parser, interval=60.0, pickle_name=None,
+        cycle_index=None, update_function=None, max_updates=None):
+    '''
+    Follow a set of output files from a running simulation. Every interval
+    seconds the output files are checked for newly completed cycles (using
+    the opppy_parser closing string), only the new cycles are parsed, and they
+    are appended to the data dictionary (and optionally saved to a pickle
+    file). Output files that do not exist yet are checked again until they
+    appear. Following stops once every output file has reached its
+    file_end_string, after max_updates checks, or on a keyboard interrupt.
+
+    arguments:
+        data opppy input dictionary to be append to (must have a 'verion' opppy key)
+        output_files a list of output files to follow
+        opppy_parser a user defined OPPPY parser for the output files
+        interval the number of seconds to wait between checks for new cycles
+        pickle_name optional pickle file (and pickle_name.index cycle index) to
+            save the data to every time new cycles are appended
+        cycle_index optional cycle index dictionary to resume from (by default
+            the pickle_name.index file is used if it exists)
+        update_function optional function called with the data dictionary
+            after new cycles are appended (i.e. a post_parse hook)
+        max_updates optional maximum number of checks for new cycles
+    '''
+    check_data_version(data)
+    if cycle_index is None:
+        if pickle_name is not None:
+            cycle_index = load_cycle_index(pickle_name+'.index', opppy_parser)
+        else:
+            cycle_index = new_cycle_index(opppy_parser)
+    for file_name in output_files:
+      if 'appended_files' in data:
+          data['appended_files'].append(file_name.split('/')[-1])
+      else:
+          data['appended_files'] = [file_name.split('/')[-1]]
+
+    print('')
+    print("Number of files to be followed: ", len(output_files))
+    complete = set()
+    columnar = any(isinstance(value, columnar_dictionary) for value in data.values())
+    updates = 0
+    try:
+      while True:
+        new_cycles = 0
+        for file_name in output_files:
+            if file_name in complete:
+                continue
+            # the simulation may not have created (or may be replacing) the
+            # file yet, so a missing file has no new cycles
+            if not os.path.isfile(file_name):
+                continue
+            start = cycle_index_start(cycle_index, file_name)
+            offsets, cycle_strings = output_cycle_strings(file_name, opppy_parser, start)
+            sort_values = []
+            cycle_data_list = []
+            for cycle_string in cycle_strings:
+                cycle_data = extract_cycle_data(cycle_string, opppy_parser)
+                sort_values.append(cycle_data.get('cycle_info',{}).get(opppy_parser.sort_key_string))
+                cycle_data_list.append(cycle_data)
+                if opppy_parser.file_end_string is not None and \
+                   opppy_parser.file_end_string in cycle_string.rstrip('\n').split('\n')[-1]:
+                    complete.add(file_name)
+            data = append_cycle_data_list(list(share_problem_data(cycle_data_list)),data,opppy_parser.sort_key_string,columnar)
+            update_cycle_index(cycle_index, file_name, start, offsets, sort_values)
+            new_cycles += len(offsets)
+
+        updates += 1
+        if new_cycles > 0:
+            if update_function is not None:
+                update_function(data)
+            if pickle_name is not None:
+                with lock_data(pickle_name):
+                    save_data(data, pickle_name)
+                    save_cycle_index(cycle_index, pickle_name+'.index')
+            print("Appended", new_cycles, "new cycles")
+        if len(complete) == len(output_files):
+            print("All followed output files are complete")
+            break
+        if max_updates is not None and updates >= max_updates:
+            break
+        sleep(interval)
+    except KeyboardInterrupt:
+      print('')
+      print("Stopped following output files")
+
+    return data
+
+def build_output_dictionary_list(file_lists, opppy_parser, nthreads=0, columnar=False, stats=None, cache=None):
     '''
     append_pickle - 
       This function generates a opppy output dictionary
@@ -403,6 +1194,7 @@ def build_output_dictionary_list(file_lists, opppy_parser, nthreads=0):
     
       args:
         args - Parsed input arguments
+        cache - optional opppy.parse_cache.parse_cache of parsed dictionaries
     '''
     dictionary_data = []
     dictionary_names = []
@@ -410,9 +1202,15 @@ def build_output_dictionary_list(file_lists, opppy_parser, nthreads=0):
         # add a data name to go with the data sets
         dictionary_names.append(output_files[0])
         # build a new dictionary
-        data = {}
-        data['version'] = __version__
-        append_output_dictionary(data, output_files, opppy_parser, nthreads=nthreads)
+        def build():
+            data = {}
+            data['version'] = __version__
+            append_output_dictionary(data, output_files, opppy_parser, nthreads=nthreads, columnar=columnar, stats=stats)
+            return data
+        if cache is not None:
+            data = cache.cached('output', output_files, opppy_parser, build, columnar)
+        else:
+            data = build()
         dictionary_data.append(data)
     
     
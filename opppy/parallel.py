@@ -0,0 +1,228 @@
+# ---------------------------*-python-*----------------------------------------#
+# file   parallel.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+'''
+Shared worker pool used to parse output, tally and dump files in parallel
+
+.. autosummary::
+
+  get_worker_pool
+  get_parser_pool
+  worker_parser
+  close_worker_pool
+  is_picklable
+  split_offsets
+  pack_cycle_data
+  unpack_cycle_data
+'''
+
+import sys
+import atexit
+import pickle
+import platform
+from multiprocessing import get_context, get_all_start_methods
+import numpy as np
+if "linux" in platform.system().lower():
+    from multiprocessing import Pool, cpu_count
+else:
+    # Protect against multiprocessing fork issue on Windows and Mac
+    from multiprocess import Pool, cpu_count
+
+_worker_pool = None
+_worker_pool_size = 0
+# tasks of a fork started parser pool send INHERITED_PARSER instead of the parser
+INHERITED_PARSER = 'opppy_inherited_parser'
+_inherited_parser = None
+_parser_pool = None
+
+def get_worker_pool(nthreads):
+    '''
+    Return the shared worker pool with nthreads worker processes. The pool is
+    created on first use and reused by every later parse with the same number
+    of threads, so the worker start up cost is only paid once.
+
+    arguments:
+        nthreads number of worker processes (-1 uses cpu_count)
+    '''
+    global _worker_pool, _worker_pool_size
+    nthreads = cpu_count() if nthreads < 0 else nthreads
+    if _worker_pool is None or _worker_pool_size != nthreads:
+        close_worker_pool()
+        _worker_pool = Pool(nthreads)
+        _worker_pool_size = nthreads
+    return _worker_pool
+
+def get_parser_pool(nthreads, opppy_parser):
+    '''
+    Return a worker pool for tasks that use opppy_parser and the parser to
+    send with those tasks. Parsers that can be pickled are sent to the shared
+    worker pool. Other parsers (i.e. holding open files or lambdas) are
+    inherited by a new pool of fork started workers and the tasks send
+    INHERITED_PARSER instead (see worker_parser). The fork started pool is
+    replaced on every call, so its workers see the current parser state.
+
+    arguments:
+        nthreads number of worker processes (-1 uses cpu_count)
+        opppy_parser the user parser used by the tasks
+    '''
+    global _inherited_parser, _parser_pool
+    if is_picklable(opppy_parser):
+        return get_worker_pool(nthreads), opppy_parser
+    if 'fork' not in get_all_start_methods():
+        print("Error: opppy_parser can not be pickled and worker processes can not be forked on this system")
+        print("Make the parser picklable or parse in serial (nthreads=0)")
+        sys.exit(0)
+    nthreads = cpu_count() if nthreads < 0 else nthreads
+    _close_parser_pool()
+    _inherited_parser = opppy_parser
+    _parser_pool = get_context('fork').Pool(nthreads)
+    return _parser_pool, INHERITED_PARSER
+
+def worker_parser(opppy_parser):
+    '''
+    Return the parser of a worker pool task (see get_parser_pool)
+
+    arguments:
+        opppy_parser the parser sent with the task
+    '''
+    if isinstance(opppy_parser, str) and opppy_parser == INHERITED_PARSER:
+        return _inherited_parser
+    return opppy_parser
+
+def _close_parser_pool():
+    global _inherited_parser, _parser_pool
+    if _parser_pool is not None:
+        _parser_pool.terminate()
+        _parser_pool.join()
+    _inherited_parser = None
+    _parser_pool = None
+
+def close_worker_pool():
+    '''
+    Shut down the shared worker pool (and the fork started parser pool)
+    '''
+    global _worker_pool, _worker_pool_size
+    if _worker_pool is not None:
+        _worker_pool.terminate()
+        _worker_pool.join()
+    _worker_pool = None
+    _worker_pool_size = 0
+    _close_parser_pool()
+
+atexit.register(close_worker_pool)
+
+def is_picklable(obj):
+    '''
+    Check that an object (i.e. a user parser) can be sent to the worker pool
+    '''
+    try:
+        pickle.dumps(obj)
+        return True
+    except Exception:
+        return False
+
+def split_offsets(offsets, nthreads, chunk_bytes=None, min_chunk_bytes=1048576):
+    '''
+    Split the (start, end) cycle byte offsets of a set of files into chunks of
+    contiguous cycles. By default the chunks target a quarter of the average
+    work per thread so the pool can balance uneven files.
+
+    arguments:
+        offsets a list of cycle offset lists (one per file)
+        nthreads number of worker processes
+        chunk_bytes optional target number of bytes per chunk
+        min_chunk_bytes the smallest default chunk size
+
+    returns a list of (file_index, chunk_offsets) pairs in file order
+    '''
+    if chunk_bytes is None:
+        total_bytes = sum(file_offsets[-1][1]-file_offsets[0][0] for file_offsets in offsets if len(file_offsets)>0)
+        chunk_bytes = max(min_chunk_bytes, total_bytes//max(1,4*nthreads))
+    chunks = []
+    for file_index, file_offsets in enumerate(offsets):
+        chunk = []
+        chunk_start = None
+        for offset in file_offsets:
+            if chunk_start is None:
+                chunk_start = offset[0]
+            chunk.append(offset)
+            if offset[1]-chunk_start >= chunk_bytes:
+                chunks.append((file_index, chunk))
+                chunk = []
+                chunk_start = None
+        if len(chunk) > 0:
+            chunks.append((file_index, chunk))
+    return chunks
+
+def _pack_dictionary(dictionary, numbers, objects):
+    '''
+    Flatten a (nested) dictionary into the numbers and objects lists and return
+    its layout. Python floats are stored in numbers, nested dictionaries get a
+    nested layout and everything else is stored in objects. The problem data
+    is kept whole, so cycles that share it (see share_problem_data) still
+    share it when they are unpacked.
+    '''
+    layout = []
+    for key, value in dictionary.items():
+        if type(value) is float:
+            layout.append((key, None))
+            numbers.append(value)
+        elif type(value) is dict and key != 'problem_data':
+            layout.append((key, _pack_dictionary(value, numbers, objects)))
+        else:
+            layout.append((key, False))
+            objects.append(value)
+    return tuple(layout)
+
+def _unpack_dictionary(layout, numbers, objects):
+    '''
+    Rebuild a dictionary flattened by _pack_dictionary
+    '''
+    dictionary = {}
+    for key, sub_layout in layout:
+        if sub_layout is None:
+            dictionary[key] = next(numbers)
+        elif sub_layout is False:
+            dictionary[key] = next(objects)
+        else:
+            dictionary[key] = _unpack_dictionary(sub_layout, numbers, objects)
+    return dictionary
+
+def pack_cycle_data(cycle_data_list):
+    '''
+    Pack a list of cycle dictionaries into a compact form for returning from
+    the worker pool. Every cycle shares the key strings of a layout table and
+    all float values are stored in a single float64 array, so a chunk of
+    cycles pickles to roughly 8 bytes per value instead of a full dictionary
+    per cycle.
+
+    arguments:
+        cycle_data_list list of cycle dictionaries (see extract_cycle_data)
+
+    returns a (layouts, layout_ids, numbers, objects) tuple
+    '''
+    layouts = {}
+    layout_ids = []
+    numbers = []
+    objects = []
+    for cycle_data in cycle_data_list:
+        layout = _pack_dictionary(cycle_data, numbers, objects)
+        layout_ids.append(layouts.setdefault(layout, len(layouts)))
+    return (list(layouts.keys()), np.array(layout_ids, dtype=np.int32),
+            np.array(numbers, dtype=np.float64), objects)
+
+def unpack_cycle_data(packed_data):
+    '''
+    Rebuild the list of cycle dictionaries from pack_cycle_data
+
+    arguments:
+        packed_data a (layouts, layout_ids, numbers, objects) tuple
+    '''
+    layouts, layout_ids, numbers, objects = packed_data
+    numbers = iter(numbers.tolist())
+    objects = iter(objects)
+    return [_unpack_dictionary(layouts[layout_id], numbers, objects) for layout_id in layout_ids.tolist()]
@@ -0,0 +1,227 @@
+# ---------------------------*-python-*----------------------------------------#
+# file   parse_cache.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+'''
+Local cache of dictionaries parsed from raw output, tally and dump files
+
+Plot commands given raw files (-of, -tf or -df) parse them on every call.
+The cache stores each parsed dictionary under a key built from the files
+(their size and modification time, or a hash of their content), the parser
+and the parse options, so plotting the same files again loads the
+dictionary instead of parsing the files. The least recently used entries
+are removed once the cache grows past its size cap.
+
+.. autosummary::
+
+  default_cache_directory
+  parser_identity
+  parse_cache
+'''
+
+import os
+import pickle
+import hashlib
+import inspect
+
+from opppy.version import __version__
+from opppy.storage import save_pickle, load_pickle, lock_data
+
+CACHE_EXTENSION = '.p'
+DEFAULT_CACHE_SIZE = 1024*1024*1024
+
+def default_cache_directory():
+    '''
+    Return the default parse cache directory (the OPPPY_PARSE_CACHE
+    environment variable or opppy in the user cache directory)
+    '''
+    if 'OPPPY_PARSE_CACHE' in os.environ:
+        return os.environ['OPPPY_PARSE_CACHE']
+    cache_home = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(cache_home, 'opppy')
+
+def parser_identity(opppy_parser):
+    '''
+    Return a list of strings that identify a parser: its class, its version
+    attribute (if any), the size and modification time of the file that
+    defines the class and a hash of the parser attributes (i.e. values set by
+    pre_parse). Editing the parser invalidates its cache entries.
+
+    arguments:
+        opppy_parser a user defined OPPPY parser
+    '''
+    parser_class = type(opppy_parser)
+    identity = [parser_class.__module__, parser_class.__qualname__,
+                str(getattr(opppy_parser, 'version', getattr(opppy_parser, '__version__', None)))]
+    try:
+        source_stat = os.stat(inspect.getsourcefile(parser_class))
+        identity.extend([str(source_stat.st_size), str(source_stat.st_mtime_ns)])
+    except (TypeError, OSError):
+        pass
+    try:
+        identity.append(hashlib.sha256(pickle.dumps(vars(opppy_parser), protocol=4)).hexdigest())
+    except Exception:
+        # parsers with unpicklable attributes are identified by their class
+        pass
+    return identity
+
+class parse_cache():
+    '''
+    A size capped cache directory of parsed dictionaries with least recently
+    used eviction. Entries are written atomically, so several processes can
+    share a cache directory.
+
+    arguments:
+        directory the cache directory (default default_cache_directory())
+        max_size the cache size cap in bytes
+        hash_files key the files by a hash of their content instead of their
+            size and modification time
+    '''
+    def __init__(self, directory=None, max_size=DEFAULT_CACHE_SIZE, hash_files=False):
+        self.directory = directory if directory is not None else default_cache_directory()
+        self.max_size = max_size
+        self.hash_files = hash_files
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _file_stamp(self, file_name):
+        if self.hash_files:
+            file_hash = hashlib.sha256()
+            with open(file_name, 'rb') as raw_file:
+                for block in iter(lambda: raw_file.read(1024*1024), b''):
+                    file_hash.update(block)
+            # the file name is kept in the parsed data (i.e. appended_files)
+            return [os.path.basename(file_name), file_hash.hexdigest()]
+        file_stat = os.stat(file_name)
+        return [os.path.realpath(file_name), str(file_stat.st_size), str(file_stat.st_mtime_ns)]
+
+    def key(self, kind, file_names, opppy_parser, *options):
+        '''
+        Return the cache key of parsing a list of files
+
+        arguments:
+            kind the type of the parsed data (i.e. output, tally or dump)
+            file_names the list of parsed files
+            opppy_parser the parser used for the files
+            options parse options that change the result (i.e. key_words)
+        '''
+        key_hash = hashlib.sha256()
+        parts = [__version__, kind]+parser_identity(opppy_parser)+[repr(option) for option in options]
+        for file_name in file_names:
+            parts.extend(self._file_stamp(file_name))
+        for part in parts:
+            key_hash.update(part.encode()+b'\0')
+        return key_hash.hexdigest()
+
+    def _entry_name(self, key):
+        return os.path.join(self.directory, key+CACHE_EXTENSION)
+
+    def get(self, key):
+        '''
+        Return the cached data of a key (None if it is not cached)
+
+        arguments:
+            key the cache key
+        '''
+        entry_name = self._entry_name(key)
+        try:
+            data = load_pickle(entry_name)
+            # the modification time orders the entries for eviction
+            os.utime(entry_name)
+        except OSError:
+            self.misses += 1
+            return None
+        except (EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError):
+            # a truncated entry or one that refers to code that no longer
+            # exists is a miss and is removed, so it is parsed again
+            self.misses += 1
+            try:
+                os.remove(entry_name)
+            except OSError:
+                pass
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        '''
+        Cache the data of a key and evict the least recently used entries
+        beyond the size cap
+
+        arguments:
+            key the cache key
+            data the parsed data
+        '''
+        entry_name = self._entry_name(key)
+        try:
+            save_pickle(data, entry_name)
+        except (OSError, pickle.PicklingError, AttributeError, TypeError) as error:
+            print("Warning: the parsed data could not be cached -", error)
+            return
+        self.evict()
+
+    def entries(self):
+        '''
+        Return the (modification time, size, file name) of the cache entries
+        from the least to the most recently used
+        '''
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(CACHE_EXTENSION):
+                continue
+            entry_name = os.path.join(self.directory, name)
+            try:
+                entry_stat = os.stat(entry_name)
+            except OSError:
+                continue
+            entries.append((entry_stat.st_mtime_ns, entry_stat.st_size, entry_name))
+        return sorted(entries)
+
+    def evict(self):
+        '''
+        Remove the least recently used entries until the cache fits its size cap
+        '''
+        with lock_data(os.path.join(self.directory, 'cache')):
+            entries = self.entries()
+            size = sum(entry[1] for entry in entries)
+            for mtime, entry_size, entry_name in entries:
+                if size <= self.max_size:
+                    break
+                try:
+                    os.remove(entry_name)
+                except OSError:
+                    pass
+                size -= entry_size
+
+    def clear(self):
+        '''
+        Remove every cache entry
+        '''
+        with lock_data(os.path.join(self.directory, 'cache')):
+            for mtime, entry_size, entry_name in self.entries():
+                try:
+                    os.remove(entry_name)
+                except OSError:
+                    pass
+
+    def cached(self, kind, file_names, opppy_parser, build, *options):
+        '''
+        Return the cached data of parsing a list of files, or build and cache it
+
+        arguments:
+            kind the type of the parsed data (i.e. output, tally or dump)
+            file_names the list of parsed files
+            opppy_parser the parser used for the files
+            build a function without arguments that parses the files
+            options parse options that change the result (i.e. key_words)
+        '''
+        key = self.key(kind, file_names, opppy_parser, *options)
+        data = self.get(key)
+        if data is None:
+            data = build()
+            self.put(key, data)
+        return data
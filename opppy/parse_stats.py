@@ -0,0 +1,171 @@
+# ---------------------------*-python-*----------------------------------------#
+# file   parse_stats.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+'''
+Parse profiling statistics
+
+.. autosummary::
+
+  count_cycle_keys
+  stage_timer
+  parse_stats
+'''
+
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+
+def count_cycle_keys(cycle_data):
+    '''
+    Count the number of values produced by a parsed cycle dictionary
+
+    arguments:
+        cycle_data a cycle dictionary returned by a parse_cycle_string
+    '''
+    count = 0
+    for value in cycle_data.values():
+        if isinstance(value, dict):
+            count += len(value)
+        else:
+            count += 1
+    return count
+
+def stage_timer(stats, stage, file_name=None):
+    '''
+    Return a context manager that times its block into a stage of stats, or
+    does nothing when stats is None
+
+    arguments:
+        stats a parse_stats object or None
+        stage name of the stage
+        file_name optional file the time belongs to
+    '''
+    if stats is None:
+        return nullcontext()
+    return stats.timer(stage, file_name)
+
+class parse_stats():
+    '''
+    This class collects timing statistics for parsing output files. Every
+    cycle records the wall time of the user parse_cycle_string, the size of
+    the cycle string and the number of values produced. Each file records the
+    time spent in the OPPPY stages:
+        chunk  locating and reading the cycle strings
+        parse  the user parse_cycle_string calls
+        merge  appending the cycles to the data dictionary
+    and global stages (i.e. pickle, load or plot) are recorded without a file.
+    Times from parallel workers are summed, so they can exceed the wall time.
+    '''
+    def __init__(self):
+        self.cycles = []
+        self.files = {}
+        self.totals = {}
+
+    def _file(self, file_name):
+        if file_name not in self.files:
+            self.files[file_name] = {'cycles':0, 'bytes':0, 'keys':0}
+        return self.files[file_name]
+
+    def add_cycle(self, file_name, seconds, nbytes, nkeys):
+        '''
+        Record a single parsed cycle
+
+        arguments:
+            file_name the output file the cycle came from
+            seconds wall time of parse_cycle_string
+            nbytes size of the cycle string
+            nkeys number of values produced (see count_cycle_keys)
+        '''
+        self.cycles.append((file_name, seconds, nbytes, nkeys))
+        file_stats = self._file(file_name)
+        file_stats['cycles'] += 1
+        file_stats['bytes'] += nbytes
+        file_stats['keys'] += nkeys
+        self.add_time('parse', seconds, file_name)
+
+    def add_time(self, stage, seconds, file_name=None):
+        '''
+        Add time to a stage
+
+        arguments:
+            stage name of the stage (i.e. chunk, parse, merge, pickle)
+            seconds the time to add
+            file_name optional file the time belongs to
+        '''
+        if file_name is not None:
+            file_stats = self._file(file_name)
+            file_stats[stage] = file_stats.get(stage, 0.0) + seconds
+        self.totals[stage] = self.totals.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def timer(self, stage, file_name=None):
+        '''
+        Context manager that adds the wall time of its block to a stage
+        '''
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, perf_counter()-start, file_name)
+
+    def merge(self, other):
+        '''
+        Add the statistics collected by another parse_stats (i.e. from a
+        parallel worker)
+        '''
+        for cycle in other.cycles:
+            self.add_cycle(*cycle)
+        for file_name, file_stats in other.files.items():
+            for stage, seconds in file_stats.items():
+                if stage not in ('cycles', 'bytes', 'keys', 'parse'):
+                    self.add_time(stage, seconds, file_name)
+        for stage, seconds in other.totals.items():
+            if stage == 'parse':
+                continue
+            other_file_seconds = sum(file_stats.get(stage, 0.0) for file_stats in other.files.values())
+            if seconds > other_file_seconds:
+                self.add_time(stage, seconds-other_file_seconds)
+
+    def summary(self, nslowest=5):
+        '''
+        Return a printable summary of the statistics
+
+        arguments:
+            nslowest number of slowest cycles to list
+        '''
+        lines = []
+        lines.append("######################################################")
+        lines.append("#############      OPPPY PARSE PROFILE     ###########")
+        lines.append("######################################################")
+        total = sum(self.totals.values())
+        for stage, seconds in self.totals.items():
+            fraction = 100.0*seconds/total if total > 0.0 else 0.0
+            lines.append("%-10s %12.6f s %6.1f %%"%(stage, seconds, fraction))
+        if len(self.cycles) > 0:
+            parse_time = sum(cycle[1] for cycle in self.cycles)
+            nbytes = sum(cycle[2] for cycle in self.cycles)
+            lines.append("cycles parsed: %d (%.3e s/cycle, %.3f MB/s)"%(len(self.cycles),
+                parse_time/len(self.cycles), nbytes/parse_time/1.0e6 if parse_time > 0.0 else 0.0))
+        lines.append("######################################################")
+        for file_name, file_stats in self.files.items():
+            lines.append(file_name)
+            if file_stats['cycles'] > 0:
+                lines.append("  cycles %d bytes %d values %d"%(file_stats['cycles'], file_stats['bytes'], file_stats['keys']))
+            lines.append("  "+" ".join("%s %.6f s"%(stage, seconds) for stage, seconds in file_stats.items()
+                if stage not in ('cycles', 'bytes', 'keys')))
+        if len(self.cycles) > 0:
+            lines.append("######################################################")
+            lines.append("slowest cycles:")
+            for file_name, seconds, nbytes, nkeys in sorted(self.cycles, key=lambda cycle: cycle[1], reverse=True)[:nslowest]:
+                lines.append("  %.6f s %d bytes %d values -- %s"%(seconds, nbytes, nkeys, file_name))
+        lines.append("######################################################")
+        return "\n".join(lines)
+
+    def print_summary(self, nslowest=5):
+        '''
+        Print the summary of the statistics
+        '''
+        print(self.summary(nslowest))
@@ -134,16 +134,23 @@ class plot_dictionary():
                 if(args.data_file_name is not None):
                     outputfile = open(args.data_file_name+'_'+filename.split('/')[-1].strip('.p')+'.'+dictionary_name.replace(' ','_').replace('/','_').replace('#','num')+"."+re.sub(r'[^\w]','',yname)+'.dat', 'w')
                 xname = args.x_value_name
-                x = np.array(data[xname])*scale_x
-                y = np.array(data[yname])*scale_y
+                x = np.asarray(data[xname])*scale_x
+                y = np.asarray(data[yname])*scale_y
                 if args.last_time_value is not None:
-                    for time, x_value, y_value in zip(data['time'],data[xname],data[yname]):
-                        if value > last_time_value:
-                            last_y.append(y_value*scale_y)
-                            last_x.append(x_value*scale_x)
-                elif args.last_point_only:
-                    last_y.append(data[yname][-1]*scale_y)
-                    last_x.append(data[xname][-1]*scale_x)
+                    time = np.asarray(data['time'])
+                if hasattr(data, 'valid'):
+                    # columnar data only plots the cycles that reported both values
+                    valid = data.valid(xname) & data.valid(yname)
+                    if args.last_time_value is not None:
+                        valid = valid & data.valid('time')
+                        time = time[valid]
+                    x = x[valid]
+                    y = y[valid]
+                if args.last_time_value is not None:
+                    for time_value, x_value, y_value in zip(time, x, y):
+                        if time_value > args.last_time_value[0]:
+                            last_y.append(y_value)
+                            last_x.append(x_value)
     
                 if(args.data_file_name is not None):
                     if(args.x_label is not None):
@@ -207,7 +214,7 @@ class plot_dictionary():
                         if(temp_filename == filename):
                             data_line_color = line_color
         
-                if(args.last_point_only):
+                if(args.last_point_only and args.last_time_value is None):
                     if(len(x)>0):
                         last_x.append(x[-1])
                         last_y.append(y[-1])
@@ -0,0 +1,266 @@
+# ---------------------------*-python-*----------------------------------------#
+# file   shard.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+'''
+Shards of parsed data written by concurrent ingest processes
+
+Every ingest process writes the data it parsed to its own shard file in
+file_name.shards, so any number of processes can ingest into the same data
+file without waiting for each other. Readers merge the shards on top of the
+data file (see opppy.storage.load_data) and merge_shards folds them into the
+data file.
+
+.. autosummary::
+
+  shard_directory
+  shard_files
+  write_shard
+  read_shards
+  merge_shard
+  load_shard_data
+  merge_shards
+  append_output_shard
+  append_tally_shard
+  append_dump_shard
+'''
+
+import os
+import sys
+import socket
+import pickle
+import datetime
+
+from opppy.version import __version__
+from opppy.output import append_cycle_data_list, iter_output_cycle_data
+from opppy.storage import load_data, save_data, lock_data, atomic_file, data_compression
+from opppy.journal import journal_name
+from opppy.columnar import columnar_dictionary
+from opppy.migration import migration_path, migrate_data
+
+SHARD_EXTENSION = '.shard'
+
+def shard_directory(file_name):
+    '''
+    Return the shard directory of a data file
+    '''
+    return file_name+'.shards'
+
+def shard_files(file_name):
+    '''
+    Return the complete shard files of a data file (shards that are still
+    being written are not listed)
+
+    arguments:
+        file_name the data file name
+    '''
+    directory = shard_directory(file_name)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(SHARD_EXTENSION))
+
+def write_shard(file_name, shard):
+    '''
+    Write a new shard of a data file. The shard name is unique to the host,
+    process and time, and the file is renamed into place once it is complete.
+
+    arguments:
+        file_name the data file name
+        shard the shard dictionary (see append_output_shard)
+
+    returns:
+        the shard file name
+    '''
+    directory = shard_directory(file_name)
+    os.makedirs(directory, exist_ok=True)
+    name = datetime.datetime.now().strftime("%Y%m%d%H%M%S%f")+'-'+socket.gethostname()+'-'+str(os.getpid())
+    shard_name = os.path.join(directory, name+SHARD_EXTENSION)
+    count = 0
+    while os.path.exists(shard_name):
+        count += 1
+        shard_name = os.path.join(directory, name+'-'+str(count)+SHARD_EXTENSION)
+    shard['version'] = __version__
+    with atomic_file(shard_name) as temp_name, open(temp_name, 'wb') as shard_file:
+        pickle.dump(shard, shard_file, protocol=4)
+    return shard_name
+
+def _merge_order(shard):
+    '''
+    Cycle shards are merged in order of their first sort value, so restarts
+    are applied the same way no matter which process finished first
+    '''
+    if len(shard.get('cycles', [])) == 0:
+        return (1, 0.0)
+    return (0, shard['cycles'][0]['cycle_info'][shard['sort_key_string']])
+
+def read_shards(file_name, shard_names=None):
+    '''
+    Read the shards of a data file in merge order
+
+    arguments:
+        file_name the data file name
+        shard_names optional list of shard files to read (default shard_files)
+    '''
+    if shard_names is None:
+        shard_names = shard_files(file_name)
+    shards = []
+    for shard_name in shard_names:
+        with open(shard_name, 'rb') as shard_file:
+            shards.append(pickle.load(shard_file))
+    # sorted is stable, so shards without cycles keep their (time) order
+    return sorted(shards, key=_merge_order)
+
+def merge_shard(data, shard):
+    '''
+    Merge a shard into a data dictionary. Output and tally cycles are
+    appended with the same restart rules as append_data and dump
+    dictionaries are added to the data.
+
+    arguments:
+        data the OPPPY dictionary to merge into
+        shard the shard dictionary
+    '''
+    if migration_path(shard['version']) is None:
+        print("Error: shard does not match this version of OPPPY")
+        print("The shard was build with version", shard['version'])
+        print("This version of OPPPY is ", __version__)
+        sys.exit(0)
+    if shard['type'] == 'dump' and shard['version'] != __version__:
+        # cycle shards are appended with the layout of this version, but dump
+        # shards hold stored dump dictionaries
+        shard['data']['version'] = shard['version']
+        migrate_data(shard['data'])
+        del shard['data']['version']
+    if len(shard.get('appended_files', [])) > 0:
+        if 'appended_files' in data:
+            data['appended_files'].extend(shard['appended_files'])
+        else:
+            data['appended_files'] = list(shard['appended_files'])
+    if shard['type'] == 'output':
+        # match append_output_dictionary, which keeps existing columnar data columnar
+        columnar = shard['columnar'] or any(isinstance(value, columnar_dictionary) for value in data.values())
+        data = append_cycle_data_list(shard['cycles'], data, shard['sort_key_string'], columnar)
+    elif shard['type'] == 'tally':
+        from opppy.tally import append_tally_data
+        checked = {}
+        for cycle_data in shard['cycles']:
+            data = append_tally_data(cycle_data, data, shard['sort_key_string'], checked)
+    else:
+        data.update(shard['data'])
+    return data
+
+def load_shard_data(file_name, journal=True):
+    '''
+    Load a data file (and its journal) and merge its shards
+
+    arguments:
+        file_name the data file name
+        journal replay the data file journal before merging the shards
+    '''
+    if os.path.exists(file_name) or (journal and os.path.isfile(journal_name(file_name))):
+        data = load_data(file_name, journal=journal, shards=False, migrate=True)
+    else:
+        data = {}
+        data['version'] = __version__
+    for shard in read_shards(file_name):
+        data = merge_shard(data, shard)
+    return data
+
+def merge_shards(file_name, update_function=None, compression=None):
+    '''
+    Merge the shards (and the journal) of a data file into the data file and
+    remove them. Shards written while the merge runs are left for the next
+    merge.
+
+    arguments:
+        file_name the data file name
+        update_function optional function called with the merged data before
+            it is saved (i.e. a post_parse hook)
+        compression optional compression of the data file (by default the
+            data file keeps its compression, see opppy.storage.COMPRESSIONS)
+    '''
+    with lock_data(file_name):
+        shard_names = shard_files(file_name)
+        if compression is None:
+            compression = data_compression(file_name)
+        if os.path.exists(file_name) or os.path.isfile(journal_name(file_name)):
+            data = load_data(file_name, shards=False, migrate=True)
+        else:
+            data = {}
+            data['version'] = __version__
+        for shard in read_shards(file_name, shard_names):
+            data = merge_shard(data, shard)
+        if update_function is not None:
+            update_function(data)
+        save_data(data, file_name, compression=compression)
+        if os.path.isfile(journal_name(file_name)):
+            os.remove(journal_name(file_name))
+        for shard_name in shard_names:
+            os.remove(shard_name)
+    return data
+
+def _cycle_shard(shard_type, output_files, opppy_parser, append_date=False, nthreads=0, columnar=False, stats=None):
+    time = ''
+    if append_date:
+      time = time+'.'+datetime.datetime.now().strftime ("%Y%m%d%H%M%S")
+    print('')
+    print("Number of files to be read: ", len(output_files))
+    cycles = [cycle_data for output_file, cycle_data in iter_output_cycle_data(output_files, opppy_parser, nthreads, stats=stats)]
+    return {'type':shard_type, 'sort_key_string':opppy_parser.sort_key_string, 'columnar':columnar, 'cycles':cycles,
+            'appended_files':[output_file.split('/')[-1]+time for output_file in output_files]}
+
+def append_output_shard(file_name, output_files, opppy_parser, append_date=False, nthreads=0, columnar=False, stats=None):
+    '''
+    Parse a list of output files into a new shard of a data file
+
+    arguments:
+        file_name the data file name
+        output_files a list of output files to parse
+        opppy_parser a user defined OPPPY parser for the output files
+        append_date bool to specify if the data should be appended to the file
+            name for tracking purposes
+        nthreads number of worker processes (-1 nthreads=cpu_count, 0 serial)
+        columnar bool to store new dictionaries as columnar_dictionary NumPy columns
+        stats optional parse_stats object to record the chunk and parse times
+    '''
+    shard = _cycle_shard('output', output_files, opppy_parser, append_date, nthreads, columnar, stats)
+    shard_name = write_shard(file_name, shard)
+    print('')
+    print('')
+    print("Wrote", len(shard['cycles']), "cycles to", shard_name)
+    return shard_name
+
+def append_tally_shard(file_name, tally_files, opppy_parser, append_date=False, nthreads=0):
+    '''
+    Parse a list of tally files into a new shard of a data file
+
+    arguments:
+        file_name the data file name
+        tally_files a list of tally files to parse
+        opppy_parser a user defined OPPPY tally parser for the tally files
+        append_date bool to specify if the data should be appended to the file
+            name for tracking purposes
+        nthreads number of worker processes (-1 nthreads=cpu_count, 0 serial)
+    '''
+    shard = _cycle_shard('tally', tally_files, opppy_parser, append_date, nthreads)
+    shard_name = write_shard(file_name, shard)
+    print('')
+    print('')
+    print("Wrote", len(shard['cycles']), "tally cycles to", shard_name)
+    return shard_name
+
+def append_dump_shard(file_name, dumps):
+    '''
+    Write a dictionary of parsed dump dictionaries (see
+    opppy.dump_utils.append_dumps) to a new shard of a data file
+
+    arguments:
+        file_name the data file name
+        dumps dictionary of dump dictionaries
+    '''
+    shard_name = write_shard(file_name, {'type':'dump', 'data':{key:value for key, value in dumps.items() if key != 'version'}})
+    print("Wrote", len(dumps)-('version' in dumps), "dumps to", shard_name)
+    return shard_name
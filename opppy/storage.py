@@ -0,0 +1,1351 @@
+# ---------------------------*-python-*----------------------------------------#
+# file   storage.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+'''
+Storage backends for OPPPY output, tally and dump dictionaries
+
+.. autosummary::
+
+  lock_data
+  atomic_file
+  is_hdf5_file
+  write_hdf5_value
+  read_hdf5_value
+  extend_hdf5_series
+  open_hdf5
+  check_hdf5_compression
+  save_hdf5
+  load_hdf5
+  hdf5_keys
+  is_split_pickle_file
+  save_split_pickle
+  load_split_pickle
+  is_npy_directory
+  save_npy_directory
+  load_npy_directory
+  lazy_dictionary
+  lazy_columnar_dictionary
+  lazy_list
+  save_pickle
+  load_pickle
+  data_compression
+  restore_shuffled
+  save_data
+  load_data
+  load_data_list
+  benchmark_compression
+'''
+
+import os
+import sys
+import struct
+import pickle
+import zlib
+import gzip
+import lzma
+import uuid
+import shutil
+from urllib.parse import quote
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from time import perf_counter
+from collections.abc import MutableMapping, Sequence
+import numpy as np
+
+from opppy.columnar import columnar_dictionary
+
+try:
+    import fcntl
+except ImportError:
+    # no advisory locks (i.e. Windows), saves are still atomic
+    fcntl = None
+
+HDF5_MAGIC = b'\x89HDF\r\n\x1a\n'
+HDF5_EXTENSIONS = ('.h5', '.hdf5', '.hdf')
+# group of values being rewritten (escaped keys never start with a bare %)
+HDF5_STAGING = '%staging'
+SPLIT_PICKLE_MAGIC = b'OPPPYSPK'
+SPLIT_PICKLE_END = b'OPPPYEND'
+SPLIT_PICKLE_EXTENSIONS = ('.opp',)
+NPY_DIRECTORY_INDEX = 'opppy_index.p'
+NPY_DIRECTORY_EXTENSIONS = ('.npyd',)
+COMPRESSED_PICKLE_MAGIC = b'OPPPYCMP'
+COMPRESSIONS = ('none', 'zlib', 'lzma', 'zlib+shuffle', 'lzma+shuffle')
+
+# split pickle trailer: table of contents offset, crc32 and SPLIT_PICKLE_END
+_split_trailer = struct.Struct('<QI8s')
+
+# locks held by this process: lock file name -> [file descriptor, depth]
+_held_locks = {}
+
+@contextmanager
+def lock_data(file_name):
+    '''
+    Context manager that holds an exclusive lock on an OPPPY data file while
+    it is loaded, updated and saved, so concurrent appends (i.e. two cron
+    jobs) are applied one after the other instead of overwriting each other.
+    The lock is an advisory flock of file_name.lock and can be nested within
+    a process.
+
+    arguments:
+        file_name the data file name
+    '''
+    lock_name = os.path.abspath(file_name)+'.lock'
+    if fcntl is None:
+        yield
+        return
+    if lock_name in _held_locks:
+        _held_locks[lock_name][1] += 1
+        try:
+            yield
+        finally:
+            _held_locks[lock_name][1] -= 1
+        return
+    lock_file = os.open(lock_name, os.O_RDWR | os.O_CREAT, 0o666)
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        _held_locks[lock_name] = [lock_file, 1]
+        try:
+            yield
+        finally:
+            del _held_locks[lock_name]
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+    finally:
+        os.close(lock_file)
+
+@contextmanager
+def atomic_file(file_name):
+    '''
+    Context manager that yields a temporary file name next to file_name and
+    renames it over file_name when the block succeeds. Readers see either the
+    old or the new file, never a partially written one.
+
+    arguments:
+        file_name the file name to replace
+    '''
+    temp_name = file_name+'.'+uuid.uuid4().hex[:8]+'.tmp'
+    try:
+        yield temp_name
+        if os.path.isfile(file_name):
+            os.chmod(temp_name, os.stat(file_name).st_mode & 0o7777)
+        os.replace(temp_name, file_name)
+    finally:
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+
+def _split_compression(compression):
+    '''
+    Split a compression name (see COMPRESSIONS) into its codec (None for no
+    compression) and byte shuffle flag
+    '''
+    if compression is None or compression == 'none':
+        return None, False
+    if compression not in COMPRESSIONS:
+        print("Error: unknown compression", compression)
+        print("Available compressions are", COMPRESSIONS)
+        sys.exit(0)
+    codec, plus, shuffle = compression.partition('+')
+    return codec, shuffle == 'shuffle'
+
+def _compress(data, codec):
+    if codec == 'zlib':
+        return zlib.compress(data, 6)
+    if codec == 'lzma':
+        return lzma.compress(data)
+    return data
+
+def _decompress(data, codec):
+    if codec == 'zlib':
+        return zlib.decompress(data)
+    if codec == 'lzma':
+        return lzma.decompress(data)
+    return data
+
+def _codec_file(data_file, codec, mode):
+    '''
+    Wrap an open file in a streaming compressor or decompressor
+    '''
+    if codec == 'zlib':
+        return gzip.GzipFile(fileobj=data_file, mode=mode, compresslevel=6)
+    return lzma.LZMAFile(data_file, mode)
+
+def _shuffle_bytes(values):
+    '''
+    Byte shuffle an array (the first byte of every value, then the second
+    byte, ...) so the similar exponent bytes of floats compress together
+    '''
+    values = np.ascontiguousarray(values)
+    return values.view(np.uint8).reshape(-1, values.dtype.itemsize).T.tobytes()
+
+def _unshuffle_bytes(data, dtype):
+    dtype = np.dtype(dtype)
+    return np.frombuffer(data, dtype=np.uint8).reshape(dtype.itemsize, -1).T.copy().view(dtype).reshape(-1)
+
+def _restore_list(dtype, data, int_positions):
+    values = _unshuffle_bytes(data, dtype).tolist()
+    for index in int_positions:
+        values[index] = int(values[index])
+    return values
+
+def _restore_array(dtype, shape, data):
+    return _unshuffle_bytes(data, dtype).reshape(shape)
+
+def _restore_columnar(state):
+    columns = columnar_dictionary.__new__(columnar_dictionary)
+    columns.__setstate__(state)
+    return columns
+
+# byte shuffled data formats: (tag, version) -> function that restores the
+# value from the raw shuffled data. Shuffled values are pickled as a call to
+# restore_shuffled, so the restore functions can change without breaking
+# stored files.
+SHUFFLE_FORMATS = {
+    ('list', 1): _restore_list,
+    ('array', 1): _restore_array,
+    ('columnar', 1): _restore_columnar,
+}
+SHUFFLE_FORMAT_VERSION = 1
+
+def restore_shuffled(tag, version, *args):
+    '''
+    Restore a byte shuffled value from its format tag, format version and
+    raw data (see SHUFFLE_FORMATS). This is called by pickle.load.
+
+    arguments:
+        tag the data format (i.e. 'list', 'array' or 'columnar')
+        version the data format version
+        args the raw data of the format
+    '''
+    if (tag, version) not in SHUFFLE_FORMATS:
+        print("Error: unknown shuffled data format", tag, "version", version)
+        print("The data was probably written by a newer version of OPPPY")
+        sys.exit(0)
+    return SHUFFLE_FORMATS[(tag, version)](*args)
+
+class _shuffled():
+    '''
+    Pickles as a restore_shuffled call with a format tag and raw byte
+    shuffled data, so shuffled files load with a plain pickle.load
+    '''
+    def __init__(self, tag, args):
+        self.tag = tag
+        self.args = args
+
+    def __reduce__(self):
+        return (restore_shuffled, (self.tag, SHUFFLE_FORMAT_VERSION)+self.args)
+
+def _shuffle_list(values):
+    '''
+    Byte shuffle a list of floats and/or ints (ints in a float list, i.e. back
+    filled zeros, are restored as ints)
+    '''
+    types = set(map(type, values))
+    int_positions = ()
+    try:
+        if types == {float}:
+            array = np.array(values, dtype=np.float64)
+        elif types == {int}:
+            array = np.array(values, dtype=np.int64)
+        elif types == {int, float}:
+            int_positions = [index for index, value in enumerate(values) if type(value) is int]
+            if any(abs(values[index]) >= 2**53 for index in int_positions):
+                return values
+            array = np.array(values, dtype=np.float64)
+        else:
+            return values
+    except OverflowError:
+        return values
+    return _shuffled('list', (array.dtype.str, _shuffle_bytes(array), int_positions))
+
+def _shuffle_value(value):
+    '''
+    Replace the numeric lists and arrays of an OPPPY dictionary with byte
+    shuffled data
+    '''
+    if type(value) is dict:
+        return {key:_shuffle_value(sub_value) for key, sub_value in value.items()}
+    if type(value) is tuple:
+        return tuple(_shuffle_value(sub_value) for sub_value in value)
+    if type(value) is list:
+        if len(value) < 16:
+            return [_shuffle_value(item) for item in value] if any(type(item) is dict for item in value) else value
+        if type(value[0]) is dict:
+            return [_shuffle_value(item) for item in value]
+        return _shuffle_list(value)
+    if isinstance(value, columnar_dictionary):
+        return _shuffled('columnar', (_shuffle_value(value.__getstate__()),))
+    if type(value) is np.ndarray and value.dtype.kind in 'iuf' and value.dtype.itemsize > 1 and value.size >= 16:
+        return _shuffled('array', (value.dtype.str, value.shape, _shuffle_bytes(value)))
+    return value
+
+def _import_h5py():
+    '''
+    Import h5py only when an HDF5 file is used
+    '''
+    try:
+        import h5py
+    except ImportError:
+        print("Error: h5py is required to read or write HDF5 OPPPY files")
+        sys.exit(0)
+    return h5py
+
+def _file_magic(file_name, size=8):
+    '''
+    Return the first size bytes of a file (empty if it does not exist)
+    '''
+    try:
+        with open(file_name, 'rb') as data_file:
+            return data_file.read(size)
+    except OSError:
+        return b''
+
+def _file_extension(file_name):
+    return os.path.splitext(file_name)[1].lower()
+
+def is_hdf5_file(file_name):
+    '''
+    Check if a file is (or, for a new file, should be written as) an HDF5 file.
+    Existing files are identified by their signature and new files by their
+    extension.
+
+    arguments:
+        file_name the file name to check
+    '''
+    if os.path.isfile(file_name):
+        return _file_magic(file_name) == HDF5_MAGIC
+    return _file_extension(file_name) in HDF5_EXTENSIONS
+
+def _hdf5_name(key):
+    '''
+    Escape a dictionary key for use as an HDF5 group or dataset name
+    '''
+    return key.replace('%','%25').replace('/','%2F').replace('.','%2E') if key in ('.','..') or '/' in key or '%' in key else key
+
+def _dictionary_key(name):
+    '''
+    Undo _hdf5_name
+    '''
+    return name.replace('%2E','.').replace('%2F','/').replace('%25','%') if '%' in name else name
+
+def _is_number(value):
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, (bool, np.bool_))
+
+def _write_blob(group, name, value):
+    dataset = group.create_dataset(name, data=np.void(pickle.dumps(value)))
+    dataset.attrs['opppy_type'] = 'pickle'
+    return dataset
+
+# smallest numeric dataset (bytes) worth compressing in HDF5 files
+_hdf5_min_compress = 4096
+
+def check_hdf5_compression(compression):
+    '''
+    Exit with an error if a compression (see COMPRESSIONS) can not be used
+    for HDF5 files, which only have the gzip (zlib) and shuffle filters
+
+    arguments:
+        compression the compression name (None for no compression)
+    '''
+    if _split_compression(compression)[0] == 'lzma':
+        print("Error: lzma compression is not available for HDF5 files")
+        sys.exit(0)
+
+def _hdf5_filters(group, data):
+    '''
+    Return the h5py dataset filters for the compression of the file holding
+    group (see save_hdf5). Only numeric array datasets are compressed, and
+    datasets smaller than _hdf5_min_compress bytes are left alone because the
+    filter and chunk overhead outweighs the savings.
+    '''
+    codec, shuffle = _split_compression(group.file.attrs.get('opppy_compression', 'none'))
+    if codec is None or np.ndim(data) == 0:
+        return {}
+    data = np.asarray(data)
+    if data.dtype.kind not in 'biuf' or data.nbytes < _hdf5_min_compress:
+        return {}
+    return {'compression':'gzip', 'shuffle':shuffle}
+
+def write_hdf5_value(group, key, value):
+    '''
+    Write a dictionary value into an HDF5 group. Dictionaries become groups,
+    lists of numbers or strings and numeric arrays become datasets (lists are
+    resizable so they can be extended in place) and anything else is stored as
+    a pickled blob.
+
+    arguments:
+        group the h5py group to write into
+        key the dictionary key of the value
+        value the value to write
+    '''
+    h5py = _import_h5py()
+    name = _hdf5_name(key)
+    if isinstance(value, columnar_dictionary):
+        sub_group = group.create_group(name, track_order=True)
+        sub_group.attrs['opppy_type'] = 'columnar'
+        valid_group = sub_group.create_group('%valid', track_order=True)
+        for sub_key in value:
+            column = value[sub_key]
+            if column.dtype.kind in 'biuf':
+                sub_group.create_dataset(_hdf5_name(sub_key), data=column, maxshape=(None,), chunks=True, **_hdf5_filters(group, column))
+            else:
+                _write_blob(sub_group, _hdf5_name(sub_key), column)
+            valid_group.create_dataset(_hdf5_name(sub_key), data=value.valid(sub_key), maxshape=(None,), chunks=True, **_hdf5_filters(group, value.valid(sub_key)))
+        return sub_group
+    if isinstance(value, dict):
+        if not all(isinstance(sub_key, str) for sub_key in value):
+            return _write_blob(group, name, value)
+        sub_group = group.create_group(name, track_order=True)
+        sub_group.attrs['opppy_type'] = 'dict'
+        for sub_key, sub_value in value.items():
+            write_hdf5_value(sub_group, sub_key, sub_value)
+        return sub_group
+    if isinstance(value, list):
+        if len(value) > 0 and all(isinstance(item, dict) for item in value):
+            sub_group = group.create_group(name, track_order=True)
+            sub_group.attrs['opppy_type'] = 'dict_list'
+            for index, item in enumerate(value):
+                write_hdf5_value(sub_group, str(index), item)
+            return sub_group
+        try:
+            if all(isinstance(item, str) for item in value) and len(value) > 0:
+                data = np.array(value, dtype=h5py.string_dtype())
+            elif all(_is_number(item) for item in value):
+                data = np.array(value, dtype=np.int64 if all(isinstance(item, (int, np.integer)) for item in value) else np.float64)
+            else:
+                return _write_blob(group, name, value)
+        except OverflowError:
+            return _write_blob(group, name, value)
+        dataset = group.create_dataset(name, data=data, maxshape=(None,), chunks=True, **_hdf5_filters(group, data))
+        dataset.attrs['opppy_type'] = 'list'
+        return dataset
+    if isinstance(value, np.ndarray) and value.dtype.kind in 'biufc':
+        filters = _hdf5_filters(group, value)
+        if len(filters) > 0:
+            filters['chunks'] = True
+        dataset = group.create_dataset(name, data=value, **filters)
+        dataset.attrs['opppy_type'] = 'ndarray'
+        return dataset
+    if isinstance(value, str):
+        dataset = group.create_dataset(name, data=value, dtype=h5py.string_dtype())
+        dataset.attrs['opppy_type'] = 'str'
+        return dataset
+    if isinstance(value, (bool, int, float)) and not (isinstance(value, int) and abs(value) >= 2**63):
+        dataset = group.create_dataset(name, data=value)
+        dataset.attrs['opppy_type'] = type(value).__name__
+        return dataset
+    if isinstance(value, np.generic) and value.dtype.kind in 'biufc':
+        dataset = group.create_dataset(name, data=value)
+        dataset.attrs['opppy_type'] = 'numpy'
+        return dataset
+    return _write_blob(group, name, value)
+
+def read_hdf5_value(node):
+    '''
+    Read a value written by write_hdf5_value
+
+    arguments:
+        node the h5py group or dataset to read
+    '''
+    opppy_type = node.attrs.get('opppy_type', 'ndarray')
+    if opppy_type == 'dict':
+        return {_dictionary_key(name):read_hdf5_value(child) for name, child in node.items()}
+    if opppy_type == 'dict_list':
+        return [read_hdf5_value(node[str(index)]) for index in range(len(node))]
+    if opppy_type == 'columnar':
+        columns = columnar_dictionary()
+        valid_group = node['%valid']
+        for name, child in node.items():
+            if name == '%valid':
+                continue
+            column = read_hdf5_value(child) if child.attrs.get('opppy_type') == 'pickle' else child[()]
+            columns._length = len(column)
+            columns._capacity = max(len(column), 1)
+            columns._columns[_dictionary_key(name)] = np.array(column)
+            columns._valid[_dictionary_key(name)] = valid_group[name][()].astype(bool)
+        return columns
+    if opppy_type == 'pickle':
+        return pickle.loads(node[()].tobytes())
+    if opppy_type == 'list':
+        if node.dtype.kind == 'O':
+            return list(node.asstr()[()])
+        return node[()].tolist()
+    if opppy_type == 'str':
+        return node.asstr()[()]
+    if opppy_type in ('bool', 'int', 'float'):
+        return node[()].item()
+    return node[()]
+
+def extend_hdf5_series(group, key, series, sort_key_string, sort_value=None, columnar=False):
+    '''
+    Extend a stored series (a dictionary of lists or a columnar_dictionary) in
+    place with the rows of a new series. Stored rows at or beyond sort_value
+    are dropped with the same rule as append_data, datasets missing from the
+    new series are extended with zeros, and new keys are back filled with
+    zeros. Only the stored sort values are read.
+
+    arguments:
+        group the h5py group holding the series group
+        key the dictionary key of the series
+        series the new rows
+        sort_key_string the key of the sort values in the series
+        sort_value drop the stored rows at or beyond this value (default the
+            first sort value of the new series)
+        columnar write a new series as a columnar group
+    '''
+    name = _hdf5_name(key)
+    if name not in group:
+        if isinstance(series, columnar_dictionary) and not columnar:
+            series = series.to_dict()
+        write_hdf5_value(group, key, series)
+        return
+    series_group = group[name]
+    if sort_value is None:
+        sort_value = series[sort_key_string][0]
+    length = int(np.searchsorted(series_group[_hdf5_name(sort_key_string)][()], sort_value, side='left'))
+    columnar = series_group.attrs.get('opppy_type') == 'columnar'
+    nrows = len(next(iter(series.values()))) if len(series) > 0 else 0
+    columns = {}
+    valid = {}
+    for sub_key in series:
+        columns[sub_key] = np.asarray(series[sub_key])
+        valid[sub_key] = series.valid(sub_key) if isinstance(series, columnar_dictionary) else np.ones(nrows, dtype=bool)
+    stored_keys = [_dictionary_key(sub_name) for sub_name in series_group if sub_name != '%valid']
+    for sub_key in stored_keys+[sub_key for sub_key in columns if sub_key not in stored_keys]:
+        sub_name = _hdf5_name(sub_key)
+        if sub_key in columns:
+            values = columns[sub_key]
+            values_valid = valid[sub_key]
+        else:
+            values = np.zeros(nrows, dtype=np.int64)
+            values_valid = np.zeros(nrows, dtype=bool)
+        if sub_name in series_group:
+            _extend_dataset(series_group, sub_key, length, values)
+        else:
+            _extend_dataset(series_group, sub_key, 0, np.concatenate((np.zeros(length, dtype=np.int64), values)) if values.dtype.kind != 'O' else [0]*length+list(values))
+        if columnar:
+            valid_group = series_group['%valid']
+            if sub_name in valid_group:
+                dataset = valid_group[sub_name]
+                dataset.resize((length+nrows,))
+                dataset[length:] = values_valid
+            else:
+                valid_group.create_dataset(sub_name, data=np.concatenate((np.zeros(length, dtype=bool), values_valid)), maxshape=(None,), chunks=True, **_hdf5_filters(valid_group, values_valid))
+
+def _extend_dataset(group, key, length, values):
+    '''
+    Truncate a stored list (or column) to length and append values, promoting
+    the stored type when needed
+    '''
+    name = _hdf5_name(key)
+    if name not in group:
+        if isinstance(values, np.ndarray) and values.dtype.kind in 'biuf':
+            dataset = group.create_dataset(name, data=values, maxshape=(None,), chunks=True, **_hdf5_filters(group, values))
+            if group.attrs.get('opppy_type') != 'columnar':
+                dataset.attrs['opppy_type'] = 'list'
+        elif group.attrs.get('opppy_type') == 'columnar':
+            _write_blob(group, name, np.array(list(values), dtype=object))
+        else:
+            write_hdf5_value(group, key, list(values))
+        return
+    dataset = group[name]
+    values = np.asarray(values)
+    if dataset.attrs.get('opppy_type', 'list') == 'list' and dataset.dtype.kind in 'biuf' and values.dtype.kind in 'biuf':
+        dtype = np.promote_types(dataset.dtype, values.dtype)
+        if dtype == dataset.dtype:
+            dataset.resize((length+len(values),))
+            dataset[length:] = values
+            return
+        stored = dataset[:length]
+        opppy_type = dataset.attrs.get('opppy_type')
+        del group[name]
+        dataset = group.create_dataset(name, data=np.concatenate((stored, values)).astype(dtype), maxshape=(None,), chunks=True, **_hdf5_filters(group, values))
+        if opppy_type is not None:
+            dataset.attrs['opppy_type'] = opppy_type
+        return
+    # strings and objects are rewritten
+    stored = read_hdf5_value(dataset)
+    del group[name]
+    if group.attrs.get('opppy_type') == 'columnar':
+        _write_blob(group, name, np.array(list(stored[:length])+list(values), dtype=object))
+    else:
+        write_hdf5_value(group, key, list(stored[:length])+values.tolist())
+
+def save_hdf5(data, file_name, keys=None, compression=None):
+    '''
+    Save an OPPPY dictionary to an HDF5 file with one group per dictionary and
+    one dataset per series.
+
+    arguments:
+        data the OPPPY dictionary to save
+        file_name the HDF5 file name
+        keys optional list of top level keys to (re)write in an existing file.
+            The other stored keys are left untouched. The file is updated in
+            place, which is not atomic (see save_data).
+        compression optional compression of the numeric datasets ('zlib' or
+            'zlib+shuffle' which use the HDF5 gzip and shuffle filters)
+    '''
+    h5py = _import_h5py()
+    check_hdf5_compression(compression)
+    if keys is None or not os.path.isfile(file_name):
+        keys = list(data.keys())
+        mode = 'w'
+    else:
+        keys = list(keys)
+        if 'version' in data and 'version' not in keys:
+            keys.append('version')
+        mode = 'a'
+    if mode == 'w':
+        # new files are written next to the old one and renamed over it
+        with atomic_file(file_name) as temp_name:
+            with h5py.File(temp_name, mode, track_order=True) as hdf5_file:
+                hdf5_file.attrs['opppy_compression'] = compression or 'none'
+                for key in keys:
+                    write_hdf5_value(hdf5_file, key, data[key])
+        return
+    with h5py.File(file_name, mode, track_order=True) as hdf5_file:
+        if compression is not None:
+            hdf5_file.attrs['opppy_compression'] = compression
+        # the new values are written to a staging group and then moved over
+        # the old ones, so a failed write leaves the old values
+        if HDF5_STAGING in hdf5_file:
+            del hdf5_file[HDF5_STAGING]
+        staging = hdf5_file.create_group(HDF5_STAGING)
+        try:
+            for key in keys:
+                if key in data:
+                    write_hdf5_value(staging, key, data[key])
+            for key in keys:
+                name = _hdf5_name(key)
+                if name in hdf5_file:
+                    del hdf5_file[name]
+                if key in data:
+                    hdf5_file.move(HDF5_STAGING+'/'+name, name)
+        finally:
+            del hdf5_file[HDF5_STAGING]
+
+def load_hdf5(file_name, keys=None):
+    '''
+    Load an OPPPY dictionary from an HDF5 file
+
+    arguments:
+        file_name the HDF5 file name
+        keys optional list of top level keys to load (the version is always loaded)
+    '''
+    h5py = _import_h5py()
+    data = {}
+    with h5py.File(file_name, 'r') as hdf5_file:
+        for name, node in hdf5_file.items():
+            if name == HDF5_STAGING:
+                continue
+            key = _dictionary_key(name)
+            if keys is None or key in keys or key == 'version':
+                data[key] = read_hdf5_value(node)
+    return data
+
+def open_hdf5(file_name, mode='r'):
+    '''
+    Open an HDF5 file for direct access (i.e. extend_hdf5_series)
+
+    arguments:
+        file_name the HDF5 file name
+        mode the h5py file mode
+    '''
+    h5py = _import_h5py()
+    return h5py.File(file_name, mode, track_order=True)
+
+def hdf5_keys(file_name):
+    '''
+    Return the top level keys stored in an HDF5 file
+    '''
+    h5py = _import_h5py()
+    with h5py.File(file_name, 'r') as hdf5_file:
+        return [_dictionary_key(name) for name in hdf5_file if name != HDF5_STAGING]
+
+def is_split_pickle_file(file_name):
+    '''
+    Check if a file is (or, for a new file, should be written as) a split
+    pickle file (see save_split_pickle)
+
+    arguments:
+        file_name the file name to check
+    '''
+    if os.path.isfile(file_name):
+        return _file_magic(file_name, len(SPLIT_PICKLE_MAGIC)) == SPLIT_PICKLE_MAGIC
+    return _file_extension(file_name) in SPLIT_PICKLE_EXTENSIONS
+
+def _write_record(data_file, value, compression=None):
+    '''
+    Pickle (and optionally compress) a value at the end of a split pickle
+    file and return its record
+    '''
+    codec, shuffle = _split_compression(compression)
+    offset = data_file.tell()
+    if codec is None:
+        pickle.dump(value, data_file, protocol=4)
+        return ('record', offset, data_file.tell()-offset)
+    if shuffle:
+        value = _shuffle_value(value)
+    data_file.write(_compress(pickle.dumps(value, protocol=4), codec))
+    return ('record', offset, data_file.tell()-offset, compression)
+
+def _write_entry(data_file, value, depth=0, compression=None):
+    '''
+    Write a value as one or more records and return its table of contents
+    entry. Dictionaries (and lists of dictionaries i.e. tally cycles) are
+    split into a record per item down to the series level.
+    '''
+    if depth < 2 and isinstance(value, columnar_dictionary):
+        return ('columnar', {key:_write_record(data_file, (value[key], np.packbits(value.valid(key)), len(value[key])), compression)
+            for key in value})
+    if depth < 2 and isinstance(value, dict) and all(isinstance(key, str) for key in value):
+        return ('dict', {key:_write_entry(data_file, sub_value, depth+1, compression) for key, sub_value in value.items()})
+    if depth == 0 and isinstance(value, list) and len(value) > 0 and all(isinstance(item, dict) for item in value):
+        return ('list', [_write_record(data_file, item, compression) for item in value])
+    return _write_record(data_file, value, compression)
+
+def _read_record(file_name, entry):
+    with open(file_name, 'rb') as data_file:
+        data_file.seek(entry[1])
+        data = data_file.read(entry[2])
+    if len(entry) > 3:
+        data = _decompress(data, _split_compression(entry[3])[0])
+    return pickle.loads(data)
+
+def _read_entry(file_name, entry, lazy=False):
+    '''
+    Read a table of contents entry as a value (or a lazy view of the value)
+    '''
+    if entry[0] == 'record':
+        return _read_record(file_name, entry)
+    if entry[0] == 'columnar':
+        columns = lazy_columnar_dictionary(list(entry[1]), lambda key: _read_record(file_name, entry[1][key]))
+    elif entry[0] == 'dict':
+        columns = lazy_dictionary(list(entry[1]), lambda key: _read_entry(file_name, entry[1][key], lazy))
+    else:
+        columns = lazy_list(len(entry[1]), lambda index: _read_record(file_name, entry[1][index]))
+    return columns if lazy else columns.load()
+
+def _write_toc(data_file, toc):
+    '''
+    Write a table of contents and the trailer that points to it (its offset,
+    its crc32 and SPLIT_PICKLE_END) at the current position of a split pickle
+    file
+    '''
+    toc_offset = data_file.tell()
+    payload = pickle.dumps(toc, protocol=4)
+    data_file.write(payload)
+    data_file.write(_split_trailer.pack(toc_offset, zlib.crc32(payload), SPLIT_PICKLE_END))
+
+def _check_trailer(data_file, end):
+    '''
+    Return the table of contents of the trailer that ends at end, or None if
+    the trailer (or its table of contents) is not valid
+    '''
+    if end < len(SPLIT_PICKLE_MAGIC)+_split_trailer.size:
+        return None
+    data_file.seek(end-_split_trailer.size)
+    toc_offset, crc, tag = _split_trailer.unpack(data_file.read(_split_trailer.size))
+    if tag != SPLIT_PICKLE_END or not len(SPLIT_PICKLE_MAGIC) <= toc_offset <= end-_split_trailer.size:
+        return None
+    data_file.seek(toc_offset)
+    payload = data_file.read(end-_split_trailer.size-toc_offset)
+    if zlib.crc32(payload) != crc:
+        return None
+    return pickle.loads(payload), toc_offset
+
+def _read_toc(file_name):
+    '''
+    Return the table of contents of a split pickle file, its offset and the
+    end of its trailer. The last valid trailer is used, so a file whose key
+    update was interrupted is read as it was before the update.
+    '''
+    with open(file_name, 'rb') as data_file:
+        if data_file.read(len(SPLIT_PICKLE_MAGIC)) != SPLIT_PICKLE_MAGIC:
+            print("Error: ", file_name, "is not an OPPPY split pickle file")
+            sys.exit(0)
+        size = data_file.seek(0, os.SEEK_END)
+        found = _check_trailer(data_file, size)
+        if found is not None:
+            return found[0], found[1], size
+        # the tail was left by an interrupted update, find the last valid trailer
+        data_file.seek(0)
+        contents = data_file.read()
+        end = contents.rfind(SPLIT_PICKLE_END)
+        while end >= 0:
+            found = _check_trailer(data_file, end+len(SPLIT_PICKLE_END))
+            if found is not None:
+                return found[0], found[1], end+len(SPLIT_PICKLE_END)
+            end = contents.rfind(SPLIT_PICKLE_END, 0, end)
+    print("Error: ", file_name, "has no valid split pickle table of contents")
+    sys.exit(0)
+
+def _toc_compression(toc):
+    '''
+    Return the compression of the first record in a split pickle table of contents
+    '''
+    for entry in toc.values():
+        if entry[0] == 'record':
+            return entry[3] if len(entry) > 3 else 'none'
+        children = entry[1] if entry[0] == 'list' else entry[1].values()
+        for child in children:
+            return _toc_compression({'child':child})
+    return 'none'
+
+def save_split_pickle(data, file_name, keys=None, compression=None):
+    '''
+    Save an OPPPY dictionary as a split pickle file. Every series of every
+    dictionary (and every tally cycle) is pickled as its own record and a
+    table of contents at the end of the file records where each one is, so
+    single series can be loaded without reading the rest of the file.
+
+    arguments:
+        data the OPPPY dictionary to save
+        file_name the split pickle file name
+        keys optional list of top level keys to (re)write in an existing file.
+            The new records and table of contents are appended after the old
+            ones, which stay valid until the new trailer is synced to disk, so
+            an interrupted update leaves the file as it was. The replaced
+            records are only removed when the whole file is saved again.
+        compression optional compression of every record (see COMPRESSIONS)
+    '''
+    if keys is None or not os.path.isfile(file_name):
+        with atomic_file(file_name) as temp_name, open(temp_name, 'wb') as data_file:
+            data_file.write(SPLIT_PICKLE_MAGIC)
+            toc = {key:_write_entry(data_file, value, 0, compression) for key, value in data.items()}
+            _write_toc(data_file, toc)
+        return
+    toc, toc_offset, end = _read_toc(file_name)
+    keys = list(keys)
+    if 'version' in data and 'version' not in keys:
+        keys.append('version')
+    with open(file_name, 'r+b') as data_file:
+        # drop the tail of an interrupted update
+        data_file.truncate(end)
+        data_file.seek(end)
+        try:
+            for key in keys:
+                if key in data:
+                    toc[key] = _write_entry(data_file, data[key], 0, compression)
+                else:
+                    toc.pop(key, None)
+            # the new trailer is only written once the records are on disk
+            data_file.flush()
+            os.fsync(data_file.fileno())
+            _write_toc(data_file, toc)
+            data_file.flush()
+            os.fsync(data_file.fileno())
+        except BaseException:
+            try:
+                data_file.truncate(end)
+            except OSError:
+                os.ftruncate(data_file.fileno(), end)
+            raise
+
+def load_split_pickle(file_name, keys=None, lazy=False):
+    '''
+    Load an OPPPY dictionary from a split pickle file
+
+    arguments:
+        file_name the split pickle file name
+        keys optional list of top level keys to load (the version is always loaded)
+        lazy return a lazy_dictionary that only reads series when they are accessed
+    '''
+    toc = _read_toc(file_name)[0]
+    if keys is not None:
+        toc = {key:entry for key, entry in toc.items() if key in keys or key == 'version'}
+    data = lazy_dictionary(list(toc), lambda key: _read_entry(file_name, toc[key], True))
+    return data if lazy else data.load()
+
+def is_npy_directory(file_name):
+    '''
+    Check if a path is (or, for a new path, should be written as) a NumPy
+    directory store (see save_npy_directory)
+
+    arguments:
+        file_name the directory name to check
+    '''
+    if os.path.exists(file_name):
+        return os.path.isfile(os.path.join(file_name, NPY_DIRECTORY_INDEX))
+    return _file_extension(file_name) in NPY_DIRECTORY_EXTENSIONS
+
+def _npy_name(key):
+    '''
+    Escape a dictionary key for use as a file name
+    '''
+    return quote(key, safe='').replace('.', '%2E') if key in ('.', '..') else quote(key, safe='')
+
+def _write_npy_entry(directory, path, value):
+    '''
+    Write a value below directory/path and return its index entry. NumPy
+    arrays become .npy files, dictionaries become directories, simple values
+    are kept in the index and everything else is pickled.
+    '''
+    if isinstance(value, np.ndarray) and value.dtype.kind in 'biufcSUMm':
+        np.save(os.path.join(directory, path+'.npy'), value, allow_pickle=False)
+        return ('npy', path+'.npy')
+    if isinstance(value, dict) and not isinstance(value, columnar_dictionary) and all(isinstance(key, str) for key in value):
+        os.mkdir(os.path.join(directory, path))
+        return ('dict', {key:_write_npy_entry(directory, path+'/'+_npy_name(key), sub_value) for key, sub_value in value.items()}, path)
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return ('value', value)
+    with open(os.path.join(directory, path+'.p'), 'wb') as data_file:
+        pickle.dump(value, data_file, protocol=4)
+    return ('pickle', path+'.p')
+
+def _read_npy_entry(directory, entry, lazy=False):
+    '''
+    Read a NumPy directory index entry. Arrays are memory mapped read only.
+    '''
+    if entry[0] == 'npy':
+        return np.load(os.path.join(directory, entry[1]), mmap_mode='r')
+    if entry[0] == 'value':
+        return entry[1]
+    if entry[0] == 'pickle':
+        with open(os.path.join(directory, entry[1]), 'rb') as data_file:
+            return pickle.load(data_file)
+    values = lazy_dictionary(list(entry[1]), lambda key: _read_npy_entry(directory, entry[1][key], lazy))
+    return values if lazy else values.load()
+
+def _read_npy_index(directory):
+    with open(os.path.join(directory, NPY_DIRECTORY_INDEX), 'rb') as index_file:
+        return pickle.load(index_file)
+
+def save_npy_directory(data, file_name, keys=None, compression=None):
+    '''
+    Save an OPPPY dictionary as a directory of .npy files (one per array)
+    that are memory mapped when they are loaded, so dump variables are not
+    read into memory until their pages are used. Every top level key is
+    written to a new sub directory and the index is replaced atomically, so
+    open memory maps and interrupted saves never see a partial dictionary.
+
+    arguments:
+        data the OPPPY dictionary to save
+        file_name the directory name
+        keys optional list of top level keys to (re)write in an existing
+            directory. The other stored keys are left untouched.
+        compression only 'none' (memory mapped arrays can not be compressed)
+    '''
+    if _split_compression(compression)[0] is not None:
+        print("Error: compression is not available for NumPy directory stores")
+        sys.exit(0)
+    os.makedirs(file_name, exist_ok=True)
+    if keys is None or not os.path.isfile(os.path.join(file_name, NPY_DIRECTORY_INDEX)):
+        keys = list(data.keys())
+        index = {}
+    else:
+        index = _read_npy_index(file_name)
+        keys = list(keys)
+        if 'version' in data and 'version' not in keys:
+            keys.append('version')
+    for key in keys:
+        if key in data:
+            index[key] = _write_npy_entry(file_name, _npy_name(key)+'~'+uuid.uuid4().hex[:8], data[key])
+        else:
+            index.pop(key, None)
+    temp_name = os.path.join(file_name, NPY_DIRECTORY_INDEX+'.tmp')
+    with open(temp_name, 'wb') as index_file:
+        pickle.dump(index, index_file, protocol=4)
+    os.replace(temp_name, os.path.join(file_name, NPY_DIRECTORY_INDEX))
+    # remove the replaced entries (and anything left by interrupted saves)
+    paths = set(entry[2] if entry[0] == 'dict' else entry[1] for entry in index.values() if entry[0] != 'value')
+    for name in os.listdir(file_name):
+        if '~' in name and name not in paths:
+            path = os.path.join(file_name, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+
+def load_npy_directory(file_name, keys=None, lazy=False):
+    '''
+    Load an OPPPY dictionary from a NumPy directory store. The arrays are
+    read only memory maps of the .npy files.
+
+    arguments:
+        file_name the directory name
+        keys optional list of top level keys to load (the version is always loaded)
+        lazy return a lazy_dictionary that only opens the arrays that are accessed
+    '''
+    index = _read_npy_index(file_name)
+    if keys is not None:
+        index = {key:entry for key, entry in index.items() if key in keys or key == 'version'}
+    data = lazy_dictionary(list(index), lambda key: _read_npy_entry(file_name, index[key], True))
+    return data if lazy else data.load()
+
+def _lazy_hdf5_value(file_name, path):
+    '''
+    Return a lazy view of an HDF5 group (or the value of a dataset)
+    '''
+    with open_hdf5(file_name) as hdf5_file:
+        node = hdf5_file[path]
+        opppy_type = node.attrs.get('opppy_type')
+        if opppy_type == 'columnar':
+            names = [name for name in node if name != '%valid']
+        elif opppy_type == 'dict':
+            names = list(node)
+        else:
+            return read_hdf5_value(node)
+    keys = [_dictionary_key(name) for name in names]
+    if opppy_type == 'columnar':
+        def fetch(key):
+            with open_hdf5(file_name) as hdf5_file:
+                column = read_hdf5_value(hdf5_file[path+'/'+_hdf5_name(key)])
+                valid = hdf5_file[path+'/%valid/'+_hdf5_name(key)][()].astype(bool)
+            return (np.asarray(column), valid, len(valid))
+        return lazy_columnar_dictionary(keys, fetch)
+    return lazy_dictionary(keys, lambda key: _lazy_hdf5_value(file_name, path+'/'+_hdf5_name(key)))
+
+class lazy_dictionary(MutableMapping):
+    '''
+    A dictionary view of stored OPPPY data that only reads a value from the
+    file the first time it is accessed. Values that are assigned or deleted
+    only change the view (see save_data to store the changes).
+
+    arguments:
+        keys the stored keys
+        fetch a function that reads the value of a key
+    '''
+    def __init__(self, keys, fetch):
+        self._keys = list(keys)
+        self._fetch = fetch
+        self._values = {}
+
+    def __getitem__(self, key):
+        if key not in self._values:
+            if key not in self._keys:
+                raise KeyError(key)
+            self._values[key] = self._fetch(key)
+        return self._values[key]
+
+    def __setitem__(self, key, value):
+        if key not in self._values and key not in self._keys:
+            self._keys.append(key)
+        self._values[key] = value
+
+    def __delitem__(self, key):
+        self._keys.remove(key)
+        self._values.pop(key, None)
+
+    def __iter__(self):
+        return iter(list(self._keys))
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __repr__(self):
+        return 'lazy_dictionary('+repr(self._keys)+')'
+
+    def load(self):
+        '''
+        Read every value and return the data as a regular dictionary
+        '''
+        return {key:_load_value(self[key]) for key in self._keys}
+
+class lazy_columnar_dictionary(lazy_dictionary):
+    '''
+    A lazy_dictionary of columnar_dictionary columns (the fetch function
+    returns the column, its validity mask and the column length)
+    '''
+    def __getitem__(self, key):
+        return self._record(key)[0]
+
+    def _record(self, key):
+        record = lazy_dictionary.__getitem__(self, key)
+        if not isinstance(record, tuple):
+            # assigned columns are always valid
+            record = (np.asarray(record), np.ones(len(record), dtype=bool), len(record))
+            self._values[key] = record
+        elif len(record[1]) != record[2]:
+            record = (record[0], np.unpackbits(record[1], count=record[2]).astype(bool), record[2])
+            self._values[key] = record
+        return record
+
+    def valid(self, key):
+        '''
+        Return the validity mask of a column
+        '''
+        return self._record(key)[1]
+
+    def load(self):
+        columns = columnar_dictionary()
+        for key in self._keys:
+            column, valid, length = self._record(key)
+            columns._length = length
+            columns._capacity = max(length, 1)
+            columns._columns[key] = np.array(column)
+            columns._valid[key] = np.array(valid)
+        return columns
+
+class lazy_list(Sequence):
+    '''
+    A list view of stored OPPPY data (i.e. tally cycles) that only reads an
+    item the first time it is accessed
+
+    arguments:
+        length the number of stored items
+        fetch a function that reads the item at an index
+    '''
+    def __init__(self, length, fetch):
+        self._length = length
+        self._fetch = fetch
+        self._values = {}
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[item] for item in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if index < 0 or index >= self._length:
+            raise IndexError('lazy_list index out of range')
+        if index not in self._values:
+            self._values[index] = self._fetch(index)
+        return self._values[index]
+
+    def __len__(self):
+        return self._length
+
+    def load(self):
+        '''
+        Read every item and return the data as a regular list
+        '''
+        return [_load_value(item) for item in self]
+
+def _load_value(value):
+    if isinstance(value, (lazy_dictionary, lazy_list)):
+        return value.load()
+    return value
+
+def save_pickle(data, file_name, compression=None):
+    '''
+    Pickle an OPPPY dictionary, optionally compressed. Compressed files start
+    with a short header naming the compression followed by the compressed
+    pickle stream.
+
+    arguments:
+        data the OPPPY dictionary to save
+        file_name the pickle file name
+        compression optional compression (see COMPRESSIONS)
+    '''
+    codec, shuffle = _split_compression(compression)
+    with atomic_file(file_name) as temp_name, open(temp_name, 'wb') as data_file:
+        if codec is None:
+            pickle.dump(data, data_file)
+            return
+        data_file.write(COMPRESSED_PICKLE_MAGIC+bytes([len(compression)])+compression.encode())
+        with _codec_file(data_file, codec, 'wb') as codec_file:
+            pickle.dump(_shuffle_value(data) if shuffle else data, codec_file, protocol=4)
+
+def load_pickle(file_name):
+    '''
+    Load a (compressed) pickle file written by save_pickle
+
+    arguments:
+        file_name the pickle file name
+    '''
+    with open(file_name, 'rb') as data_file:
+        if data_file.read(len(COMPRESSED_PICKLE_MAGIC)) != COMPRESSED_PICKLE_MAGIC:
+            data_file.seek(0)
+            return pickle.load(data_file)
+        compression = data_file.read(data_file.read(1)[0]).decode()
+        with _codec_file(data_file, _split_compression(compression)[0], 'rb') as codec_file:
+            return pickle.load(codec_file)
+
+def data_compression(file_name):
+    '''
+    Return the compression of an existing OPPPY data file ('none' for
+    uncompressed or missing files)
+
+    arguments:
+        file_name the file name
+    '''
+    if not os.path.isfile(file_name):
+        return 'none'
+    if is_hdf5_file(file_name):
+        with open_hdf5(file_name) as hdf5_file:
+            return str(hdf5_file.attrs.get('opppy_compression', 'none'))
+    if is_split_pickle_file(file_name):
+        return _toc_compression(_read_toc(file_name)[0])
+    magic = _file_magic(file_name, len(COMPRESSED_PICKLE_MAGIC)+1)
+    if magic[:len(COMPRESSED_PICKLE_MAGIC)] == COMPRESSED_PICKLE_MAGIC:
+        return _file_magic(file_name, len(magic)+magic[-1])[len(magic):].decode()
+    return 'none'
+
+def save_data(data, file_name, keys=None, compression=None):
+    '''
+    Save an OPPPY dictionary. HDF5 file names (.h5, .hdf5 or an existing HDF5
+    file) are written with save_hdf5, split pickle file names (.opp or an
+    existing split pickle file) with save_split_pickle, NumPy directory names
+    (.npyd or an existing store) with save_npy_directory and everything else
+    with save_pickle.
+
+    arguments:
+        data the OPPPY dictionary to save
+        file_name the file name
+        keys optional list of changed top level keys (not used by pickle files)
+        compression optional compression (see COMPRESSIONS). By default an
+            existing file keeps its compression.
+
+    Whole files are written next to the old file and renamed over it (see
+    atomic_file). Single key updates of split pickle files only switch to
+    their new table of contents once it is synced to disk and NumPy directory
+    stores replace their index atomically, so an interrupted update leaves
+    the previous data. Single key updates of HDF5 files (like
+    opppy.output.append_output_hdf5) change the file in place and are not
+    atomic: an interrupted update can leave a damaged file. Concurrent
+    writers should hold lock_data so their updates are not lost.
+    '''
+    if compression is None:
+        compression = data_compression(file_name)
+    if isinstance(data, lazy_dictionary):
+        # read the data before the file is rewritten
+        data = {key:_load_value(data[key]) for key in data if keys is None or key in keys or key == 'version'}
+    if is_hdf5_file(file_name):
+        save_hdf5(data, file_name, keys, compression)
+    elif is_split_pickle_file(file_name):
+        save_split_pickle(data, file_name, keys, compression)
+    elif is_npy_directory(file_name):
+        save_npy_directory(data, file_name, keys, compression)
+    else:
+        save_pickle(data, file_name, compression)
+
+def load_data(file_name, keys=None, lazy=False, journal=True, shards=True, migrate=False):
+    '''
+    Load an OPPPY dictionary saved with save_data (or a plain pickle file)
+
+    arguments:
+        file_name the file name
+        keys optional list of top level keys to load. Formats that can not
+            load single keys return the whole dictionary.
+        lazy return a lazy_dictionary that only reads the series that are
+            accessed (HDF5, split pickle files and NumPy directory stores)
+        journal replay the file_name.journal cycles (see opppy.journal). The
+            whole dictionary is loaded when there is a journal.
+        shards merge the file_name.shards written by concurrent ingest
+            processes (see opppy.shard). The whole dictionary is loaded when
+            there are shards.
+        migrate upgrade whole dictionaries written by an older OPPPY in
+            memory (see opppy.migration). Dictionaries loaded with only some
+            of their keys keep the stored version. Journal and shard data are
+            always upgraded before their cycles are appended.
+    '''
+    data = _load_stored_data(file_name, keys, lazy, journal, shards)
+    if migrate and isinstance(data, MutableMapping) and 'version' in data and (keys is None or _read_whole(file_name, keys, lazy)):
+        # the migrations use this module to upgrade data files
+        from opppy.migration import migrate_data
+        migrate_data(data)
+    return data
+
+def _load_stored_data(file_name, keys=None, lazy=False, journal=True, shards=True):
+    if shards and os.path.isdir(file_name+'.shards'):
+        from opppy.shard import load_shard_data, shard_files
+        if len(shard_files(file_name)) > 0:
+            return load_shard_data(file_name, journal)
+    if journal and os.path.isfile(file_name+'.journal'):
+        # the journal module appends with opppy.output, which uses this module
+        from opppy.journal import load_journal_data
+        return load_journal_data(file_name)
+    if is_hdf5_file(file_name):
+        if lazy:
+            names = [name for name in hdf5_keys(file_name) if keys is None or name in keys or name == 'version']
+            return lazy_dictionary(names, lambda key: _lazy_hdf5_value(file_name, _hdf5_name(key)))
+        return load_hdf5(file_name, keys)
+    if is_split_pickle_file(file_name):
+        return load_split_pickle(file_name, keys, lazy)
+    if is_npy_directory(file_name):
+        return load_npy_directory(file_name, keys, lazy)
+    return load_pickle(file_name)
+
+def _read_whole(file_name, keys=None, lazy=False):
+    '''
+    Check if loading a data file reads the whole file (pickle files, or any
+    file when every key is loaded eagerly)
+    '''
+    if is_hdf5_file(file_name) or is_split_pickle_file(file_name) or is_npy_directory(file_name):
+        return keys is None and not lazy
+    return True
+
+def _load_data_task(file_name, keys=None, lazy=False):
+    data = load_data(file_name, keys, lazy)
+    if keys is not None and isinstance(data, dict):
+        # drop the dictionaries of formats that are read whole
+        data = {key:value for key, value in data.items() if key in keys or key == 'version'}
+    return data
+
+def load_data_list(file_names, keys=None, lazy=False, nthreads=0, read_budget=None):
+    '''
+    Load a list of OPPPY data files (i.e. the runs of a parameter study) with
+    a pool of threads, so reading, decompressing and memory mapping the files
+    overlap. Only the requested keys are kept, and formats that can load
+    single keys (HDF5, split pickle and NumPy directory stores) only read
+    those keys. Threads are used instead of the worker pool because the
+    loaded data would have to be pickled again to leave a worker process, and
+    lazy dictionaries can not leave it at all.
+
+    arguments:
+        file_names the list of data file names
+        keys optional list of top level keys to load (see load_data)
+        lazy load lazy dictionaries where the format allows it (see load_data)
+        nthreads number of loading threads (-1 nthreads=cpu_count, 0 serial)
+        read_budget optional limit (bytes) on the on disk size of the files
+            that are read whole at the same time. This is not a limit on the
+            loaded data, which can be several times larger for compressed
+            files. A file larger than the budget is loaded on its own.
+
+    returns:
+        the list of loaded dictionaries in the order of file_names
+    '''
+    nthreads = os.cpu_count() if nthreads < 0 else nthreads
+    if nthreads < 2 or len(file_names) < 2:
+        return [_load_data_task(file_name, keys, lazy) for file_name in file_names]
+    sizes = [os.path.getsize(file_name) if os.path.isfile(file_name) and _read_whole(file_name, keys, lazy) else 0
+             for file_name in file_names]
+    data_list = [None]*len(file_names)
+    pending = {}
+    loading = 0
+    next_index = 0
+    with ThreadPoolExecutor(nthreads) as executor:
+        while next_index < len(file_names) or len(pending) > 0:
+            while next_index < len(file_names) and len(pending) < nthreads and \
+                (len(pending) == 0 or read_budget is None or loading+sizes[next_index] <= read_budget):
+                pending[executor.submit(_load_data_task, file_names[next_index], keys, lazy)] = next_index
+                loading += sizes[next_index]
+                next_index += 1
+            done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                loading -= sizes[index]
+                data_list[index] = future.result()
+    return data_list
+
+def benchmark_compression(data, file_name, compressions=COMPRESSIONS):
+    '''
+    Save and load an OPPPY dictionary with each compression and return the
+    file size and the save and load throughput (MB/s of uncompressed pickle
+    data) of each one
+
+    arguments:
+        data the OPPPY dictionary to benchmark
+        file_name the file to write (the format follows the file name)
+        compressions the compressions to benchmark
+    '''
+    nbytes = len(pickle.dumps(data, protocol=4))
+    results = []
+    for compression in compressions:
+        start = perf_counter()
+        save_data(data, file_name, compression=compression)
+        save_time = perf_counter()-start
+        start = perf_counter()
+        load_data(file_name)
+        load_time = perf_counter()-start
+        results.append({'compression':compression, 'size':os.path.getsize(file_name),
+                        'ratio':nbytes/os.path.getsize(file_name),
+                        'save':nbytes/save_time/1.0e6, 'load':nbytes/load_time/1.0e6})
+        os.remove(file_name)
+    return results
@@ -29,17 +29,14 @@ import math
 import platform
 import numpy as np
 import pickle
-if "linux" in platform.system().lower(): 
-    from multiprocessing import Process, Manager, cpu_count
-else:
-    # Protect against multiprocessing fork issue on Windows and Mac
-    from multiprocess import Process, Manager, cpu_count
 
 from opppy.version import __version__
 from opppy.progress import *
 from opppy.output import *
+from opppy.storage import load_data
+from opppy.migration import check_data_version
 
-def append_tally_data(cycle_data, data, sort_key_string):
+def append_tally_data(cycle_data, data, sort_key_string, checked=None):
     '''
     This function appends a dictionary of tally cycle data to an
     existing dictionary
@@ -48,6 +45,7 @@ def append_tally_data(cycle_data, data, sort_key_string):
       tally_cycle_data - python dictionary of tally data
       data - python dictionary of data 
       sort_key_string - string used to access the sorting data in the 'cycle_info' dictionary
+      checked - optional dictionary of the last checked problem data (see append_problem_data)
     
     Output:
       data - python dictionary of appended data
@@ -59,36 +57,7 @@ def append_tally_data(cycle_data, data, sort_key_string):
         print("Error: No cycle info was found")
         sys.exit(0)
 
-    # Check that the problem data for the cycle matches the current data
-    # problem data.
-    if 'problem_data' in data:
-        problem_data = data.pop('problem_data')
-        cycle_problem_data = cycle_data.pop('problem_data')
-        for key in list(cycle_problem_data.keys()):
-            if key in problem_data:
-                if isinstance(cycle_problem_data[key],(list,tuple,np.ndarray)):
-                    if len(problem_data[key]) != len(cycle_problem_data[key]):
-                        print("Error: Problem data doesn't match")
-                        print("len(previous_problem_data[", key, "] --", len(problem_data[key]))
-                        print("len(cycle_problem_data[", key, "] --", len(cycle_problem_data[key]))
-                        sys.exit(0)
-                    for index, problem_value, cycle_value in zip(list(range(len(problem_data[key]))), problem_data[key], cycle_problem_data[key]):
-                      if (problem_value != cycle_value):
-                        print("Error: Problem data doesn't match")
-                        print("previous_problem_data[", key, "][",index,"] --", problem_value)
-                        print("cycle_problem_data[", key, "][",index,"] --", cycle_value)
-                        sys.exit(0)
-                elif problem_data[key] != cycle_problem_data[key]:
-                    print("Error: Problem data doesn't match")
-                    print("previous_problem_data = ", key, "--", problem_data[key])
-                    print("cycle_problem_data = ", key, "--", cycle_problem_data[key])
-                    sys.exit(0)
-            else:
-               problem_data[key] = cycle_problem_data[key]
-        data['problem_data'] = problem_data
-    else:
-        if ('problem_data' in cycle_data):
-            data['problem_data'] = cycle_data.pop('problem_data')
+    append_problem_data(cycle_data, data, checked)
 
     if 'tally_cycle_data' in data:
         append_tally_cycle_data(data, cycle_data, cycle_info, sort_key_string)
@@ -157,7 +126,7 @@ def print_pickle_tally(args):
     pickle_names=[]
     for pickle_file_name in file_list:
         pickle_names.append(pickle_file_name.split('/')[-1])
-        pickle_data.append(pickle.load(open(pickle_file_name,'rb')))
+        pickle_data.append(load_data(pickle_file_name))
 
     for data, name in zip(pickle_data, pickle_names):
         print("######################################################")
@@ -218,11 +187,11 @@ def print_tally_data(data):
     print('')
     print("######################################################")
 
-def append_tally_dictionary(data, output_files, opppy_parser, append_date=False, nthreads=0):
+def append_tally_dictionary(data, output_files, opppy_parser, append_date=False, nthreads=0, cycle_index=None):
     '''
     Append tally data from a list of output_files to a user provided dictionary using a user proved
-    opppy_parser. By default this function will use the multiprocessing option to parallelize the
-    parsing of multiple dumps.'
+    opppy_parser. With nthreads>0 the cycles are parsed in chunks by the shared worker pool
+    (see iter_output_cycle_data).
 
 
     arguments:
@@ -231,16 +200,12 @@ def append_tally_dictionary(data, output_files, opppy_parser, append_date=False,
         opppy_parser a user defined OPPPY tally parser for the output files
         append_date bool to specify if the data should be appended to the file
             name for tracking purposes 
+        nthreads number of worker processes (-1 nthreads=cpu_count, 0 serial)
+        cycle_index optional cycle index dictionary (see load_cycle_index). Only
+            cycles beyond the previously indexed cycles of each file are parsed
+            and the index is updated with the new cycles.
     '''
-    if not 'version' in data or not (data['version'] == __version__):
-      print('')
-      print("Error: data dictionary does not match this version of OPPPY")
-      if 'version' in data:
-        print("data dictionary was build with version", data['version'])
-      else:
-        print("This data dictionary has no version")
-      print("This version of OPPPY is ", __version__)
-      sys.exit(0)
+    check_data_version(data)
 
     time = ''
     if append_date:
@@ -250,52 +215,18 @@ def append_tally_dictionary(data, output_files, opppy_parser, append_date=False,
             data['appended_files'].append(file_name.split('/')[-1]+time)
         else:
             data['appended_files'] = [file_name.split('/')[-1]+time]
-    count = 0
-    total = len(output_files) 
     print('')
-    print("Number of files to be read: ", total)
-    nthreads = cpu_count() if nthreads < 0 else nthreads
-    if(nthreads>0):
-      def thread_all(file_name, file_index, result_l):
-          thread_cycle_string_list = get_output_lines(file_name, opppy_parser.cycle_opening_string, opppy_parser.cycle_closing_string, opppy_parser.file_end_string)
-          thread_data=[]
-          for cycle_string in thread_cycle_string_list:
-              thread_data.append(extract_cycle_data(cycle_string, opppy_parser))
-          result_l[file_index] = thread_data
-          
-      print("Number of threads used for processing: ",nthreads)
-      for stride in range(math.ceil(float(total)/float(nthreads))):
-          files = output_files[nthreads*stride:min(nthreads*(stride+1),len(output_files))]
-          with Manager() as manager:
-                result_l = manager.list(range(len(files)))
-                threads = []
-                for file_index, file_name in enumerate(files):
-                    thread = Process(target=thread_all, args=(file_name, file_index, result_l,))
-                    thread.start()
-                    threads.append(thread)
-                for thread in threads:
-                    thread.join()
-                    count += 1
-                    progress(count,total, 'of input files read')
-                for file_data in result_l:
-                    for cycle_data in file_data:
-                       data = append_tally_data(cycle_data,data,opppy_parser.sort_key_string)
-                del result_l
-                del threads
-    else:
-      for file_name in output_files:
-        cycle_string_list = get_output_lines(file_name, opppy_parser.cycle_opening_string, opppy_parser.cycle_closing_string, opppy_parser.file_end_string)
-        for cycle_string in cycle_string_list:
-            cycle_data = extract_cycle_data(cycle_string, opppy_parser)
-            data = append_tally_data(cycle_data,data,opppy_parser.sort_key_string)
-        count += 1
-        progress(count,total, 'of input files read')
+    print("Number of files to be read: ", len(output_files))
+    # problem data is only checked again when it changes
+    checked = {}
+    for file_name, cycle_data in iter_output_cycle_data(output_files, opppy_parser, nthreads, cycle_index):
+        data = append_tally_data(cycle_data,data,opppy_parser.sort_key_string,checked)
 
     print('')
     print('')
     print_tally_data(data)
 
-def build_tally_dictionary_list(file_lists, opppy_parser, nthreads=0):
+def build_tally_dictionary_list(file_lists, opppy_parser, nthreads=0, cache=None):
     '''
     append_pickle - 
       This function generates a opppy output dictionary
@@ -303,6 +234,7 @@ def build_tally_dictionary_list(file_lists, opppy_parser, nthreads=0):
     
       args:
         args - Parsed input arguments
+        cache - optional opppy.parse_cache.parse_cache of parsed dictionaries
     '''
     dictionary_data = []
     dictionary_names = []
@@ -310,9 +242,15 @@ def build_tally_dictionary_list(file_lists, opppy_parser, nthreads=0):
         # add a data name to go with the data sets
         dictionary_names.append(output_files[0])
         # build a new dictionary
-        data = {}
-        data['version'] = __version__
-        append_tally_dictionary(data, output_files, opppy_parser, nthreads=nthreads)
+        def build():
+            data = {}
+            data['version'] = __version__
+            append_tally_dictionary(data, output_files, opppy_parser, nthreads=nthreads)
+            return data
+        if cache is not None:
+            data = cache.cached('tally', output_files, opppy_parser, build)
+        else:
+            data = build()
         dictionary_data.append(data)
     
     
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# ---------------------------*-python-*----------------------------------------#
+# file   benchmark_compression.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+'''
+Report the size and save/load throughput of each OPPPY compression
+
+  python benchmark_compression.py                  # the gold test data
+  python benchmark_compression.py run1.p run2.p    # your own pickle files
+'''
+import sys
+
+sys.path.append('..')
+
+import os
+import glob
+import tempfile
+
+from opppy.storage import load_data, benchmark_compression, COMPRESSIONS
+
+dir_path = os.path.dirname(os.path.realpath(__file__))+"/"
+
+file_names = sys.argv[1:] if len(sys.argv) > 1 else sorted(glob.glob(dir_path+"gold_*.p"))
+data = {}
+for file_name in file_names:
+    data[file_name.split('/')[-1]] = load_data(file_name)
+
+tmp_dir = tempfile.TemporaryDirectory()
+print("%-8s %-14s %12s %8s %12s %12s"%('format', 'compression', 'bytes', 'ratio', 'save MB/s', 'load MB/s'))
+for extension in ['.p', '.opp', '.h5']:
+    compressions = [compression for compression in COMPRESSIONS if not (extension == '.h5' and 'lzma' in compression)]
+    for result in benchmark_compression(data, tmp_dir.name+"/benchmark"+extension, compressions):
+        print("%-8s %-14s %12d %8.2f %12.2f %12.2f"%(extension, result['compression'], result['size'],
+            result['ratio'], result['save'], result['load']))
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# ---------------------------*-python-*----------------------------------------#
+# file   test_cell_locator.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+import sys
+
+sys.path.append('..')
+
+import os
+dir_path = os.path.dirname(os.path.realpath(__file__))+"/"
+
+import unittest
+import numpy as np
+from matplotlib.path import Path
+
+import opppy.cell_locator
+from opppy.cell_locator import *
+from opppy.dump_utils import point_value_2d, data2grid, data2line2d
+
+def amr_mesh(seed):
+  '''
+  Build a refined quad mesh of the [0,4]x[0,4] box with one cell split into
+  two triangles
+  '''
+  rng = np.random.default_rng(seed)
+  cells = []
+  def split(x0, y0, size, level):
+    if level < 4 and rng.random() < 0.5:
+      half = size/2.0
+      for dx in (0.0, half):
+        for dy in (0.0, half):
+          split(x0+dx, y0+dy, half, level+1)
+    else:
+      cells.append([[x0, y0], [x0+size, y0], [x0+size, y0+size], [x0, y0+size]])
+  for i in range(4):
+    for j in range(4):
+      split(float(i), float(j), 1.0, 0)
+  cell = cells.pop()
+  cells.append([cell[0], cell[1], cell[2]])
+  cells.append([cell[0], cell[2], cell[3]])
+  return cells
+
+class test_opppy_cell_locator(unittest.TestCase):
+
+  def test_locate(self):
+    '''
+    This tests that every point is located in a cell that contains it
+    '''
+    cells = amr_mesh(0)
+    locator = cell_locator(cells)
+    rng = np.random.default_rng(1)
+    points = rng.random((300, 2))*4.4-0.2
+    located = locator.locate(points[:,0], points[:,1])
+    for point, cell in zip(points, located):
+      inside = [index for index, verts in enumerate(cells) if Path(np.array(verts)).contains_point(point)]
+      if cell < 0:
+        assert(len(inside)==0)
+      else:
+        # the matplotlib test excludes some points on the cell edges
+        assert(len(inside)==0 or cell in inside)
+        assert(np.all(point >= np.min(cells[cell], axis=0)) and np.all(point <= np.max(cells[cell], axis=0)))
+    assert(np.all(located[np.any((points < 0.0) | (points > 4.0), axis=1)]==-1))
+
+    # the values of the located cells
+    values = np.arange(len(cells))*2.0
+    sampled = locator.sample(values, locator.locate([[0.5, 5.0]], [[0.5, 0.5]]))
+    assert(sampled.shape==(1, 2) and sampled[0, 0]==values[locator.locate(0.5, 0.5)] and np.isnan(sampled[0, 1]))
+
+  def test_refined_mesh(self):
+    '''
+    This tests that a strongly refined patch is located exactly and keeps a
+    few cells per bucket
+    '''
+    def quads(size, ncells):
+      x, y = [coordinate.ravel() for coordinate in np.meshgrid(np.arange(ncells)*size, np.arange(ncells)*size, indexing='ij')]
+      return np.stack([np.stack([x, y], -1), np.stack([x+size, y], -1), np.stack([x+size, y+size], -1), np.stack([x, y+size], -1)], 1)
+    # a 16x16 mesh with its corner cell refined 64x64
+    verts = np.concatenate([quads(1.0, 16)[1:], quads(1.0/64, 64)])
+    locator = cell_locator(verts)
+    for width, nbuckets, keys, starts, cells in locator.levels:
+      assert(np.diff(starts).max() <= 4)
+    rng = np.random.default_rng(6)
+    # half of the points in the refined patch
+    points = np.concatenate([rng.random((2500, 2)), rng.random((2500, 2))*16.0])
+    located = locator.locate(points[:,0], points[:,1])
+    patch = np.all(points < 1.0, axis=1)
+    fine = 255+np.floor(points[:,0]*64).astype(int)*64+np.floor(points[:,1]*64).astype(int)
+    coarse = np.floor(points[:,0]).astype(int)*16+np.floor(points[:,1]).astype(int)-1
+    assert(np.array_equal(located, np.where(patch, fine, coarse)))
+
+  def test_locator_cache(self):
+    '''
+    This tests that locators are shared by meshes with the same cells
+    '''
+    clear_cell_locators()
+    cells = amr_mesh(2)
+    locator = get_cell_locator(cells)
+    assert(get_cell_locator(cells) is locator)
+    assert(get_cell_locator(np.array(cells[:-2]+[cells[-2]+[cells[-2][-1]], cells[-1]+[cells[-1][-1]]])) is locator)
+    assert(get_cell_locator(amr_mesh(3)) is not locator)
+    for seed in range(opppy.cell_locator.LOCATOR_CACHE_SIZE):
+      get_cell_locator(amr_mesh(seed+4))
+    assert(len(opppy.cell_locator._locators)==opppy.cell_locator.LOCATOR_CACHE_SIZE)
+
+    # a freed mesh and a remeshed one with as many cells (that may reuse its
+    # memory) or an edited mesh never share a locator
+    rng = np.random.default_rng(7)
+    points = rng.random((200, 2))*4.0
+    for trial in range(20):
+      verts = amr_mesh(8)
+      get_cell_locator(verts)
+      del verts
+      verts = amr_mesh(8)
+      verts[5] = [[x*0.5, y*0.5] for x, y in verts[5]]
+      assert(np.array_equal(get_cell_locator(verts).locate(points[:,0], points[:,1]), cell_locator(verts).locate(points[:,0], points[:,1])))
+      verts[6] = [[x*0.5, y*0.5] for x, y in verts[6]]
+      assert(np.array_equal(get_cell_locator(verts).locate(points[:,0], points[:,1]), cell_locator(verts).locate(points[:,0], points[:,1])))
+
+  def test_dump_sampling(self):
+    '''
+    This tests that the dump extraction functions return the cell values
+    '''
+    cells = amr_mesh(5)
+    centers = np.array([np.mean(verts, axis=0) for verts in cells])
+    data = {'x':centers[:,0], 'y':centers[:,1], 'xy_verts':cells, 'density':np.arange(len(cells))*1.0, 'pressure':centers[:,0]}
+    locator = get_cell_locator(cells)
+    value = point_value_2d(data, 'x', 'y', 'density', 1.3, 2.7, verts_key='xy_verts')
+    assert(value.shape==(1,) and value[0]==locator.locate(1.3, 2.7))
+
+    line, values = data2line2d(data, 'x', 'y', 'density', 0.1, 0.2, 3.9, 3.7, npts=50, verts_key='xy_verts')
+    xi = 0.1+np.arange(50)*(3.8/50)
+    yi = 0.2+np.arange(50)*(3.5/50)
+    assert(np.array_equal(values, locator.locate(xi, yi)*1.0))
+
+    grid = data2grid(data, 'x', 'y', ['density', 'pressure'], npts=20, verts_key='xy_verts')
+    cells = locator.locate(grid['x'], grid['y']).T
+    assert(np.array_equal(grid['density'], cells*1.0))
+    assert(np.array_equal(grid['pressure'], centers[cells, 0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
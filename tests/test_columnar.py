@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# ---------------------------*-python-*----------------------------------------#
+# file   test_columnar.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+import sys
+
+sys.path.append('..')
+
+import os 
+dir_path = os.path.dirname(os.path.realpath(__file__))+"/"
+
+import unittest
+import pickle
+import random
+import numpy as np
+
+from opppy.columnar import *
+from opppy.output import *
+
+class test_opppy_columnar(unittest.TestCase):
+
+  def test_append_output_dictionary(self):
+    '''
+    This tests that columnar data matches the gold list data
+    '''
+    from my_test_opppy_parser import my_test_opppy_parser
+    from opppy.version import __version__
+    opppy_parser = my_test_opppy_parser()
+
+    data = {}
+    data['version'] = __version__
+    append_output_dictionary(data, [dir_path+"output_example1.txt"], opppy_parser, columnar=True)
+    # existing columnar data stays columnar without the flag
+    append_output_dictionary(data, [dir_path+"output_example2.txt"], opppy_parser)
+    append_output_dictionary(data, [dir_path+"output_example3.txt"], opppy_parser)
+
+    goldfile = open(dir_path+'gold_output.p', 'rb')
+    gold_data = pickle.load(goldfile)
+    goldfile.close()
+    gold_data.pop('version')
+    data.pop('version')
+    assert(list(data.keys())==list(gold_data.keys()))
+    for key, value in data.items():
+      if isinstance(value, columnar_dictionary):
+        assert(list(value.keys())==list(gold_data[key].keys()))
+        assert(value.to_dict()==gold_data[key])
+      else:
+        assert(value==gold_data[key])
+
+    # the columns are arrays and round trip through pickle
+    test_data = pickle.loads(pickle.dumps(data['test_data1']))
+    assert(isinstance(test_data['time'], np.ndarray))
+    assert(test_data.to_dict()==gold_data['test_data1'])
+    for key in test_data:
+      assert((test_data.valid(key)==data['test_data1'].valid(key)).all())
+
+  def test_append(self):
+    '''
+    This tests columnar appends against append_data for out of order cycles
+    and keys that are only reported by some cycles
+    '''
+    random.seed(7)
+    data = None
+    columns = columnar_dictionary(initial_capacity=1)
+    for cycle in range(200):
+      time = random.randint(0,50)
+      cycle_info = {'cycle':cycle, 'time':float(time)}
+      cycle_data = {}
+      for key in random.sample(['a','b','c','d'], random.randint(1,4)):
+        cycle_data[key] = float(random.random())
+      if data is None:
+        data = dict(cycle_data)
+        for key in data:
+          data[key] = [data[key]]
+        for key in cycle_info:
+          data[key] = [cycle_info[key]]
+      else:
+        data = append_data(data, dict(cycle_data), cycle_info, 'time')
+      columns.append(cycle_data, cycle_info, 'time')
+      assert(columns.to_dict()==data)
+      assert(list(columns.keys())==list(data.keys()))
+      for key in cycle_data:
+        assert(columns.valid(key)[-1])
+    # missing values are masked instead of only being zero filled
+    for key in columns:
+      assert((columns[key][~columns.valid(key)]==0).all())
+    assert(not columns.valid('d').all())
+
+if __name__ == '__main__':
+    unittest.main()
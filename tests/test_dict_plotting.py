@@ -55,3 +55,23 @@ class test_dict_plotting(unittest.TestCase):
 
     # generate a plot given my plotting arguments, dictionary, and data name
     ploter.plot_dict(args, [data], ["my_test_dict"])
+
+  def test_plot_columnar_last_values(self):
+    '''
+    This tests that the last point and last time value plots skip the cycles
+    of columnar data that did not report the plotted values
+    '''
+    import matplotlib.pyplot as plt
+    from opppy.columnar import columnar_dictionary
+    columns = columnar_dictionary()
+    for cycle in range(6):
+      cycle_data = {'a':float(cycle)} if cycle != 4 and cycle != 5 else {'b':1.0}
+      columns.append(cycle_data, {'cycle':cycle, 'time':float(cycle)}, 'time')
+    ploter = plot_dictionary()
+    tmp_dir = tempfile.TemporaryDirectory()
+    for options, gold in [("-lpo", [3.0]), ("-lpo -ltv 1.5", [2.0, 3.0])]:
+      plt.figure()
+      args = ploter.parse_input_string("-dn density -y a -x time -sa "+tmp_dir.name+"/test.png --hide_plot "+options)
+      ploter.plot_dict(args, [{'density':columns}], ["my_test_dict"])
+      assert(list(plt.gca().lines[-1].get_ydata())==gold)
+      plt.close()
@@ -308,6 +308,14 @@ class test_opppy_dump_utils(unittest.TestCase):
         for k, v in gold_data.items():
             np.testing.assert_allclose(tracer_data[k],v)
 
+        # extract several points and values in one pass
+        tracer_x, tracer_y = extract_series_point(data,'time',["density","temperature"],['x','y','z'], [[1.0,2.0,5.0],[3.0,1.0,2.0]])
+        assert(tracer_y['density'].shape==(3,2))
+        np.testing.assert_allclose(tracer_y['density'][:,0],gold_data["tracery3"])
+        for key in ["density","temperature"]:
+            tracer_x, tracer_y2 = extract_series_point(data,'time',key,['x','y','z'], [3.0,1.0,2.0])
+            np.testing.assert_allclose(tracer_y[key][:,1],tracer_y2[key])
+
 
     
 
@@ -491,6 +499,17 @@ class test_opppy_dump_utils(unittest.TestCase):
         for k, v in  gold_data.items():
             np.testing.assert_allclose(check_data[k],v)
 
+        # several values share the interpolation weights of the line and grid
+        keys = ['temperature', 'density']
+        x, lines = data2line2d(data, 'x', 'y', keys, 2.5, 1.0, 3.5, 1.8, npts=500, method="linear")
+        np.testing.assert_allclose(lines['temperature'], gold_data['y1'])
+        for key in keys:
+            x, y = data2line2d(data, 'x', 'y', key, 2.5, 1.0, 3.5, 1.8, npts=500, method="linear")
+            np.testing.assert_allclose(lines[key], y)
+        grid = data2grid(data, 'x', 'y', keys, npts=50, method="linear")
+        for key in keys:
+            np.testing.assert_allclose(grid[key], data2grid(data, 'x', 'y', key, npts=50, method="linear")[key])
+
        
 
     def test_line_series(self):
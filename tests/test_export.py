@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# ---------------------------*-python-*----------------------------------------#
+# file   test_export.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+import sys
+
+sys.path.append('..')
+
+import os
+dir_path = os.path.dirname(os.path.realpath(__file__))+"/"
+
+import unittest
+import pickle
+import tempfile
+import numpy as np
+try:
+    import pyarrow
+    import pyarrow.parquet
+    import pyarrow.feather
+except ImportError:
+    # pyarrow is optional, the export tests are skipped without it
+    pyarrow = None
+
+from opppy.export import *
+from opppy.output import append_output_dictionary
+from opppy.storage import save_data
+from opppy.version import __version__
+
+@unittest.skipUnless(pyarrow is not None, "pyarrow is required to export tables")
+class test_opppy_export(unittest.TestCase):
+
+  def test_export_output(self):
+    '''
+    This tests that every output dictionary is exported to a table with the
+    same columns
+    '''
+    goldfile = open(dir_path+'gold_output.p', 'rb')
+    gold_data = pickle.load(goldfile)
+    goldfile.close()
+    tmp_dir = tempfile.TemporaryDirectory()
+    for extension in ['.p', '.h5']:
+      file_name = tmp_dir.name+"/output"+extension
+      save_data(gold_data, file_name)
+      for file_format in EXPORT_FORMATS:
+        directory = tmp_dir.name+"/"+file_format+extension
+        file_names = export_output(file_name, directory, file_format=file_format)
+        assert(len(file_names)==4)
+        for name in ['test_data1', 'test_data2', 'back_fill_data', 'density']:
+          table_name = directory+"/"+name+EXPORT_EXTENSIONS[file_format]
+          if file_format == 'parquet':
+            table = pyarrow.parquet.read_table(table_name)
+          else:
+            table = pyarrow.feather.read_table(table_name)
+          assert(table.column_names==list(gold_data[name].keys()))
+          for key in gold_data[name]:
+            assert(table.column(key).to_pylist()==gold_data[name][key])
+
+    # read a column subset of a single dictionary
+    export_output(file_name, tmp_dir.name+"/density", ['density'])
+    assert(os.listdir(tmp_dir.name+"/density")==['density.parquet'])
+    table = pyarrow.parquet.read_table(tmp_dir.name+"/density/density.parquet", columns=['time', 'mat2'])
+    assert(table.column('mat2').to_pylist()==gold_data['density']['mat2'])
+
+  def test_export_columnar(self):
+    '''
+    This tests that values a cycle did not report are exported as nulls
+    '''
+    from my_test_opppy_parser import my_test_opppy_parser
+    data = {'version':__version__}
+    append_output_dictionary(data, [dir_path+'output_example1.txt', dir_path+'output_example2.txt',
+        dir_path+'output_example3.txt'], my_test_opppy_parser(), columnar=True)
+    tables = output_tables(data)
+    tmp_dir = tempfile.TemporaryDirectory()
+    export_tables(tables, tmp_dir.name)
+    for name in tables:
+      table = pyarrow.parquet.read_table(tmp_dir.name+"/"+name+".parquet")
+      for key in data[name]:
+        expected = [value if valid else None for value, valid in zip(data[name][key].tolist(), data[name].valid(key))]
+        assert(table.column(key).to_pylist()==expected)
+
+  def test_export_tally(self):
+    '''
+    This tests that tallies are exported with a row per cycle bin
+    '''
+    goldfile = open(dir_path+'gold_tally.p', 'rb')
+    gold_data = pickle.load(goldfile)
+    goldfile.close()
+    tables = tally_tables(gold_data)
+    assert(list(tables.keys())==['tally_cycle_data', 'cool_counts'])
+    tmp_dir = tempfile.TemporaryDirectory()
+    file_name = tmp_dir.name+"/tally.p"
+    save_data(gold_data, file_name)
+    export_tally(file_name, tmp_dir.name+"/tables")
+
+    scalars = pyarrow.parquet.read_table(tmp_dir.name+"/tables/tally_cycle_data.parquet")
+    assert(scalars.column('time').to_pylist()==gold_data['time'])
+    assert(scalars.column('n_odd_counts').to_pylist()==[cycle_data['n_odd_counts'] for cycle_data in gold_data['tally_cycle_data']])
+
+    counts = pyarrow.parquet.read_table(tmp_dir.name+"/tables/cool_counts.parquet")
+    assert(counts.column_names==['cycle', 'time', 'bins', 'odd_counts', 'even_counts'])
+    odd_counts = np.concatenate([cycle_data['cool_counts']['odd_counts'] for cycle_data in gold_data['tally_cycle_data']])
+    assert(np.array_equal(counts.column('odd_counts').to_numpy(), odd_counts))
+    cycles = np.concatenate([[cycle]*len(cycle_data['cool_counts']['bins']) for cycle, cycle_data in zip(gold_data['cycle'], gold_data['tally_cycle_data'])])
+    assert(np.array_equal(counts.column('cycle').to_numpy(), cycles))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -31,8 +31,11 @@ class test_interactive_utils(unittest.TestCase):
         assert(os.system("python my_interactive_parser.py tally pickle -h")==0)
         assert(os.system("python my_interactive_parser.py tally iplot -h")==0)
         assert(os.system("python my_interactive_parser.py tally plot -h")==0)
+        assert(os.system("python my_interactive_parser.py tally export -h")==0)
         assert(os.system("python my_interactive_parser.py output -h")==0)
         assert(os.system("python my_interactive_parser.py output pickle -h")==0)
+        assert(os.system("python my_interactive_parser.py output follow -h")==0)
+        assert(os.system("python my_interactive_parser.py output export -h")==0)
         assert(os.system("python my_interactive_parser.py output iplot -h")==0)
         assert(os.system("python my_interactive_parser.py output plot -h")==0)
         assert(os.system("python my_interactive_parser.py dump -h")==0)
@@ -52,6 +55,34 @@ class test_interactive_utils(unittest.TestCase):
         assert(os.system("python my_interactive_parser.py output pickle -nt 2 -pf "+tmp_dir_path+"interactive.p -of "+dir_path+"output_example*.txt")==0)
         # Test no threads
         assert(os.system("python my_interactive_parser.py output pickle -pf "+tmp_dir_path+"interactive.p -of "+dir_path+"output_example*.txt")==0)
+        # append to a journal and compact it
+        assert(os.system("python my_interactive_parser.py output pickle -j -ci -pf "+tmp_dir_path+"journal.p -of "+dir_path+"output_example1.txt")==0)
+        assert(os.system("python my_interactive_parser.py output pickle -j -ci -mjf 100 -pf "+tmp_dir_path+"journal.p -of "+dir_path+"output_example2.txt")==0)
+        assert(os.path.isfile(tmp_dir_path+"journal.p.journal"))
+        assert(os.system("python my_interactive_parser.py output plot -pf "+tmp_dir_path+"journal.p -dn density -x time -y mat1 -sa "+tmp_dir_path+"density_mat1_journal.png -hp")==0)
+        assert(os.system("python my_interactive_parser.py output pickle -j -cj -ci -pf "+tmp_dir_path+"journal.p -of "+dir_path+"output_example3.txt")==0)
+        assert(not os.path.isfile(tmp_dir_path+"journal.p.journal"))
+        # concurrent ingest processes write shards that are merged on read
+        assert(os.system("python my_interactive_parser.py output pickle -sh -pf "+tmp_dir_path+"shard.p -of "+dir_path+"output_example2.txt")==0)
+        assert(os.system("python my_interactive_parser.py output pickle -sh -pf "+tmp_dir_path+"shard.p -of "+dir_path+"output_example1.txt")==0)
+        assert(len(os.listdir(tmp_dir_path+"shard.p.shards"))==2)
+        assert(os.system("python my_interactive_parser.py output plot -pf "+tmp_dir_path+"shard.p -dn density -x time -y mat1 -sa "+tmp_dir_path+"density_mat1_shard.png -hp")==0)
+        # the next append merges the shards into the pickle file
+        assert(os.system("python my_interactive_parser.py output pickle -pf "+tmp_dir_path+"shard.p -of "+dir_path+"output_example3.txt")==0)
+        assert(len(os.listdir(tmp_dir_path+"shard.p.shards"))==0)
+        # compressed pickle files
+        assert(os.system("python my_interactive_parser.py output pickle -z lzma+shuffle -pf "+tmp_dir_path+"compressed.p -of "+dir_path+"output_example*.txt")==0)
+        # export two dictionaries to Arrow tables
+        assert(os.system("python my_interactive_parser.py output export -ef arrow -dn density test_data1 -pf "+tmp_dir_path+"compressed.p -ed "+tmp_dir_path+"tables")==0)
+        assert(sorted(os.listdir(tmp_dir_path+"tables"))==['density.arrow', 'test_data1.arrow'])
+        assert(os.system("python my_interactive_parser.py output plot -pf "+tmp_dir_path+"compressed.p -dn density -x time -y mat1 -sa "+tmp_dir_path+"density_mat1_compressed.png -hp")==0)
+
+    def test_follow_output(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        tmp_dir_path = tmp_dir.name+"/"
+        # follow the output files for a single update
+        assert(os.system("python my_interactive_parser.py output follow -i 0 -mu 1 -pf "+tmp_dir_path+"follow.p -of "+dir_path+"output_example*.txt")==0)
+        assert(os.path.isfile(tmp_dir_path+"follow.p.index"))
 
     def test_plot_pickle(self):
         tmp_dir = tempfile.TemporaryDirectory()
@@ -60,6 +91,9 @@ class test_interactive_utils(unittest.TestCase):
         assert(os.system("python my_interactive_parser.py output pickle -pf "+tmp_dir_path+"interactive.p -of "+dir_path+"output_example*.txt")==0)
         # This uses glob to pickle all the output data
         assert(os.system("python my_interactive_parser.py output iplot -pf "+tmp_dir_path+"interactive.p < "+dir_path+"interactive_input.txt")==0)
+        # plot a lazily loaded split pickle
+        assert(os.system("python my_interactive_parser.py output pickle -pf "+tmp_dir_path+"interactive.opp -of "+dir_path+"output_example*.txt")==0)
+        assert(os.system("python my_interactive_parser.py output iplot -pf "+tmp_dir_path+"interactive.opp < "+dir_path+"interactive_input.txt")==0)
         # parse and plot the output data files
         assert(os.system("python my_interactive_parser.py output iplot -of "+dir_path+"output_example*.txt < "+dir_path+"interactive_input.txt")==0)
         # parse and plot the output data files with threads
@@ -76,6 +110,26 @@ class test_interactive_utils(unittest.TestCase):
         assert(os.system("python my_interactive_parser.py output plot -of "+dir_path+"output_example*.txt -dn density -x time -y mat1 -sa "+tmp_dir_path+"density_mat1_pp.png -hp")==0)
         # parse and plot the output data files with threads 
         assert(os.system("python my_interactive_parser.py output plot -nt -1 -of "+dir_path+"output_example*.txt -dn density -x time -y mat1 -sa "+tmp_dir_path+"density_mat1_pp.png -hp")==0)
+        # pickle and plot columnar data
+        assert(os.system("python my_interactive_parser.py output pickle -col -pf "+tmp_dir_path+"columnar.p -of "+dir_path+"output_example*.txt")==0)
+        assert(os.system("python my_interactive_parser.py output plot -pf "+tmp_dir_path+"columnar.p -dn density -x time -y mat1 -sa "+tmp_dir_path+"density_mat1_col.png -hp")==0)
+        assert(os.system("python my_interactive_parser.py output plot -col -of "+dir_path+"output_example*.txt -dn density -x time -y mat1 -sa "+tmp_dir_path+"density_mat1_col_pp.png -hp")==0)
+        # profile parsing, pickling and plotting
+        assert(os.system("python my_interactive_parser.py output pickle -prof -nt 2 -pf "+tmp_dir_path+"profile.p -of "+dir_path+"output_example*.txt")==0)
+        assert(os.system("python my_interactive_parser.py output plot -prof -of "+dir_path+"output_example*.txt -dn density -x time -y mat1 -sa "+tmp_dir_path+"density_mat1_prof.png -hp")==0)
+        # save, append and plot an HDF5 data file
+        assert(os.system("python my_interactive_parser.py output pickle -pf "+tmp_dir_path+"interactive.h5 -of "+dir_path+"output_example1.txt")==0)
+        assert(os.system("python my_interactive_parser.py output pickle -pf "+tmp_dir_path+"interactive.h5 -of "+dir_path+"output_example2.txt "+dir_path+"output_example3.txt")==0)
+        assert(os.system("python my_interactive_parser.py output plot -pf "+tmp_dir_path+"interactive.h5 -dn density -x time -y mat1 -sa "+tmp_dir_path+"density_mat1_h5.png -hp")==0)
+        # save and plot a lazily loaded split pickle
+        assert(os.system("python my_interactive_parser.py output pickle -col -pf "+tmp_dir_path+"interactive.opp -of "+dir_path+"output_example*.txt")==0)
+        assert(os.system("python my_interactive_parser.py output plot -pf "+tmp_dir_path+"interactive.opp -dn density -x time -y mat1 -sa "+tmp_dir_path+"density_mat1_opp.png -hp")==0)
+        # load many pickle files with threads and a memory budget
+        assert(os.system("python my_interactive_parser.py output plot -pf "+tmp_dir_path+"interactive.p "+tmp_dir_path+"interactive.opp "+tmp_dir_path+"interactive.p -nt 2 -rb 0.01 -dn density -x time -y mat1 -sa "+tmp_dir_path+"density_mat1_threads.png -hp")==0)
+        # parse the output files once into a parse cache and plot them again from the cache
+        assert(os.system("python my_interactive_parser.py output plot -pc "+tmp_dir_path+"cache -of "+dir_path+"output_example*.txt -dn density -x time -y mat1 -sa "+tmp_dir_path+"density_mat1_cache.png -hp")==0)
+        assert(len(os.listdir(tmp_dir_path+"cache"))>0)
+        assert(os.system("python my_interactive_parser.py output plot -pc "+tmp_dir_path+"cache -of "+dir_path+"output_example*.txt -dn density -x time -y mat1 -sa "+tmp_dir_path+"density_mat1_cache.png -hp")==0)
 
     def test_pickle_dumps(self):
         tmp_dir = tempfile.TemporaryDirectory()
@@ -102,6 +156,22 @@ class test_interactive_utils(unittest.TestCase):
         # plot a 1d dump from a pickle file
         assert(os.system("python my_interactive_parser.py dump 1d -dn example_dump.txt -pf "+tmp_dir_path+"interactive_dump.p -x cell_id -y temperature")==0)
 
+        # plot a 1d dump from an HDF5 data file
+        assert(os.system("python my_interactive_parser.py dump pickle -pf "+tmp_dir_path+"interactive_dump.h5 -df "+dir_path+"example_dump.txt")==0)
+        assert(os.system("python my_interactive_parser.py dump pickle -pf "+tmp_dir_path+"interactive_dump.h5 -df "+dir_path+"example_dump2.txt")==0)
+        assert(os.system("python my_interactive_parser.py dump 1d -dn example_dump2.txt -pf "+tmp_dir_path+"interactive_dump.h5 -x cell_id -y temperature")==0)
+
+        # plot dumps from shards
+        assert(os.system("python my_interactive_parser.py dump pickle -sh -pf "+tmp_dir_path+"shard_dump.p -df "+dir_path+"example_dump.txt")==0)
+        assert(os.system("python my_interactive_parser.py dump 1d -dn example_dump.txt -pf "+tmp_dir_path+"shard_dump.p -x cell_id -y temperature")==0)
+
+        # plot memory mapped dumps from a NumPy directory store
+        assert(os.system("python my_interactive_parser.py dump pickle -pf "+tmp_dir_path+"interactive_dump.npyd -df "+dir_path+"example_dump.txt")==0)
+        assert(os.system("python my_interactive_parser.py dump pickle -pf "+tmp_dir_path+"interactive_dump.npyd -df "+dir_path+"example_dump2.txt")==0)
+        assert(os.system("python my_interactive_parser.py dump 1d -dn example_dump2.txt -pf "+tmp_dir_path+"interactive_dump.npyd -x cell_id -y temperature")==0)
+        assert(os.system("python my_interactive_parser.py dump 2d -dn example_dump.txt -pf "+tmp_dir_path+"interactive_dump.npyd -x cell_id -y z -d density")==0)
+        assert(os.system("python my_interactive_parser.py dump 3d -dn example_dump.txt -pf "+tmp_dir_path+"interactive_dump.npyd -x z -y y -z x -zs 5.0 -d temperature")==0)
+
         # Parse and plot a 2d dump
         assert(os.system("python my_interactive_parser.py dump 2d -dn "+dir_path+"example_dump.txt -x cell_id -y z -d temperature")==0)
 
@@ -141,6 +211,9 @@ class test_interactive_utils(unittest.TestCase):
         # plot a point series from a pickled dump
         assert(os.system("python my_interactive_parser.py dump point -pf "+tmp_dir_path+"interactive_dump.p "+tmp_dir_path+"interactive_dump.p -dk x -p 5 -s time -d temperature")==0)
 
+        # plot several point series from a pickled dump
+        assert(os.system("python my_interactive_parser.py dump point -pf "+tmp_dir_path+"interactive_dump.p -dk x -p 1 -p 5 -p 9 -s time -d temperature")==0)
+
         # plot a line series from a pickled dump
         assert(os.system("python my_interactive_parser.py dump line -pf "+tmp_dir_path+"interactive_dump.p "+tmp_dir_path+"interactive_dump.p -dk x -p0 1 -p1 5 -s time -d temperature")==0)
 
@@ -150,6 +223,12 @@ class test_interactive_utils(unittest.TestCase):
         # plot a contour series slice from a 3d pickled dump
         assert(os.system("python my_interactive_parser.py dump contour -pf "+tmp_dir_path+"interactive_dump.p -dk z y x -zs 5 -s time -d temperature -ls")==0)
 
+        # plot point and line series from a lazily loaded split pickle
+        assert(os.system("python my_interactive_parser.py dump pickle -pf "+tmp_dir_path+"interactive_dump.opp -df "+dir_path+"example_dump*.txt")==0)
+        assert(os.system("python my_interactive_parser.py dump point -pf "+tmp_dir_path+"interactive_dump.opp -dk x -p 5 -s time -d temperature")==0)
+        assert(os.system("python my_interactive_parser.py dump line -pf "+tmp_dir_path+"interactive_dump.opp -dk x -p0 1 -p1 5 -s time -d temperature")==0)
+        assert(os.system("python my_interactive_parser.py dump contour -pf "+tmp_dir_path+"interactive_dump.opp -dk x y -s time -d temperature -np 5 -ls")==0)
+
     def test_pickle_tally(self):
         tmp_dir = tempfile.TemporaryDirectory()
         tmp_dir_path = tmp_dir.name+"/"
@@ -159,6 +238,9 @@ class test_interactive_utils(unittest.TestCase):
         assert(os.system("python my_interactive_parser.py tally pickle -nt 2 -pf "+tmp_dir_path+"interactive_tally.p -tf "+dir_path+"example_tally*.txt")==0)
         # Test Serial parsing
         assert(os.system("python my_interactive_parser.py tally pickle -pf "+tmp_dir_path+"interactive_tally.p -tf "+dir_path+"example_tally*.txt")==0)
+        # export the tallies to Parquet tables
+        assert(os.system("python my_interactive_parser.py tally export -pf "+tmp_dir_path+"interactive_tally.p -ed "+tmp_dir_path+"tables")==0)
+        assert(sorted(os.listdir(tmp_dir_path+"tables"))==['cool_counts.parquet', 'tally_cycle_data.parquet'])
 
     def test_plot_tally(self):
         tmp_dir = tempfile.TemporaryDirectory()
@@ -175,6 +257,11 @@ class test_interactive_utils(unittest.TestCase):
         assert(os.system("python my_interactive_parser.py tally plot -tf "+dir_path+"example_tally*.txt -sk cycle -dn cool_counts -x bins -xlab 'bin [#]'  -y odd_counts  -ylab 'Counts [#]'")==0)
         assert(os.system("python my_interactive_parser.py tally plot -tf "+dir_path+"example_tally*.txt -sk cycle -dn cool_counts -x cycle -xlab 'Cycle [#]'  -y odd_counts.0  -ylab 'Counts[0] [#]'")==0)
         assert(os.system("python my_interactive_parser.py tally plot -pf "+tmp_dir_path+"interactive_tally.p -sk time -sv 5.0 -dn cool_counts -x bins -xlab 'bin [#]'  -y even_counts  -ylab 'Counts [#]'")==0)
+        # plot a lazily loaded split pickle
+        assert(os.system("python my_interactive_parser.py tally pickle -pf "+tmp_dir_path+"interactive_tally.opp -tf "+dir_path+"example_tally*.txt")==0)
+        assert(os.system("python my_interactive_parser.py tally plot -pf "+tmp_dir_path+"interactive_tally.opp -sk time -sv 5.0 -dn cool_counts -x bins -xlab 'bin [#]'  -y even_counts  -ylab 'Counts [#]'")==0)
+        assert(os.system("python my_interactive_parser.py tally plot -pf "+tmp_dir_path+"interactive_tally.opp -sk cycle -dn cool_counts -x cycle -xlab 'Cycle [#]'  -y odd_counts.0  -ylab 'Counts[0] [#]'")==0)
+        assert(os.system("python my_interactive_parser.py tally iplot -pf "+tmp_dir_path+"interactive_tally.opp < "+dir_path+"interactive_tally_input.txt")==0)
         # parse and plot the output data files with threads
         assert(os.system("python my_interactive_parser.py tally plot -nt -1 -tf "+dir_path+"example_tally*.txt -sk cycle -dn cool_counts -x bins -xlab 'bin [#]'  -y odd_counts  -ylab 'Counts [#]'")==0)
         # test scaling and log axis
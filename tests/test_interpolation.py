@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# ---------------------------*-python-*----------------------------------------#
+# file   test_interpolation.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+import sys
+
+sys.path.append('..')
+
+import os
+dir_path = os.path.dirname(os.path.realpath(__file__))+"/"
+
+import unittest
+import numpy as np
+from scipy.interpolate import griddata
+
+import opppy.interpolation
+from opppy.interpolation import *
+
+class test_opppy_interpolation(unittest.TestCase):
+
+  def test_interpolate(self):
+    '''
+    This tests that interpolate matches griddata for every method and the
+    query shapes used by dump_utils
+    '''
+    rng = np.random.default_rng(1)
+    npts = 300
+    x, y, z = rng.random(npts), rng.random(npts), rng.random(npts)
+    values = rng.random(npts)
+    xi, yi = np.mgrid[0:1:15j, 0:1:15j]
+    xs, ys, zs = np.mgrid[0:1:8j, 0:1:8j, 0.5:0.5:1j]
+    cases = [(x, [0.25]), (x, np.linspace(-0.2, 1.2, 40)),
+             ((x, y), ([0.25], [0.75])), ((x, y), (xi, yi)), ((x, y), (np.linspace(0, 1, 20), np.linspace(1, 0, 20))),
+             ((x, y, z), ([0.25], [0.5], [0.75])), ((x, y, z), (xs, ys, zs))]
+    for points, query in cases:
+      for method in ['nearest', 'linear', 'cubic']:
+        if isinstance(points, tuple) and len(points) == 3 and method == 'cubic':
+          continue
+        gold = griddata(points, values, query, method)
+        result = interpolate(points, values, query, method)
+        assert(result.shape==gold.shape)
+        assert(np.allclose(result, gold, equal_nan=True))
+
+  def test_weights(self):
+    '''
+    This tests that the weights of fixed query points interpolate any values
+    like griddata
+    '''
+    rng = np.random.default_rng(3)
+    npts = 300
+    x, y, z = rng.random(npts), rng.random(npts), rng.random(npts)
+    xi, yi = np.mgrid[-0.1:1.1:15j, 0:1:15j]
+    xs, ys, zs = np.mgrid[0:1:8j, 0:1:8j, 0.5:0.5:1j]
+    cases = [(x, np.linspace(-0.2, 1.2, 40)), ((x, y), ([0.25], [0.75])), ((x, y), (xi, yi)),
+             ((x, y, z), (xs, ys, zs))]
+    for points, query in cases:
+      for method in ['nearest', 'linear', 'cubic']:
+        if isinstance(points, tuple) and len(points) == 3 and method == 'cubic':
+          continue
+        weights = get_interpolation_plan(points).weights(query, method)
+        for variable in range(3):
+          values = rng.random(npts)
+          gold = griddata(points, values, query, method)
+          result = weights(values)
+          assert(result.shape==gold.shape)
+          assert(np.allclose(result, gold, equal_nan=True))
+
+  def test_structured(self):
+    '''
+    This tests that tensor product grids are detected (in any point order)
+    and linearly interpolated like a regular grid
+    '''
+    from scipy.interpolate import RegularGridInterpolator
+    rng = np.random.default_rng(4)
+    axes = (np.sort(rng.random(7)), np.sort(rng.random(5)), np.sort(rng.random(4)))
+    grid_values = rng.random((7, 5, 4))
+    x, y, z = [coordinate.ravel() for coordinate in np.meshgrid(*axes, indexing='ij')]
+    order = rng.permutation(len(x))
+    points = (x[order], y[order], z[order])
+    values = grid_values.ravel()[order]
+    plan = get_interpolation_plan(points)
+    assert(plan.grid() is not None)
+    xs, ys, zs = np.mgrid[-0.1:1.1:9j, 0:1:9j, 0.3:0.3:1j]
+    gold = RegularGridInterpolator(axes, grid_values, bounds_error=False, fill_value=np.nan)((xs, ys, zs))
+    result = interpolate(points, values, (xs, ys, zs), 'linear')
+    assert(np.allclose(result, gold, equal_nan=True))
+    assert(np.allclose(plan.weights((xs, ys, zs), 'linear')(values), gold, equal_nan=True))
+    # nearest values match griddata
+    assert(np.allclose(interpolate(points, values, (xs, ys, zs), 'nearest'), griddata(points, values, (xs, ys, zs), 'nearest')))
+    # the grid is exact at the mesh points and can be turned off
+    x, y = [coordinate.ravel() for coordinate in np.meshgrid(*axes[:2], indexing='ij')]
+    assert(np.allclose(interpolate((x, y), x*y, (x, y), 'linear', structured=True), x*y))
+    assert(get_interpolation_plan(points, structured=False).grid() is None)
+    # scattered points are not a grid
+    scattered = (rng.random(20), rng.random(20))
+    assert(get_interpolation_plan(scattered).grid() is None)
+    with self.assertRaises(ValueError):
+      get_interpolation_plan(scattered, structured=True).grid()
+
+  def test_plan_cache(self):
+    '''
+    This tests that plans are shared by meshes with the same coordinates and
+    the least recently used plans are dropped
+    '''
+    clear_interpolation_plans()
+    rng = np.random.default_rng(2)
+    x, y = rng.random(100), rng.random(100)
+    plan = get_interpolation_plan((x, y))
+    # a copy of the mesh (i.e. the next dump) reuses the plan and its geometry
+    assert(get_interpolation_plan((x.copy(), y.copy())) is plan)
+    interpolate((x, y), x+y, ([0.5], [0.5]), 'linear')
+    triangulation = plan.triangulation()
+    interpolate((x.copy(), y.copy()), x*y, ([0.5], [0.5]), 'linear')
+    assert(plan.triangulation() is triangulation)
+    # a moved mesh is a new plan
+    assert(get_interpolation_plan((x, y+1.0)) is not plan)
+
+    for shift in range(opppy.interpolation.PLAN_CACHE_SIZE):
+      get_interpolation_plan((x+shift+2.0, y))
+    assert(get_interpolation_plan((x, y)) is not plan)
+    assert(len(opppy.interpolation._plans)==opppy.interpolation.PLAN_CACHE_SIZE)
+
+    # the plans are also limited by their estimated memory
+    clear_interpolation_plans()
+    plan = get_interpolation_plan((x, y))
+    nbytes = plan.nbytes()
+    plan.triangulation()
+    assert(plan.nbytes() > 10*nbytes)
+    cache_bytes = opppy.interpolation.PLAN_CACHE_BYTES
+    opppy.interpolation.PLAN_CACHE_BYTES = plan.nbytes()+nbytes
+    try:
+      get_interpolation_plan((x+1.0, y))
+      assert(len(opppy.interpolation._plans)==2)
+      get_interpolation_plan((x+1.0, y)).triangulation()
+      get_interpolation_plan((x+2.0, y))
+      # the oldest triangulation is dropped
+      assert(len(opppy.interpolation._plans)==2 and plan not in opppy.interpolation._plans.values())
+    finally:
+      opppy.interpolation.PLAN_CACHE_BYTES = cache_bytes
+    clear_interpolation_plans()
+    assert(len(opppy.interpolation._plans)==0)
+
+
+if __name__ == '__main__':
+    unittest.main()
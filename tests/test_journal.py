@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# ---------------------------*-python-*----------------------------------------#
+# file   test_journal.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+import sys
+
+sys.path.append('..')
+
+import os 
+dir_path = os.path.dirname(os.path.realpath(__file__))+"/"
+
+import unittest
+import pickle
+import shutil
+import tempfile
+
+from opppy.journal import *
+from opppy.output import *
+from opppy.storage import load_data
+
+class test_opppy_journal(unittest.TestCase):
+
+  def test_append_output_journal(self):
+    '''
+    This tests that replaying and compacting journaled restarts matches the
+    gold output data
+    '''
+    from my_test_opppy_parser import my_test_opppy_parser
+    opppy_parser = my_test_opppy_parser()
+    goldfile = open(dir_path+'gold_output.p', 'rb')
+    gold_data = pickle.load(goldfile)
+    goldfile.close()
+    gold_data.pop('version')
+    tmp_dir = tempfile.TemporaryDirectory()
+
+    for extension in ['.p', '.opp', '.h5']:
+      file_name = tmp_dir.name+"/journal"+extension
+      append_output_journal(file_name, [dir_path+"output_example1.txt"], opppy_parser)
+      assert(journal_fraction(file_name)==float('inf'))
+      compact_journal(file_name)
+      assert(not os.path.isfile(journal_name(file_name)))
+      append_output_journal(file_name, [dir_path+"output_example2.txt"], opppy_parser)
+      append_output_journal(file_name, [dir_path+"output_example3.txt"], opppy_parser)
+      header, segments, end = read_journal(file_name)
+      assert(len(segments)==2)
+
+      # the journal is replayed by load_data
+      data = load_data(file_name)
+      data.pop('version')
+      assert(data==gold_data)
+
+      # a partially written segment is ignored and replaced by the next append
+      journal_file = open(journal_name(file_name), 'ab')
+      journal_file.write(b'\x01\x02\x03')
+      journal_file.close()
+      assert(len(read_journal(file_name)[1])==2)
+      assert(journal_header(file_name)==(read_journal(file_name)[0], read_journal(file_name)[2]))
+      append_output_journal(file_name, [dir_path+"output_example3.txt"], opppy_parser)
+      assert(len(read_journal(file_name)[1])==3)
+      data = load_data(file_name)
+      data.pop('version')
+      assert(data.pop('appended_files')==gold_data['appended_files']+['output_example3.txt'])
+      assert(data==dict((key, value) for key, value in gold_data.items() if key != 'appended_files'))
+
+      # copies of the data file keep their journal
+      copy_name = tmp_dir.name+"/copy"+extension
+      shutil.copy(file_name, copy_name)
+      shutil.copy(journal_name(file_name), journal_name(copy_name))
+      assert(load_data(copy_name)==load_data(file_name))
+      assert(journal_header(copy_name)[1]==journal_header(file_name)[1]>0)
+
+      # a journal left behind by an interrupted compaction is ignored
+      shutil.copy(journal_name(file_name), tmp_dir.name+"/old.journal")
+      compact_journal(file_name)
+      shutil.copy(tmp_dir.name+"/old.journal", journal_name(file_name))
+      assert(read_journal(file_name)[0] is None)
+      data = load_data(file_name)
+      data.pop('version')
+      assert(len(data['appended_files'])==4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# ---------------------------*-python-*----------------------------------------#
+# file   test_migration.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+import sys
+
+sys.path.append('..')
+
+import os
+dir_path = os.path.dirname(os.path.realpath(__file__))+"/"
+
+import unittest
+import pickle
+import tempfile
+
+from opppy.migration import *
+from opppy.migration import _migrations
+from opppy.output import *
+from opppy.storage import load_data, save_data
+from opppy.version import __version__
+
+class test_opppy_migration(unittest.TestCase):
+
+  def test_migrate_data(self):
+    '''
+    This tests that migrations are chained up to the current version and
+    report the keys they changed
+    '''
+    @register_migration('0.0.8', '0.0.9')
+    def rename_cycles(data):
+      if 'cycles' in data:
+        data['cycle_data'] = data.pop('cycles')
+        return ['cycles', 'cycle_data']
+      return []
+    register_migration('0.0.9', '0.1.0', lambda data: [])
+    try:
+      assert([version for version, function in migration_path('0.0.8')][:3]==['0.0.9', '0.1.0', '0.1.1'])
+      assert(migration_path(__version__)==[])
+      assert(migration_path('9.9.9') is None)
+      data = {'version':'0.0.8', 'cycles':{'time':[0.0, 1.0]}}
+      assert(migrate_data(data)==['cycles', 'cycle_data'])
+      assert(data=={'version':__version__, 'cycle_data':{'time':[0.0, 1.0]}})
+      # data with the current version is left alone
+      assert(migrate_data(data)==[])
+    finally:
+      _migrations.pop('0.0.8')
+      _migrations.pop('0.0.9')
+
+  def test_migrate_file(self):
+    '''
+    This tests that data files written by an older OPPPY are upgraded in
+    place without changing their data
+    '''
+    goldfile = open(dir_path+'gold_output.p', 'rb')
+    gold_data = pickle.load(goldfile)
+    goldfile.close()
+    assert(gold_data['version']!=__version__)
+    tmp_dir = tempfile.TemporaryDirectory()
+    for extension in ['.p', '.opp', '.h5', '.npyd']:
+      file_name = tmp_dir.name+"/old"+extension
+      save_data(gold_data, file_name)
+      # loading can upgrade the data in memory and leave the file alone
+      assert(load_data(file_name, migrate=True)['version']==__version__)
+      assert(load_data(file_name)['version']==gold_data['version'])
+      assert(migrate_file(file_name))
+      assert(not migrate_file(file_name))
+      data = load_data(file_name)
+      assert(data['version']==__version__)
+      data.pop('version')
+      assert(data=={key:value for key, value in gold_data.items() if key != 'version'})
+
+    # split pickle files only append the new version and table of contents
+    file_name = tmp_dir.name+"/big.opp"
+    gold_data['big'] = list(range(100000))
+    save_data(gold_data, file_name)
+    size = os.path.getsize(file_name)
+    migrate_file(file_name)
+    assert(os.path.getsize(file_name)-size < 4096)
+
+  def test_append_old_data(self):
+    '''
+    This tests that older data dictionaries are upgraded before new cycles
+    are appended and newer data dictionaries are rejected
+    '''
+    from my_test_opppy_parser import my_test_opppy_parser
+    opppy_parser = my_test_opppy_parser()
+    goldfile = open(dir_path+'gold_output.p', 'rb')
+    gold_data = pickle.load(goldfile)
+    goldfile.close()
+    gold_data.pop('version')
+
+    data = {'version':'0.1.0'}
+    append_output_dictionary(data, [dir_path+'output_example1.txt', dir_path+'output_example2.txt',
+        dir_path+'output_example3.txt'], opppy_parser)
+    assert(data['version']==__version__)
+    data.pop('version')
+    assert(data==gold_data)
+
+    with self.assertRaises(SystemExit):
+      append_output_dictionary({'version':'9.9.9'}, [dir_path+'output_example1.txt'], opppy_parser)
+
+
+if __name__ == '__main__':
+    unittest.main()
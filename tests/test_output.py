@@ -53,6 +53,43 @@ class test_opppy_outputs(unittest.TestCase):
     print("Bad start cycle string so no data:", cycle_strings6)
     assert(len(cycle_strings6)==0)
   
+  def test_iter_output_lines(self):
+    '''
+    This tests that the streaming iter_output_lines generator yields the same
+    cycle strings as get_output_lines one cycle at a time.
+    '''
+    import types
+    cycle_iter = iter_output_lines(dir_path+"example_output.txt","#cycle","#cycle","#end of file")
+    assert(isinstance(cycle_iter, types.GeneratorType))
+    cycle_strings = list(cycle_iter)
+    assert(cycle_strings==get_output_lines(dir_path+"example_output.txt","#cycle","#cycle","#end of file"))
+    assert(cycle_strings[0]=="#cycle 1\nsome data here \n\n")
+    assert(cycle_strings[1]=="#cycle 2\nsome more data here\n\n#end of file \n")
+    for opening, closing in [("#","#"),("#cycle 2","#"),("#","junk")]:
+      assert(list(iter_output_lines(dir_path+"example_output.txt",opening,closing))==
+             get_output_lines(dir_path+"example_output.txt",opening,closing))
+  
+  def test_get_output_offsets(self):
+    '''
+    This tests that the memory mapped offset scanner locates the same cycle
+    strings as the line based get_output_lines.
+    '''
+    for opening, closing, file_end in [("#cycle","#cycle","#end of file"),("#cycle","#cycle",None),
+                                       ("#cycle 2","#",None),("#","#",None),("#","junk",None),
+                                       ("junk","#",None),("#","\n","#end of file")]:
+      offsets = get_output_offsets(dir_path+"example_output.txt",opening,closing,file_end)
+      cycle_strings = get_output_lines(dir_path+"example_output.txt",opening,closing,file_end)
+      assert(len(offsets)==len(cycle_strings))
+      assert(list(iter_output_cycles(dir_path+"example_output.txt",offsets))==cycle_strings)
+      assert(get_output_lines(dir_path+"example_output.txt",opening,closing,file_end,use_mmap=True)==cycle_strings)
+    # the tally example uses the special blank line closing string
+    tally_strings = get_output_lines(dir_path+"example_tally1.txt","cycle","\n")
+    offsets = get_output_offsets(dir_path+"example_tally1.txt","cycle","\n")
+    assert(list(iter_output_cycles(dir_path+"example_tally1.txt",offsets))==tally_strings)
+    # scanning can resume from the end of the last complete cycle
+    offsets = get_output_offsets(dir_path+"output_example1.txt","#","#")
+    assert(get_output_offsets(dir_path+"output_example1.txt","#","#",start=offsets[1][1])==offsets[2:])
+  
   def test_extract_cycle_data(self):
     '''
     This tests the extract cycle data. 
@@ -157,3 +194,155 @@ class test_opppy_outputs(unittest.TestCase):
     data3.pop('version')
     assert(data3==gold_data)
 
+  def test_append_problem_data(self):
+    '''
+    This tests that shared problem data is only checked when it changes
+    '''
+    import numpy as np
+    cycles = [{'problem_data':{'bins':np.arange(5.0), 'nbins':5}} for cycle in range(3)]
+    cycles.append({'problem_data':{'bins':[0.0,1.0,2.0,3.0,4.0], 'name':'test'}})
+    cycles = list(share_problem_data(cycles))
+    assert(cycles[0]['problem_data'] is cycles[2]['problem_data'])
+    assert(cycles[3]['problem_data'] is not cycles[0]['problem_data'])
+    checked = {}
+    data = {}
+    for cycle_data in cycles[:3]:
+      append_problem_data(cycle_data, data, checked)
+      assert(checked['problem_data'] is data['problem_data'])
+    # new keys are added to the problem data
+    append_problem_data(cycles[3], data, checked)
+    assert(list(data['problem_data'].keys())==['bins','nbins','name'])
+    assert(problem_data_fingerprint({'a':1})==problem_data_fingerprint({'a':1}))
+    assert(problem_data_fingerprint({'a':1})!=problem_data_fingerprint({'a':2}))
+    assert(problem_data_fingerprint({'a':(value for value in [])}) is None)
+    # changed problem data is still an error
+    with self.assertRaises(SystemExit):
+      append_problem_data({'problem_data':{'bins':np.arange(1.0,6.0)}}, data, checked)
+
+    # the cycles of a parsed file share their problem data
+    sys.path.append(dir_path)
+    from my_test_opppy_tally_parser import my_test_opppy_tally_parser
+    for nthreads in [0, 2]:
+      cycles = [cycle_data for file_name, cycle_data in iter_output_cycle_data([dir_path+'example_tally1.txt'], my_test_opppy_tally_parser(), nthreads)]
+      assert(len(cycles) > 1 and all(cycle_data['problem_data'] is cycles[0]['problem_data'] for cycle_data in cycles))
+
+  def test_append_cycle_data_list(self):
+    '''
+    This tests that appending a list of restarted and out of order cycles
+    matches appending the cycles one at a time
+    '''
+    import copy
+    def build_cycles(times):
+      cycles = []
+      for cycle, time in enumerate(times):
+        cycle_data = {'cycle_info':{'cycle':cycle, 'time':float(time)}, 'test_data':{'a':float(time)}}
+        if cycle%3 == 0:
+          cycle_data['test_data']['b'] = 2.0*time
+          cycle_data['other_data'] = {'c':1.0}
+        cycles.append(cycle_data)
+      return cycles
+
+    data = append_cycle_data_list(build_cycles(range(20)), {}, 'time')
+    # restart at time 10 with a second restart at time 15 part way through
+    new_cycles = build_cycles([10,11,12,13,14,15,16,17,15,16,4,5,6,7,30])
+    gold_data = copy.deepcopy(data)
+    for cycle_data in copy.deepcopy(new_cycles):
+      gold_data = append_cycle_data(cycle_data, gold_data, 'time')
+    data = append_cycle_data_list(new_cycles, data, 'time')
+    assert(data==gold_data)
+    assert(list(data.keys())==list(gold_data.keys()))
+    assert(data['test_data']['time']==[0.0,1.0,2.0,3.0,4.0,5.0,6.0,7.0,30.0])
+
+  def test_cycle_index(self):
+    '''
+    This tests that a cycle index lets a growing output file be appended to
+    an existing dictionary by only parsing its new cycles.
+    '''
+    import tempfile
+    from my_test_opppy_parser import my_test_opppy_parser
+    from opppy.version import __version__
+    opppy_parser = my_test_opppy_parser()
+    tmp_dir = tempfile.TemporaryDirectory()
+    growing_file = tmp_dir.name+"/growing_output.txt"
+    index_name = tmp_dir.name+"/growing.p.index"
+    full_text = open(dir_path+"output_example2.txt").read()
+    split = full_text.index("# cycle", full_text.index("# cycle", 1)+1)
+
+    # parse the first part of the file and save the index
+    open(growing_file,'w').write(full_text[:split])
+    data = {}
+    data['version'] = __version__
+    cycle_index = load_cycle_index(index_name, opppy_parser)
+    append_output_dictionary(data, [growing_file], opppy_parser, cycle_index=cycle_index)
+    save_cycle_index(cycle_index, index_name)
+    entry = cycle_index['files'][os.path.abspath(growing_file)]
+    assert(len(entry['offsets'])==len(entry['sort_values'])==1)
+
+    # grow the file and only parse the new cycles
+    open(growing_file,'w').write(full_text)
+    cycle_index = load_cycle_index(index_name, opppy_parser)
+    start = cycle_index_start(cycle_index, growing_file)
+    assert(start==entry['resume'] and start>0)
+    append_output_dictionary(data, [growing_file], opppy_parser, cycle_index=cycle_index)
+    entry = cycle_index['files'][os.path.abspath(growing_file)]
+    assert(entry['offsets']==get_output_offsets(growing_file, "#", "#"))
+
+    # an unchanged file has nothing left to parse
+    offsets, cycle_strings = output_cycle_strings(growing_file, opppy_parser, cycle_index_start(cycle_index, growing_file))
+    assert(len(list(cycle_strings))==0)
+
+    gold = {}
+    gold['version'] = __version__
+    append_output_dictionary(gold, [dir_path+"output_example2.txt"], opppy_parser)
+    gold.pop('appended_files')
+    data.pop('appended_files')
+    assert(data==gold)
+
+    # a rewritten file is parsed from the beginning
+    open(growing_file,'w').write(full_text.replace("time","time ")[:split])
+    assert(cycle_index_start(cycle_index, growing_file)==0)
+
+  def test_follow_output_dictionary(self):
+    '''
+    This tests following a growing output file and appending the newly
+    completed cycles to a pickle file.
+    '''
+    import tempfile
+    from my_test_opppy_parser import my_test_opppy_parser
+    from opppy.version import __version__
+    opppy_parser = my_test_opppy_parser()
+    tmp_dir = tempfile.TemporaryDirectory()
+    growing_file = tmp_dir.name+"/growing_output.txt"
+    pickle_name = tmp_dir.name+"/growing.p"
+    full_text = open(dir_path+"output_example2.txt").read()
+    split = full_text.index("# cycle 7")
+
+    # a file that has not been created yet has no cycles
+    data = {}
+    data['version'] = __version__
+    follow_output_dictionary(data, [growing_file], opppy_parser, interval=0, max_updates=2)
+    assert(list(data.keys())==['version', 'appended_files'])
+
+    open(growing_file,'w').write(full_text[:split])
+    data = {}
+    data['version'] = __version__
+    follow_output_dictionary(data, [growing_file], opppy_parser, interval=0, pickle_name=pickle_name, max_updates=1)
+    # the last cycle is not complete until the next cycle begins
+    assert(data['test_data1']['time']==[5.0])
+    assert(pickle.load(open(pickle_name,'rb'))==data)
+
+    # the next check only appends the newly completed cycles
+    open(growing_file,'w').write(full_text)
+    data = pickle.load(open(pickle_name,'rb'))
+    updates = []
+    follow_output_dictionary(data, [growing_file], opppy_parser, interval=0, pickle_name=pickle_name,
+            update_function=lambda data: updates.append(len(data['test_data1']['time'])), max_updates=2)
+    assert(updates==[4])
+
+    gold = {}
+    gold['version'] = __version__
+    append_output_dictionary(gold, [dir_path+"output_example2.txt"], opppy_parser)
+    data = pickle.load(open(pickle_name,'rb'))
+    gold.pop('appended_files')
+    data.pop('appended_files')
+    assert(data==gold)
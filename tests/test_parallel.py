@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# ---------------------------*-python-*----------------------------------------#
+# file   test_parallel.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+import sys
+
+sys.path.append('..')
+
+import os 
+dir_path = os.path.dirname(os.path.realpath(__file__))+"/"
+
+import unittest
+import pickle
+
+from opppy.parallel import *
+from opppy.output import *
+
+class test_opppy_parallel(unittest.TestCase):
+
+  def test_split_offsets(self):
+    '''
+    This tests splitting the cycle offsets of several files into chunks
+    '''
+    offsets = [[(0,10),(10,20),(20,30)],[],[(5,50),(50,60)]]
+    chunks = split_offsets(offsets, 2, chunk_bytes=15)
+    assert(chunks==[(0,[(0,10),(10,20)]),(0,[(20,30)]),(2,[(5,50)]),(2,[(50,60)])])
+    # the default chunk size keeps small files in a single chunk
+    chunks = split_offsets(offsets, 2)
+    assert(chunks==[(0,[(0,10),(10,20),(20,30)]),(2,[(5,50),(50,60)])])
+
+  def test_pack_cycle_data(self):
+    '''
+    This tests that packed cycle data round trips to the original cycles
+    '''
+    cycle_data = [{'cycle_info':{'cycle':1, 'time':0.5}, 'density':{'mat1':1.0, 'mat2':2.0}},
+                  {'cycle_info':{'cycle':2, 'time':1.5}, 'density':{'mat1':3.0}, 'name':{'a':'b', 'c':[1,2]}},
+                  {'cycle_info':{'cycle':3, 'time':2.5}, 'density':{'mat1':4.0, 'mat2':5.0}},
+                  {}]
+    packed_data = pack_cycle_data(cycle_data)
+    # cycles with the same keys share a layout
+    assert(len(packed_data[0])==3)
+    assert(list(packed_data[2])==[0.5,1.0,2.0,1.5,3.0,2.5,4.0,5.0])
+    unpacked_data = unpack_cycle_data(pickle.loads(pickle.dumps(packed_data)))
+    assert(unpacked_data==cycle_data)
+    assert(type(unpacked_data[0]['cycle_info']['cycle']) is int)
+    assert(type(unpacked_data[0]['cycle_info']['time']) is float)
+
+  def test_worker_pool(self):
+    '''
+    This tests that the worker pool is reused and that chunked parallel
+    parsing matches serial parsing
+    '''
+    pool = get_worker_pool(2)
+    assert(get_worker_pool(2) is pool)
+
+    sys.path.append(dir_path)
+    from my_test_opppy_parser import my_test_opppy_parser
+    opppy_parser = my_test_opppy_parser()
+    output_files = [dir_path+"output_example1.txt",dir_path+"output_example2.txt",dir_path+"output_example3.txt"]
+
+    serial = list(iter_output_cycle_data(output_files, opppy_parser))
+    cycle_index = new_cycle_index(opppy_parser)
+    chunked = list(iter_output_cycle_data(output_files, opppy_parser, 2, cycle_index, chunk_bytes=64))
+    assert(chunked==serial)
+    assert(len(cycle_index['files'])==3)
+    # nothing is parsed a second time with the updated index
+    assert(list(iter_output_cycle_data(output_files, opppy_parser, 2, cycle_index, chunk_bytes=64))==[])
+
+    close_worker_pool()
+    assert(get_worker_pool(2) is not pool)
+
+    # a parser that can not be pickled is inherited by forked workers
+    opppy_parser.transform = lambda value: value
+    assert(not is_picklable(opppy_parser))
+    pool, task_parser = get_parser_pool(2, opppy_parser)
+    assert(task_parser==INHERITED_PARSER and pool is not get_worker_pool(2))
+    assert(list(iter_output_cycle_data(output_files, opppy_parser, 2, chunk_bytes=64))==serial)
+    close_worker_pool()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# ---------------------------*-python-*----------------------------------------#
+# file   test_parse_cache.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+import sys
+
+sys.path.append('..')
+
+import os
+dir_path = os.path.dirname(os.path.realpath(__file__))+"/"
+
+import unittest
+import pickle
+import shutil
+import tempfile
+import numpy as np
+
+from opppy.parse_cache import *
+from opppy.output import build_output_dictionary_list
+from opppy.tally import build_tally_dictionary_list
+from opppy.dump_utils import build_data_list
+
+class test_opppy_parse_cache(unittest.TestCase):
+
+  def test_output_cache(self):
+    '''
+    This tests that parsed output files are loaded from the cache until the
+    files or the parse options change
+    '''
+    from my_test_opppy_parser import my_test_opppy_parser
+    opppy_parser = my_test_opppy_parser()
+    goldfile = open(dir_path+'gold_output.p', 'rb')
+    gold_data = pickle.load(goldfile)
+    goldfile.close()
+    gold_data.pop('version')
+    tmp_dir = tempfile.TemporaryDirectory()
+    output_files = []
+    for output_file in ["output_example1.txt", "output_example2.txt", "output_example3.txt"]:
+      shutil.copy(dir_path+output_file, tmp_dir.name+"/"+output_file)
+      output_files.append(tmp_dir.name+"/"+output_file)
+
+    cache = parse_cache(tmp_dir.name+"/cache")
+    for count in range(2):
+      dictionary_data, dictionary_names = build_output_dictionary_list([output_files], opppy_parser, cache=cache)
+      data = dictionary_data[0]
+      data.pop('version')
+      assert(data==gold_data)
+    assert(cache.misses==1 and cache.hits==1)
+
+    # columnar data is a different entry
+    build_output_dictionary_list([output_files], opppy_parser, columnar=True, cache=cache)
+    assert(cache.misses==2 and len(cache.entries())==2)
+
+    # a changed output file is parsed again
+    os.utime(output_files[2], ns=(0, 0))
+    build_output_dictionary_list([output_files], opppy_parser, cache=cache)
+    assert(cache.misses==3)
+
+    # hashed files only depend on the file names and content
+    cache = parse_cache(tmp_dir.name+"/hashed_cache", hash_files=True)
+    build_output_dictionary_list([output_files], opppy_parser, cache=cache)
+    os.utime(output_files[2], ns=(1, 1))
+    build_output_dictionary_list([output_files], opppy_parser, cache=cache)
+    assert(cache.misses==1 and cache.hits==1)
+
+  def test_tally_and_dump_cache(self):
+    '''
+    This tests the cache of parsed tally and dump files
+    '''
+    from my_test_opppy_tally_parser import my_test_opppy_tally_parser
+    from my_test_opppy_dump_parser import my_test_opppy_dump_parser
+    tmp_dir = tempfile.TemporaryDirectory()
+    cache = parse_cache(tmp_dir.name+"/cache")
+
+    tally_files = [dir_path+"example_tally1.txt", dir_path+"example_tally2.txt", dir_path+"example_tally3.txt"]
+    parsed = build_tally_dictionary_list([tally_files], my_test_opppy_tally_parser())[0][0]
+    cached = build_tally_dictionary_list([tally_files], my_test_opppy_tally_parser(), cache=cache)[0][0]
+    cached = build_tally_dictionary_list([tally_files], my_test_opppy_tally_parser(), cache=cache)[0][0]
+    assert(cache.hits==1)
+    assert(cached.keys()==parsed.keys())
+
+    dump_parser = my_test_opppy_dump_parser()
+    dump_files = [dir_path+"example_dump.txt", dir_path+"example_dump2.txt"]
+    parsed = build_data_list(dump_files, dump_parser)
+    for count in range(2):
+      cached = build_data_list(dump_files, dump_parser, cache=cache)
+      for parsed_dump, cached_dump in zip(parsed, cached):
+        for key in parsed_dump:
+          assert(np.array_equal(parsed_dump[key], cached_dump[key]))
+    assert(cache.hits==3)
+    # the key words are part of the key
+    cached = build_data_list(dump_files, dump_parser, ['x', 'temperature'], cache=cache)
+    assert(cache.hits==3)
+
+  def test_eviction(self):
+    '''
+    This tests that the least recently used entries are evicted beyond the
+    size cap
+    '''
+    tmp_dir = tempfile.TemporaryDirectory()
+    cache = parse_cache(tmp_dir.name+"/cache", max_size=3*8500)
+    for entry in range(3):
+      cache.put(str(entry), {'data':np.zeros(1000)+entry})
+      os.utime(cache._entry_name(str(entry)), ns=(entry, entry))
+    # use the oldest entry so the second entry is evicted first
+    assert(np.all(cache.get('0')['data']==0.0))
+    cache.put('3', {'data':np.zeros(1000)+3})
+    assert(sum(entry[1] for entry in cache.entries()) <= cache.max_size)
+    assert(cache.get('1') is None)
+    assert(cache.get('0') is not None and cache.get('3') is not None)
+    cache.clear()
+    assert(len(cache.entries())==0)
+
+  def test_unreadable_entries(self):
+    '''
+    This tests that entries that can not be loaded are misses and are removed
+    '''
+    tmp_dir = tempfile.TemporaryDirectory()
+    cache = parse_cache(tmp_dir.name+"/cache")
+    # truncated, a missing function, a missing module and a bad value
+    entries = [pickle.dumps({'data':1.0})[:-4], b'cos\nno_such_function\n.',
+               b'cno_such_module\nno_such_function\n.', b'cbuiltins\nint\n(Vx\ntR.']
+    for key, entry in enumerate(entries):
+      with open(cache._entry_name(str(key)), 'wb') as entry_file:
+        entry_file.write(entry)
+      assert(cache.get(str(key)) is None)
+      assert(not os.path.exists(cache._entry_name(str(key))))
+    assert(cache.misses==len(entries) and cache.hits==0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# ---------------------------*-python-*----------------------------------------#
+# file   test_parse_stats.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+import sys
+
+sys.path.append('..')
+
+import os 
+dir_path = os.path.dirname(os.path.realpath(__file__))+"/"
+
+import unittest
+
+from opppy.parse_stats import *
+from opppy.output import *
+
+class test_opppy_parse_stats(unittest.TestCase):
+
+  def test_parse_stats(self):
+    '''
+    This tests collecting parse statistics in serial and in parallel
+    '''
+    from my_test_opppy_parser import my_test_opppy_parser
+    from opppy.version import __version__
+    opppy_parser = my_test_opppy_parser()
+    output_files = [dir_path+"output_example1.txt",dir_path+"output_example2.txt",dir_path+"output_example3.txt"]
+
+    for nthreads in [0, 2]:
+      stats = parse_stats()
+      data = {}
+      data['version'] = __version__
+      append_output_dictionary(data, output_files, opppy_parser, nthreads=nthreads, stats=stats)
+      assert(len(stats.cycles)==12)
+      assert(list(stats.files.keys())==output_files)
+      assert([stats.files[file_name]['cycles'] for file_name in output_files]==[4,4,4])
+      assert(sum(cycle[2] for cycle in stats.cycles)==sum(stats.files[file_name]['bytes'] for file_name in output_files))
+      for stage in ['chunk', 'parse', 'merge']:
+        assert(stage in stats.totals)
+        assert(all(stage in stats.files[file_name] for file_name in output_files))
+      assert('slowest cycles' in stats.summary())
+
+    assert(count_cycle_keys({'cycle_info':{'time':1.0,'cycle':1}, 'density':{'mat1':1.0}})==3)
+    stats = parse_stats()
+    with stage_timer(stats, 'pickle'):
+      pass
+    with stage_timer(None, 'pickle'):
+      pass
+    assert(list(stats.totals.keys())==['pickle'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# ---------------------------*-python-*----------------------------------------#
+# file   test_shard.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+import sys
+
+sys.path.append('..')
+
+import os 
+dir_path = os.path.dirname(os.path.realpath(__file__))+"/"
+
+import unittest
+import pickle
+import tempfile
+import numpy as np
+
+from opppy.shard import *
+from opppy.output import *
+from opppy.storage import load_data, save_data
+
+class test_opppy_shard(unittest.TestCase):
+
+  def test_append_output_shard(self):
+    '''
+    This tests that output shards written in any order merge to the gold
+    output data
+    '''
+    from my_test_opppy_parser import my_test_opppy_parser
+    opppy_parser = my_test_opppy_parser()
+    goldfile = open(dir_path+'gold_output.p', 'rb')
+    gold_data = pickle.load(goldfile)
+    goldfile.close()
+    gold_data.pop('version')
+    tmp_dir = tempfile.TemporaryDirectory()
+
+    for extension in ['.p', '.opp', '.h5']:
+      file_name = tmp_dir.name+"/shard"+extension
+      # the restarts finish out of order
+      for output_file in ["output_example3.txt", "output_example1.txt", "output_example2.txt"]:
+        append_output_shard(file_name, [dir_path+output_file], opppy_parser)
+      assert(len(shard_files(file_name))==3)
+      assert(not os.path.exists(file_name))
+
+      # the shards are merged by load_data
+      data = load_data(file_name)
+      data.pop('version')
+      assert(data==gold_data)
+
+      # and folded into the data file by merge_shards
+      merge_shards(file_name)
+      assert(len(shard_files(file_name))==0)
+      data = load_data(file_name)
+      data.pop('version')
+      assert(data==gold_data)
+
+  def test_append_dump_shard(self):
+    '''
+    This tests that dump shards are added to the dumps of a data file
+    '''
+    goldfile = open(dir_path+'gold_dumps.p', 'rb')
+    gold_data = pickle.load(goldfile)
+    goldfile.close()
+    tmp_dir = tempfile.TemporaryDirectory()
+    file_name = tmp_dir.name+"/dumps.npyd"
+    dump_names = [key for key in gold_data if key != 'version']
+    save_data({'version':gold_data['version'], dump_names[0]:gold_data[dump_names[0]]}, file_name)
+    for dump_name in dump_names[1:]:
+      append_dump_shard(file_name, {'version':gold_data['version'], dump_name:gold_data[dump_name]})
+    data = load_data(file_name)
+    assert(list(data.keys())==list(gold_data.keys()))
+    for dump_name in dump_names:
+      for key in gold_data[dump_name]:
+        assert(np.array_equal(data[dump_name][key], gold_data[dump_name][key]))
+    merge_shards(file_name)
+    assert(len(shard_files(file_name))==0)
+    assert(list(load_data(file_name).keys())==list(gold_data.keys()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python
+# ---------------------------*-python-*----------------------------------------#
+# file   test_storage.py
+# author agent
+# date   October 2026
+# note   Copyright (C) 2026, Triad National Security, LLC.
+#        All rights reserved.
+# -----------------------------------------------------------------------------#
+import sys
+
+sys.path.append('..')
+
+import os 
+dir_path = os.path.dirname(os.path.realpath(__file__))+"/"
+
+import unittest
+import pickle
+import tempfile
+import numpy as np
+
+from opppy.storage import *
+from opppy.output import *
+from opppy.columnar import columnar_dictionary
+
+def same_data(data, gold_data):
+  '''
+  Compare nested dictionaries that hold lists and NumPy arrays
+  '''
+  if isinstance(gold_data, dict):
+    return list(data.keys())==list(gold_data.keys()) and all(same_data(data[key], gold_data[key]) for key in gold_data)
+  if isinstance(gold_data, np.ndarray):
+    return np.array_equal(data, gold_data)
+  if isinstance(gold_data, list) and len(gold_data)>0 and isinstance(gold_data[0], (dict, np.ndarray)):
+    return len(data)==len(gold_data) and all(same_data(value, gold_value) for value, gold_value in zip(data, gold_data))
+  return data==gold_data
+
+def locked_append(file_name, name, count):
+  '''
+  Append count keys to a data file one load/update/save cycle at a time
+  '''
+  for index in range(count):
+    with lock_data(file_name):
+      data = load_data(file_name)
+      data[name+str(index)] = {'x':[index]}
+      save_data(data, file_name)
+
+class test_opppy_storage(unittest.TestCase):
+
+  def test_hdf5_round_trip(self):
+    '''
+    This tests that the gold output, tally and dump dictionaries round trip
+    through an HDF5 file
+    '''
+    tmp_dir = tempfile.TemporaryDirectory()
+    for gold_name in ['gold_output.p', 'gold_tally.p', 'gold_dumps.p', 'gold_extract_cycle.p']:
+      goldfile = open(dir_path+gold_name, 'rb')
+      gold_data = pickle.load(goldfile)
+      goldfile.close()
+      file_name = tmp_dir.name+"/"+gold_name.replace('.p','.h5')
+      save_data(gold_data, file_name)
+      assert(is_hdf5_file(file_name))
+      data = load_data(file_name)
+      assert(same_data(data, gold_data))
+
+    # pickle files are still read and written by default
+    save_data({'version':'test'}, tmp_dir.name+"/test.p")
+    assert(not is_hdf5_file(tmp_dir.name+"/test.p"))
+    assert(load_data(tmp_dir.name+"/test.p")=={'version':'test'})
+
+  def test_hdf5_keys(self):
+    '''
+    This tests loading and saving single dictionaries of an HDF5 file
+    '''
+    tmp_dir = tempfile.TemporaryDirectory()
+    file_name = tmp_dir.name+"/keys.h5"
+    data = {'version':'test', 'a':{'x':[1,2,3]}, 'b':{'x':[4.0,5.0], 'name':['one','two']}, 'c/d':{'x':[0]}}
+    save_data(data, file_name)
+    assert(hdf5_keys(file_name)==['version', 'a', 'b', 'c/d'])
+    assert(load_data(file_name, ['b'])=={'version':'test', 'b':data['b']})
+    assert(load_data(file_name, ['c/d'])['c/d']==data['c/d'])
+    # only rewrite the changed dictionary
+    save_data({'version':'test', 'a':{'x':[7]}}, file_name, ['a'])
+    assert(load_data(file_name)=={'version':'test', 'a':{'x':[7]}, 'b':data['b'], 'c/d':data['c/d']})
+    # a failed update leaves the old values
+    try:
+      save_data({'version':'test', 'a':{'x':[8]}, 'b':{'x':lambda: None}}, file_name, ['a', 'b'])
+    except Exception:
+      pass
+    assert(load_data(file_name)=={'version':'test', 'a':{'x':[7]}, 'b':data['b'], 'c/d':data['c/d']})
+    assert(os.listdir(tmp_dir.name)==['keys.h5'])
+
+  def test_append_output_hdf5(self):
+    '''
+    This tests that appending restarted outputs to an HDF5 file in place
+    matches appending them to a dictionary
+    '''
+    from my_test_opppy_parser import my_test_opppy_parser
+    from opppy.version import __version__
+    opppy_parser = my_test_opppy_parser()
+    output_files = [dir_path+"output_example1.txt", dir_path+"output_example2.txt", dir_path+"output_example3.txt"]
+    tmp_dir = tempfile.TemporaryDirectory()
+
+    for columnar in [False, True]:
+      data = {}
+      data['version'] = __version__
+      append_output_dictionary(data, output_files, opppy_parser, columnar=columnar)
+
+      file_name = tmp_dir.name+"/append"+str(columnar)+".h5"
+      for output_file in output_files:
+        append_output_hdf5(file_name, [output_file], opppy_parser, columnar=columnar)
+      hdf5_data = load_data(file_name)
+      assert(sorted(hdf5_data.keys())==sorted(data.keys()))
+      for key, value in data.items():
+        if isinstance(value, columnar_dictionary):
+          assert(isinstance(hdf5_data[key], columnar_dictionary))
+          assert(hdf5_data[key].to_dict()==value.to_dict())
+          for subkey in value:
+            assert((hdf5_data[key].valid(subkey)==value.valid(subkey)).all())
+        else:
+          assert(hdf5_data[key]==value)
+
+    # HDF5 files have no lzma filter, so appending with it is an error
+    with self.assertRaises(SystemExit):
+      append_output_hdf5(file_name, [output_files[0]], opppy_parser, compression='lzma')
+    with self.assertRaises(SystemExit):
+      save_data(data, tmp_dir.name+"/lzma.h5", compression='lzma+shuffle')
+    assert(data_compression(file_name)=='none' and not os.path.exists(tmp_dir.name+"/lzma.h5"))
+
+  def test_split_pickle(self):
+    '''
+    This tests saving, rewriting and lazily loading split pickle files
+    '''
+    tmp_dir = tempfile.TemporaryDirectory()
+    for gold_name in ['gold_output.p', 'gold_tally.p', 'gold_dumps.p']:
+      goldfile = open(dir_path+gold_name, 'rb')
+      gold_data = pickle.load(goldfile)
+      goldfile.close()
+      file_name = tmp_dir.name+"/"+gold_name.replace('.p','.opp')
+      save_data(gold_data, file_name)
+      assert(is_split_pickle_file(file_name))
+      assert(same_data(load_data(file_name), gold_data))
+      lazy_data = load_data(file_name, lazy=True)
+      assert(isinstance(lazy_data, lazy_dictionary))
+      assert(list(lazy_data.keys())==list(gold_data.keys()))
+      assert(same_data(lazy_data.load(), gold_data))
+
+    # only the accessed series are read
+    data = {'version':'test', 'a':{'x':[1,2,3], 'y':[4,5,6]}, 'b':[{'c':1}, {'c':2}]}
+    file_name = tmp_dir.name+"/lazy.opp"
+    save_data(data, file_name)
+    lazy_data = load_data(file_name, lazy=True)
+    assert(lazy_data['a']['y']==[4,5,6])
+    assert(list(lazy_data['a']._values.keys())==['y'])
+    assert(lazy_data['b'][-1]=={'c':2} and len(lazy_data['b'])==2)
+    assert(list(lazy_data._values.keys())==['a', 'b'])
+    # rewrite a single dictionary
+    save_data({'version':'test', 'a':{'x':[7]}}, file_name, ['a'])
+    assert(load_data(file_name)=={'version':'test', 'a':{'x':[7]}, 'b':data['b']})
+    assert(load_data(file_name, ['b'])=={'version':'test', 'b':data['b']})
+
+    # an interrupted update leaves the previous table of contents
+    updated = {'version':'test', 'a':{'x':[7]}, 'b':data['b']}
+    save_data({'version':'test', 'b':[{'c':3}]}, file_name, ['b'])
+    with open(file_name, 'r+b') as data_file:
+      data_file.truncate(os.path.getsize(file_name)-5)
+    assert(load_data(file_name)==updated)
+    with open(file_name, 'r+b') as data_file:
+      data_file.seek(-30, os.SEEK_END)
+      data_file.write(b'x'*10)
+    assert(load_data(file_name)==updated)
+    # the next update drops the partial tail
+    save_data({'version':'test', 'b':[{'c':4}]}, file_name, ['b'])
+    assert(load_data(file_name)=={'version':'test', 'a':{'x':[7]}, 'b':[{'c':4}]})
+    assert(load_data(file_name, ['a'])=={'version':'test', 'a':{'x':[7]}})
+
+    # columnar data keeps its validity masks
+    from my_test_opppy_parser import my_test_opppy_parser
+    from opppy.version import __version__
+    columnar_data = {}
+    columnar_data['version'] = __version__
+    append_output_dictionary(columnar_data, [dir_path+"output_example1.txt", dir_path+"output_example2.txt"], my_test_opppy_parser(), columnar=True)
+    save_data(columnar_data, file_name)
+    for lazy in [False, True]:
+      density = load_data(file_name, lazy=lazy)['density']
+      for key in columnar_data['density']:
+        assert(np.array_equal(density[key], columnar_data['density'][key]))
+        assert(np.array_equal(density.valid(key), columnar_data['density'].valid(key)))
+
+  def test_npy_directory(self):
+    '''
+    This tests saving, rewriting and memory mapping NumPy directory stores
+    '''
+    tmp_dir = tempfile.TemporaryDirectory()
+    goldfile = open(dir_path+'gold_dumps.p', 'rb')
+    gold_data = pickle.load(goldfile)
+    goldfile.close()
+    file_name = tmp_dir.name+"/dumps.npyd"
+    save_data(gold_data, file_name)
+    assert(is_npy_directory(file_name))
+    data = load_data(file_name)
+    assert(same_data(data, gold_data))
+    assert(isinstance(data['example_dump.txt']['x'], np.memmap))
+    lazy_data = load_data(file_name, ['example_dump2.txt'], lazy=True)
+    assert(list(lazy_data.keys())==['version', 'example_dump2.txt'])
+    assert(np.array_equal(lazy_data['example_dump2.txt']['density'], gold_data['example_dump2.txt']['density']))
+    assert(list(lazy_data['example_dump2.txt']._values.keys())==['density'])
+
+    # rewrite and remove single dictionaries
+    save_data({'version':gold_data['version'], 'new':{'x':np.arange(3), 'name':'new', 'a/b':[1,2]}}, file_name, ['new', 'example_dump.txt'])
+    data = load_data(file_name)
+    assert(list(data.keys())==['version', 'example_dump2.txt', 'example_dump3.txt', 'new'])
+    assert(np.array_equal(data['new']['x'], np.arange(3)) and data['new']['name']=='new' and data['new']['a/b']==[1,2])
+    assert(len(os.listdir(file_name))==4)
+    # saving the whole dictionary replaces the old entries
+    save_data(gold_data, file_name)
+    assert(same_data(load_data(file_name), gold_data))
+    assert(len(os.listdir(file_name))==4)
+
+  def test_compression(self):
+    '''
+    This tests that every compression round trips the gold data in each file
+    format and that rewriting a file keeps its compression
+    '''
+    tmp_dir = tempfile.TemporaryDirectory()
+    goldfile = open(dir_path+'gold_output.p', 'rb')
+    gold_data = pickle.load(goldfile)
+    goldfile.close()
+    for extension in ['.p', '.opp', '.h5']:
+      for compression in COMPRESSIONS:
+        file_name = tmp_dir.name+"/compress"+compression.replace('+','_')+extension
+        if extension == '.h5' and 'lzma' in compression:
+          continue
+        save_data(gold_data, file_name, compression=compression)
+        assert(data_compression(file_name)==compression)
+        assert(same_data(load_data(file_name), gold_data))
+        # rewriting a dictionary keeps the file compression
+        save_data({'version':gold_data['version'], 'new':{'x':[1.0,2.0]}}, file_name, ['new'])
+        assert(data_compression(file_name)==compression)
+        assert(load_data(file_name, ['new'])['new']=={'x':[1.0,2.0]})
+
+    # shuffled lists keep the exact types of their values
+    data = {'version':'test', 'a':{'x':[1.0,2.5,3.0], 'i':list(range(100)), 'm':[1, 2.5, 'three', None], 'f':[0.1]*100}}
+    for compression in ['zlib+shuffle', 'lzma+shuffle']:
+      file_name = tmp_dir.name+"/shuffle.p"
+      save_data(data, file_name, compression=compression)
+      shuffled_data = load_data(file_name)
+      assert(shuffled_data==data)
+      for key in data['a']:
+        assert([type(value) for value in shuffled_data['a'][key]]==[type(value) for value in data['a'][key]])
+
+    # shuffled values only reference the versioned restore_shuffled
+    import opppy.storage
+    payload = pickle.dumps(opppy.storage._shuffle_value(data), protocol=4)
+    assert(b'restore_shuffled' in payload and b'_restore_list' not in payload)
+    assert(pickle.loads(payload)==data)
+
+  def test_load_data_list(self):
+    '''
+    This tests loading many data files with threads and a read budget
+    '''
+    tmp_dir = tempfile.TemporaryDirectory()
+    goldfile = open(dir_path+'gold_output.p', 'rb')
+    gold_data = pickle.load(goldfile)
+    goldfile.close()
+    file_names = []
+    for index, extension in enumerate(['.p', '.opp', '.h5', '.npyd']*2):
+      file_names.append(tmp_dir.name+"/run"+str(index)+extension)
+      save_data(gold_data, file_names[-1])
+    key = [key for key in gold_data if isinstance(gold_data[key], dict)][0]
+    for nthreads in [0, 3]:
+      for read_budget in [None, 1]:
+        data_list = load_data_list(file_names, [key], nthreads=nthreads, read_budget=read_budget)
+        assert(len(data_list)==len(file_names))
+        for data in data_list:
+          assert(list(data.keys())==['version', key])
+          assert(same_data(data[key], gold_data[key]))
+      data_list = load_data_list(file_names, lazy=True, nthreads=nthreads)
+      for data in data_list:
+        assert(same_data(data[key], gold_data[key]))
+
+  def test_locked_appends(self):
+    '''
+    This tests that concurrent locked appends do not lose data and that saves
+    never leave partial files behind
+    '''
+    import multiprocessing
+    tmp_dir = tempfile.TemporaryDirectory()
+    for extension in ['.p', '.opp', '.h5']:
+      file_name = tmp_dir.name+"/locked"+extension
+      save_data({'version':'test'}, file_name)
+      processes = [multiprocessing.Process(target=locked_append, args=(file_name, 'p'+str(rank)+'_', 10)) for rank in range(4)]
+      for process in processes:
+        process.start()
+      for process in processes:
+        process.join()
+      data = load_data(file_name)
+      assert(len(data)==41)
+      for rank in range(4):
+        for index in range(10):
+          assert(data['p'+str(rank)+'_'+str(index)]=={'x':[index]})
+    assert(not any(name.endswith('.tmp') for name in os.listdir(tmp_dir.name)))
+
+    # a failed save leaves the old file in place
+    file_name = tmp_dir.name+"/atomic.p"
+    save_data({'version':'test'}, file_name)
+    try:
+      save_data({'version':'test', 'bad':lambda x: x}, file_name)
+    except Exception:
+      pass
+    assert(load_data(file_name)=={'version':'test'})
+    assert(not any(name.endswith('.tmp') for name in os.listdir(tmp_dir.name)))
+
+if __name__ == '__main__':
+    unittest.main()